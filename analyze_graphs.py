@@ -1,19 +1,9 @@
-import time
-import statistics
-from graph import Graph
+from benchmark import cold, measure
 from graph_loader import (
-    load_cities_graph,
-    load_cyclic_graph,
-    load_random_graph,
-    load_standard_graph,
-    load_large_graph
+    load_graph,
+    load_standard_graph
 )
 
-# Number of iterations for timing measurements
-NUM_ITERATIONS_SMALL = 1000  # More iterations for small graphs
-NUM_ITERATIONS_MEDIUM = 100  # Medium number of iterations
-NUM_ITERATIONS_LARGE = 5     # Fewer iterations for large graphs
-
 def analyze_graph(graph, graph_name):
     """
     Analyze a graph by running MST and Shortest Path algorithms
@@ -24,60 +14,39 @@ def analyze_graph(graph, graph_name):
 
     # Graph properties
     num_vertices = len(graph.get_vertices())
-    num_edges = len(graph.get_edges())
+    num_edges = graph.num_edges
 
     print(f"Number of vertices: {num_vertices}")
     print(f"Number of edges: {num_edges}")
 
-    # Run multiple iterations for more accurate timing
-    prim_times = []
-    kruskal_times = []
-    dijkstra_times = []
     start_vertex = min(graph.get_vertices())
 
-    # Determine number of iterations based on graph size
-    if num_vertices >= 100:
-        iterations = NUM_ITERATIONS_LARGE
-    elif num_vertices >= 20:
-        iterations = NUM_ITERATIONS_MEDIUM
-    else:
-        iterations = NUM_ITERATIONS_SMALL
-
-    print(f"\nRunning {iterations} iterations for timing measurements...")
-
-    for _ in range(iterations):
-        # Measure Prim's algorithm
-        mst_edges, total_weight, execution_time = graph.prim_mst()
-        prim_times.append(execution_time)
-
-        # Measure Kruskal's algorithm
-        mst_edges, total_weight, execution_time = graph.kruskal_mst()
-        kruskal_times.append(execution_time)
-
-        # Measure Dijkstra's algorithm
-        dist, parent, execution_time = graph.dijkstra_shortest_path(start_vertex)
-        dijkstra_times.append(execution_time)
+    # Median of adaptively repeated runs (see benchmark.measure), each
+    # without the edge order and weight bound cached by earlier runs
+    print("\nTiming with warmup and adaptive repetition...")
+    prim = measure(graph.prim_mst, "prim", setup=cold(graph))
+    kruskal = measure(graph.kruskal_mst, "kruskal", setup=cold(graph))
+    dijkstra = measure(lambda: graph.dijkstra_shortest_path(start_vertex), "dijkstra", setup=cold(graph))
 
-    # Calculate average times in nanoseconds
-    avg_prim_time = statistics.mean(prim_times) * 1_000_000_000  # Convert to nanoseconds
-    avg_kruskal_time = statistics.mean(kruskal_times) * 1_000_000_000
-    avg_dijkstra_time = statistics.mean(dijkstra_times) * 1_000_000_000
+    median_prim_time = prim.median
+    median_kruskal_time = kruskal.median
+    median_dijkstra_time = dijkstra.median
 
     # Run once more to get the actual results
     print("\nPrim's MST Algorithm:")
-    mst_edges, total_weight, _ = graph.prim_mst()
-    print(f"MST Edges: {mst_edges}")
-    print(f"Total MST Weight: {total_weight}")
-    print(f"Average Execution Time: {avg_prim_time:.2f} nanoseconds ({avg_prim_time/1000:.2f} microseconds)")
+    prim_result = graph.prim_mst()
+    print(f"MST Edges: {prim_result.edges}")
+    print(f"Total MST Weight: {prim_result.total_weight}")
+    print(f"Median Execution Time: {median_prim_time:.2f} nanoseconds ({median_prim_time/1000:.2f} microseconds, {prim.runs} runs)")
 
     print("\nKruskal's MST Algorithm:")
-    mst_edges, total_weight, _ = graph.kruskal_mst()
-    print(f"MST Edges: {mst_edges}")
-    print(f"Total MST Weight: {total_weight}")
-    print(f"Average Execution Time: {avg_kruskal_time:.2f} nanoseconds ({avg_kruskal_time/1000:.2f} microseconds)")
+    kruskal_result = graph.kruskal_mst()
+    print(f"MST Edges: {kruskal_result.edges}")
+    print(f"Total MST Weight: {kruskal_result.total_weight}")
+    print(f"Median Execution Time: {median_kruskal_time:.2f} nanoseconds ({median_kruskal_time/1000:.2f} microseconds, {kruskal.runs} runs)")
 
     print("\nDijkstra's Shortest Path Algorithm (from vertex 0):")
-    dist, parent, _ = graph.dijkstra_shortest_path(start_vertex)
+    dist = graph.dijkstra_shortest_path(start_vertex).dist
 
     # Print distances to all vertices (limit to first 10 for large graphs)
     print(f"Distances from vertex {start_vertex}:")
@@ -91,24 +60,25 @@ def analyze_graph(graph, graph_name):
     if len(dist) > 10:
         print(f"  ... and {len(dist) - 10} more vertices")
 
-    print(f"Average Execution Time: {avg_dijkstra_time:.2f} nanoseconds ({avg_dijkstra_time/1000:.2f} microseconds)")
+    print(f"Median Execution Time: {median_dijkstra_time:.2f} nanoseconds ({median_dijkstra_time/1000:.2f} microseconds, {dijkstra.runs} runs)")
 
     return {
         'graph_name': graph_name,
         'num_vertices': num_vertices,
         'num_edges': num_edges,
-        'prim_time': avg_prim_time,
-        'kruskal_time': avg_kruskal_time,
-        'dijkstra_time': avg_dijkstra_time
+        'prim_time': median_prim_time,
+        'kruskal_time': median_kruskal_time,
+        'dijkstra_time': median_dijkstra_time
     }
 
 def main():
-    # Load graphs
-    cities_graph = load_cities_graph('test_cities.gr')
-    cyclic_graph = load_cyclic_graph('test_cyclic.gr')
-    random_graph = load_random_graph('test_random.gr')
-    standard_graph = load_standard_graph()
-    large_graph = load_large_graph('test_large.gr')
+    # Load graphs (memory-mapped from the binary cache after the first run)
+    cities_graph = load_graph('test_cities.gr')
+    cyclic_graph = load_graph('test_cyclic.gr')
+    random_graph = load_graph('test_random.gr')
+    # Frozen like the loaded graphs, so every row times the CSRGraph code
+    standard_graph = load_standard_graph().freeze()
+    large_graph = load_graph('test_large.gr')
 
     # Analyze each graph
     results = []
@@ -123,7 +93,7 @@ def main():
     print("COMPARATIVE ANALYSIS")
     print("=" * 50)
 
-    print("\nPerformance Comparison (times in nanoseconds):")
+    print("\nPerformance Comparison (median times in nanoseconds):")
     print(f"{'Graph Name':<15} {'Vertices':<10} {'Edges':<10} {'Prim (ns)':<15} {'Kruskal (ns)':<15} {'Dijkstra (ns)':<15}")
     print("-" * 85)
 
@@ -141,7 +111,8 @@ def main():
 
     print("\n2. Number of Edges:")
     print("   - More edges generally mean more operations for all algorithms.")
-    print("   - Kruskal's algorithm is particularly affected as it sorts all edges.")
+    print("   - Kruskal's algorithm is particularly affected as it sorts all edges")
+    print("     (timed cold: the edge order a graph caches is dropped before every run).")
     print("   - For sparse graphs (E ≈ V), algorithms perform better than for dense graphs (E ≈ V^2).")
 
     print("\n3. Graph Structure:")
@@ -0,0 +1,299 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+from benchmark_store import DEFAULT_STORE, ResultStore, git_revision
+from boruvka import boruvka_mst
+from csr_graph import CSRGraph
+from graph_families import FAMILIES, build_graph
+from graph_loader import load_graph, load_standard_graph
+from path_search import bidirectional_dijkstra_path, dijkstra_path
+
+try:
+    import numpy as np
+except ImportError:  # Only recorded in the metadata
+    np = None
+
+# Every benchmark runs for at least this long (after warmup)...
+MIN_TIME = 0.2
+# ...and between this many...
+MIN_RUNS = 5
+# ...and this many timed calls
+MAX_RUNS = 1000
+WARMUP_RUNS = 1
+
+# z value for two-sided 95% confidence intervals
+Z_95 = 1.959964
+
+# Repository graphs and the synthetic scales (vertices, average degree)
+REPO_GRAPHS = ('test_cities.gr', 'test_cyclic.gr', 'test_random.gr', 'test_large.gr')
+SYNTHETIC_SCALES = ((1000, 8), (5000, 8), (20000, 8))
+# Size of the graphs from each graph_families family
+FAMILY_VERTICES = 5000
+
+# name -> function(graph, source, target) running one algorithm once; source
+# and target are the smallest and largest vertex, picked outside the timing.
+# Before every call the graph's cached edge order and weight bound are
+# dropped (outside the timing), so Kruskal and Borůvka pay for their sort
+# like Prim pays for its heap; the *_cached variants keep them.
+ALGORITHMS = {
+    'prim': lambda g, s, t: g.prim_mst(),
+    'prim_heapq': lambda g, s, t: g.prim_mst(heap='heapq'),
+    'kruskal': lambda g, s, t: g.kruskal_mst(),
+    'kruskal_cached': lambda g, s, t: g.kruskal_mst(),
+    'boruvka': lambda g, s, t: boruvka_mst(g),
+    'boruvka_cached': lambda g, s, t: boruvka_mst(g),
+    'dijkstra': lambda g, s, t: g.dijkstra_shortest_path(s),
+    'dijkstra_heapq': lambda g, s, t: g.dijkstra_shortest_path(s, heap='heapq'),
+    'dijkstra_dary': lambda g, s, t: g.dijkstra_shortest_path(s, heap='dary'),
+    'point_to_point': lambda g, s, t: dijkstra_path(g, s, t),
+    'bidirectional': lambda g, s, t: bidirectional_dijkstra_path(g, s, t),
+}
+
+def cold(graph):
+    """
+    Setup function for measure that makes every call on graph a first call
+    """
+    return graph.clear_caches
+
+class Measurement:
+    """
+    Timings of one benchmark, in nanoseconds, with summary statistics
+    """
+
+    def __init__(self, name, samples, params=None):
+        self.name = name
+        self.samples = samples
+        self.params = params or {}
+
+    @property
+    def runs(self):
+        return len(self.samples)
+
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self):
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self):
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def percentile(self, p):
+        """
+        p-th percentile (0-100) by linear interpolation between samples
+        """
+        ordered = sorted(self.samples)
+        position = (len(ordered) - 1) * p / 100
+        low = math.floor(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    def median_ci(self):
+        """
+        Distribution-free 95% confidence interval for the median, from the
+        order statistics around it
+        """
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        half_width = Z_95 * math.sqrt(n) / 2
+        low = max(0, math.floor(n / 2 - half_width) - 1)
+        high = min(n - 1, math.ceil(n / 2 + half_width))
+        return ordered[low], ordered[high]
+
+    def mean_ci(self):
+        """
+        Normal-approximation 95% confidence interval for the mean
+        """
+        half_width = Z_95 * self.stdev / math.sqrt(self.runs)
+        return self.mean - half_width, self.mean + half_width
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'params': self.params,
+            'runs': self.runs,
+            'median_ns': self.median,
+            'mean_ns': self.mean,
+            'stdev_ns': self.stdev,
+            'min_ns': min(self.samples),
+            'max_ns': max(self.samples),
+            'p5_ns': self.percentile(5),
+            'p25_ns': self.percentile(25),
+            'p75_ns': self.percentile(75),
+            'p95_ns': self.percentile(95),
+            'median_ci_ns': list(self.median_ci()),
+            'mean_ci_ns': list(self.mean_ci()),
+            'samples_ns': list(self.samples),
+        }
+
+def measure(func, name='', params=None, min_time=MIN_TIME, min_runs=MIN_RUNS, max_runs=MAX_RUNS,
+            warmup=WARMUP_RUNS, disable_gc=True, setup=None):
+    """
+    Time repeated calls of func() with time.perf_counter_ns
+
+    If given, setup() runs before every call, warmup included, outside the
+    timed region. The warmup calls (at least one) are not recorded; the slowest of them
+    sets how many timed calls fit into min_time, clamped to
+    [min_runs, max_runs]. The garbage collector is run beforehand and kept
+    off while timing unless disable_gc is False.
+
+    Returns:
+    - A Measurement
+    """
+    clock = time.perf_counter_ns
+
+    estimate = 1
+    for _ in range(max(1, warmup)):
+        if setup is not None:
+            setup()
+        start = clock()
+        func()
+        estimate = max(estimate, clock() - start)
+    runs = max(min_runs, min(max_runs, math.ceil(min_time * 1e9 / estimate)))
+
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    if disable_gc:
+        gc.disable()
+    try:
+        samples = []
+        for _ in range(runs):
+            if setup is not None:
+                setup()
+            start = clock()
+            func()
+            samples.append(clock() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return Measurement(name, samples, params)
+
+def synthetic_graph(num_vertices, degree, rng):
+    """
+    Connected random graph with about num_vertices * degree / 2 edges and
+    weights in 1..100 (as generate_large_graph draws them): a random tree
+    plus uniformly random extra edges
+    """
+    edges = [(v, rng.randrange(v), rng.randint(1, 100)) for v in range(1, num_vertices)]
+    for _ in range(max(0, num_vertices * degree // 2 - len(edges))):
+        edges.append((rng.randrange(num_vertices), rng.randrange(num_vertices), rng.randint(1, 100)))
+    return CSRGraph.from_edges(num_vertices, edges)
+
+def benchmark_graphs(include_synthetic=True, seed=0):
+    """
+    Graphs the suite runs on, all as CSRGraphs so every row times the same
+    implementation: the repository graphs, the standard graph and,
+    optionally, seeded synthetic random graphs of increasing size plus one
+    graph of every family in graph_families (road grid, power law,
+    geometric, long path, heap churn)
+
+    Returns:
+    - A list of (name, graph) pairs
+    """
+    graphs = [(file_path, load_graph(file_path)) for file_path in REPO_GRAPHS if os.path.exists(file_path)]
+    graphs.append(('standard', load_standard_graph().freeze()))
+
+    if include_synthetic:
+        rng = random.Random(seed)
+        for num_vertices, degree in SYNTHETIC_SCALES:
+            graphs.append((f"random_{num_vertices}_{degree}", synthetic_graph(num_vertices, degree, rng)))
+        for family in FAMILIES:
+            graphs.append((f"{family}_{FAMILY_VERTICES}", build_graph(family, FAMILY_VERTICES, seed)))
+
+    return graphs
+
+def metadata():
+    commit, dirty = git_revision()
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': commit,
+        'git_dirty': dirty,
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__ if np is not None else None,
+    }
+
+def run_suite(algorithms=None, graphs=None, include_synthetic=True, min_time=MIN_TIME, seed=0, verbose=True):
+    """
+    Measure every algorithm on every graph
+
+    Parameters:
+    - algorithms: Names from ALGORITHMS (default: all)
+    - graphs: (name, graph) pairs (default: benchmark_graphs())
+    - include_synthetic: Include the synthetic graphs when graphs is None
+    - min_time: Seconds of timed calls per benchmark
+    - seed: Seed for the synthetic graphs
+
+    Returns:
+    - A JSON-serializable dict with metadata and one result per benchmark
+    """
+    if graphs is None:
+        graphs = benchmark_graphs(include_synthetic, seed)
+    names = algorithms or list(ALGORITHMS)
+
+    results = []
+    for graph_name, graph in graphs:
+        vertices = graph.get_vertices()
+        source, target = min(vertices), max(vertices)
+        for name in names:
+            algorithm = ALGORITHMS[name]
+            params = {
+                'algorithm': name,
+                'graph': graph_name,
+                'num_vertices': len(vertices),
+                'num_edges': graph.num_edges,
+            }
+            setup = None if name.endswith('_cached') else cold(graph)
+            measurement = measure(lambda: algorithm(graph, source, target), f"{name}/{graph_name}", params,
+                                  min_time=min_time, setup=setup)
+            results.append(measurement.to_dict())
+            if verbose:
+                low, high = measurement.median_ci()
+                print(f"{measurement.name:<40} median {measurement.median / 1000:>12.1f} us  "
+                      f"95% CI [{low / 1000:.1f}, {high / 1000:.1f}]  runs {measurement.runs}")
+
+    return {'metadata': dict(metadata(), seed=seed, min_time=min_time), 'results': results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the graph algorithms")
+    parser.add_argument('--output', '-o', help="Write the results as JSON to this file")
+    parser.add_argument('--algorithms', '-a', nargs='+', choices=sorted(ALGORITHMS), help="Algorithms to run")
+    parser.add_argument('--no-synthetic', action='store_true', help="Only use the repository graphs")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help="Seconds of timed calls per benchmark")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the synthetic graphs")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE,
+                        help=f"Also record the run in this results database (default {DEFAULT_STORE})")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.algorithms, include_synthetic=not args.no_synthetic,
+                       min_time=args.min_time, seed=args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.store:
+        with ResultStore(args.store) as store:
+            run_id = store.record(report)
+        print(f"Recorded as run {run_id} in {args.store}; compare with: python benchmark_store.py compare")
+
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+import subprocess
+import sys
+
+# Default location of the results database
+DEFAULT_STORE = 'benchmarks.sqlite'
+
+# compare flags a benchmark when its median grew by more than this fraction...
+SLOWDOWN_THRESHOLD = 0.05
+# ...and a one-sided Mann-Whitney test says it is slower at this level
+SIGNIFICANCE = 0.01
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    machine TEXT,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER REFERENCES runs(id),
+    name TEXT,
+    algorithm TEXT,
+    graph TEXT,
+    median_ns REAL,
+    result TEXT,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+def machine_fingerprint(metadata):
+    """
+    Short hash of the metadata fields that make timings comparable
+    """
+    fields = ('implementation', 'python', 'platform', 'machine', 'cpu_count', 'numpy')
+    text = json.dumps([metadata.get(field) for field in fields])
+    return hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+
+def git_revision():
+    """
+    Return (commit hash, dirty flag) of the working tree, or ('unknown', False)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+class ResultStore:
+    """
+    SQLite database of benchmark reports (the dicts benchmark.run_suite
+    returns), one run per report, tagged with the git commit and a machine
+    fingerprint so that only like-for-like runs are compared
+    """
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, report, commit=None, dirty=None):
+        """
+        Store a benchmark report
+
+        The git commit and dirty flag come from the report metadata, taken
+        when the benchmarks ran (a report saved as JSON may be recorded from
+        another checkout); reports without them are stored as 'unknown'.
+
+        Parameters:
+        - report: Dict as benchmark.run_suite returns it
+        - commit, dirty: Override the git commit and dirty flag of the metadata
+
+        Returns:
+        - The id of the new run
+        """
+        metadata = report['metadata']
+        if commit is None:
+            commit = metadata.get('git_commit', 'unknown')
+            dirty = metadata.get('git_dirty', False)
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (timestamp, git_commit, git_dirty, machine, metadata) VALUES (?, ?, ?, ?, ?)",
+                (metadata.get('timestamp'), commit, int(bool(dirty)), machine_fingerprint(metadata), json.dumps(metadata))
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO results (run_id, name, algorithm, graph, median_ns, result) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, result['name'], result['params'].get('algorithm'), result['params'].get('graph'),
+                  result['median_ns'], json.dumps(result)) for result in report['results']]
+            )
+        return run_id
+
+    def runs(self, machine=None):
+        """
+        List runs, oldest first, as (id, timestamp, commit, dirty, machine) tuples
+        """
+        query = "SELECT id, timestamp, git_commit, git_dirty, machine FROM runs"
+        params = ()
+        if machine is not None:
+            query += " WHERE machine = ?"
+            params = (machine,)
+        return self.connection.execute(query + " ORDER BY id", params).fetchall()
+
+    def results(self, run_id):
+        """
+        Return {benchmark name: result dict} for one run
+        """
+        rows = self.connection.execute("SELECT name, result FROM results WHERE run_id = ?", (run_id,))
+        return {name: json.loads(result) for name, result in rows}
+
+    def machine_of(self, run_id):
+        row = self.connection.execute("SELECT machine FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"no benchmark run {run_id}")
+        return row[0]
+
+    def latest_pair(self, machine=None):
+        """
+        Ids of the two most recent runs on one machine (the latest run's
+        machine by default), as (baseline, candidate)
+        """
+        if machine is None:
+            runs = self.runs()
+            if not runs:
+                raise ValueError("the result store is empty")
+            machine = runs[-1][4]
+        runs = self.runs(machine)
+        if len(runs) < 2:
+            raise ValueError(f"need two runs on machine {machine} to compare")
+        return runs[-2][0], runs[-1][0]
+
+def mann_whitney_p(baseline, candidate):
+    """
+    One-sided p-value that candidate samples tend to be larger than baseline
+    samples (Mann-Whitney U with the normal approximation and tie correction)
+    """
+    n1, n2 = len(candidate), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+
+    combined = sorted([(x, 0) for x in candidate] + [(x, 1) for x in baseline])
+    n = n1 + n2
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return 1.0
+    z = (u - mean) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(baseline, candidate, threshold=SLOWDOWN_THRESHOLD, alpha=SIGNIFICANCE):
+    """
+    Compare two runs benchmark by benchmark
+
+    Parameters:
+    - baseline, candidate: {name: result dict} as ResultStore.results returns
+    - threshold: Relative median increase below which nothing is flagged
+    - alpha: Significance level of the one-sided Mann-Whitney test
+
+    Returns:
+    - A list of dicts (name, baseline and candidate medians, ratio,
+      p_value, regression flag) for the benchmarks in both runs
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(candidate)):
+        before, after = baseline[name], candidate[name]
+        ratio = after['median_ns'] / before['median_ns'] if before['median_ns'] else float('inf')
+        p_value = mann_whitney_p(before.get('samples_ns', []), after.get('samples_ns', []))
+        rows.append({
+            'name': name,
+            'baseline_ns': before['median_ns'],
+            'candidate_ns': after['median_ns'],
+            'ratio': ratio,
+            'p_value': p_value,
+            'regression': ratio > 1 + threshold and p_value < alpha,
+        })
+    return rows
+
+def print_comparison(rows):
+    print(f"{'Benchmark':<40} {'Baseline (us)':>14} {'Candidate (us)':>15} {'Change':>8} {'p':>8}")
+    print("-" * 89)
+    for row in rows:
+        flag = "  SLOWER" if row['regression'] else ""
+        print(f"{row['name']:<40} {row['baseline_ns'] / 1000:>14.1f} {row['candidate_ns'] / 1000:>15.1f} "
+              f"{(row['ratio'] - 1) * 100:>+7.1f}% {row['p_value']:>8.4f}{flag}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\n{regressions} significant slowdown(s) in {len(rows)} benchmarks")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store and compare benchmark results")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="SQLite database file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="Store JSON reports written by benchmark.py")
+    record_parser.add_argument('reports', nargs='+')
+
+    commands.add_parser('list', help="List stored runs")
+
+    compare_parser = commands.add_parser('compare', help="Flag significant slowdowns between two runs")
+    compare_parser.add_argument('baseline', nargs='?', type=int, help="Baseline run id (default: second latest)")
+    compare_parser.add_argument('candidate', nargs='?', type=int, help="Candidate run id (default: latest)")
+    compare_parser.add_argument('--threshold', type=float, default=SLOWDOWN_THRESHOLD)
+    compare_parser.add_argument('--alpha', type=float, default=SIGNIFICANCE)
+
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.store) as store:
+        if args.command == 'record':
+            for path in args.reports:
+                with open(path) as f:
+                    run_id = store.record(json.load(f))
+                print(f"Recorded {path} as run {run_id}")
+            return 0
+
+        if args.command == 'list':
+            for run_id, timestamp, commit, dirty, machine in store.runs():
+                print(f"{run_id:>5}  {timestamp}  {commit[:12]}{'+' if dirty else ' '}  machine {machine}")
+            return 0
+
+        if args.baseline is None or args.candidate is None:
+            baseline_id, candidate_id = store.latest_pair()
+            baseline_id = args.baseline if args.baseline is not None else baseline_id
+        else:
+            baseline_id, candidate_id = args.baseline, args.candidate
+        if store.machine_of(baseline_id) != store.machine_of(candidate_id):
+            print("warning: the runs come from different machines", file=sys.stderr)
+
+        print(f"Comparing run {baseline_id} (baseline) with run {candidate_id}\n")
+        rows = compare(store.results(baseline_id), store.results(candidate_id), args.threshold, args.alpha)
+        print_comparison(rows)
+        # Non-zero exit status when something got slower, for CI gates
+        return 1 if any(row['regression'] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from disjoint_set import DisjointSet
+from parallel import SharedBuffers, default_workers
+from results import MSTResult
+from shortest_paths import as_csr
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the edge scan falls back to pure Python
+    np = None
+
+# Rounds scan edges in chunks of at least this many per worker task
+MIN_EDGES_PER_TASK = 1 << 16
+
+def _cheapest_edges(sources, targets, comp, lo, hi):
+    """
+    Cheapest edge leaving each component among edges lo..hi-1
+
+    Edges are in sorted_edges() order, so a lower position means a lighter
+    edge (ties broken by position), and the cheapest edge is the one with the
+    lowest position.
+
+    Returns:
+    - A dict mapping component id to edge position
+    """
+    if np is not None:
+        comp = np.asarray(comp)
+        cu = comp[np.asarray(sources[lo:hi])]
+        cv = comp[np.asarray(targets[lo:hi])]
+        positions = np.flatnonzero(cu != cv)
+        if not len(positions):
+            return {}
+        # Both endpoint components see each crossing edge
+        best = np.full(len(comp), hi - lo)
+        np.minimum.at(best, cu[positions], positions)
+        np.minimum.at(best, cv[positions], positions)
+        found = np.flatnonzero(best < hi - lo)
+        return dict(zip(found.tolist(), (best[found] + lo).tolist()))
+
+    best = {}
+    for i in range(lo, hi):
+        cu = comp[sources[i]]
+        cv = comp[targets[i]]
+        if cu != cv:
+            if cu not in best:
+                best[cu] = i
+            if cv not in best:
+                best[cv] = i
+    return best
+
+def _merge_components(comp, best, sources, targets):
+    """
+    Hook every component onto the component across its cheapest edge and
+    relabel comp in place, with NumPy pointer jumping instead of a union-find
+
+    Returns:
+    - The positions of the edges added to the tree
+    """
+    ids = np.fromiter(best.keys(), dtype=np.int64, count=len(best))
+    positions = np.fromiter(best.values(), dtype=np.int64, count=len(best))
+    cu = comp[sources[positions]]
+    cv = comp[targets[positions]]
+    other = np.where(cu == ids, cv, cu)
+
+    parent = np.arange(len(comp))
+    parent[ids] = other
+    # With distinct edge ranks the only cycles are pairs of components that
+    # picked the same edge; the smaller id of each pair becomes the root
+    mutual = (parent[other] == ids) & (ids < other)
+    parent[ids[mutual]] = ids[mutual]
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            break
+        parent = grandparent
+
+    comp[:] = parent[comp]
+    return np.unique(positions)
+
+# Per-process state of pool workers, set up once by _init_worker
+_worker = {}
+
+def _init_worker(spec):
+    _worker['shared'] = SharedBuffers.attach(spec)
+
+def _scan_chunk(bounds):
+    sources, targets, comp = _worker['shared'].views
+    return _cheapest_edges(sources, targets, comp, *bounds)
+
+def boruvka_mst(graph, workers=None):
+    """
+    Borůvka's algorithm for Minimum Spanning Tree (a spanning forest if the
+    graph is disconnected)
+
+    Every round finds the cheapest edge leaving each component and adds all
+    of them at once, so there are at most log2(V) rounds. That scan is the
+    expensive part; it is vectorized with NumPy and can be split into edge
+    chunks across a process pool that sees the edges and component ids
+    through shared memory.
+
+    Parameters:
+    - graph: Graph or CSRGraph (a Graph is frozen first)
+    - workers: Number of worker processes; None or 1 scans in this process,
+      0 uses one worker per CPU
+
+    Returns:
+    - An MSTResult backed by index arrays, as kruskal_mst
+    """
+    graph = as_csr(graph)
+    n = graph.num_vertices
+    sources, targets, weights = graph.sorted_edges()
+    m = len(sources)
+
+    if workers == 0:
+        workers = default_workers()
+    workers = min(workers or 1, max(1, m // MIN_EDGES_PER_TASK))
+
+    chosen = []
+
+    def run_rounds(comp, scan):
+        if np is not None:
+            comp = np.asarray(comp)
+            while True:
+                best = scan()
+                if not best:
+                    break
+                chosen.extend(_merge_components(comp, best, sources, targets).tolist())
+            return
+
+        components = DisjointSet(n)
+        union, find = components.union, components.find
+        while True:
+            best = scan()
+            if not best:
+                break
+            for position in set(best.values()):
+                if union(sources[position], targets[position]):
+                    chosen.append(position)
+            for v in range(n):
+                comp[v] = find(v)
+
+    if workers <= 1:
+        comp = np.arange(n) if np is not None else list(range(n))
+        run_rounds(comp, lambda: _cheapest_edges(sources, targets, comp, 0, m))
+    else:
+        step = -(-m // workers)
+        chunks = [(lo, min(lo + step, m)) for lo in range(0, m, step)]
+        layout = [('q', m), ('q', m), ('q', n)]
+        with SharedBuffers.create(layout) as shared:
+            shared_sources, shared_targets, comp = shared.views
+            for view, buffer in ((shared_sources, sources), (shared_targets, targets)):
+                if np is not None:
+                    buffer = np.ascontiguousarray(buffer, dtype=np.int64)
+                view.cast('B')[:] = memoryview(buffer).cast('B')
+            for v in range(n):
+                comp[v] = v
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as pool:
+                def scan():
+                    best = {}
+                    for part in pool.map(_scan_chunk, chunks):
+                        for c, position in part.items():
+                            if position < best.get(c, m):
+                                best[c] = position
+                    return best
+
+                run_rounds(comp, scan)
+
+    chosen.sort()
+    if np is not None:
+        chosen = np.array(chosen, dtype=np.int64)
+        mst_sources, mst_targets, mst_weights = sources[chosen], targets[chosen], weights[chosen]
+        total_weight = sum(mst_weights.tolist())
+    else:
+        mst_sources = array('q', [sources[i] for i in chosen])
+        mst_targets = array('q', [targets[i] for i in chosen])
+        mst_weights = array(memoryview(weights).format, [weights[i] for i in chosen])
+        total_weight = sum(mst_weights)
+
+    return MSTResult.from_arrays(mst_sources, mst_targets, mst_weights, total_weight, graph.labels)
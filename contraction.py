@@ -0,0 +1,364 @@
+import heapq
+import math
+import struct
+import time
+from array import array
+
+from results import PathResult
+from shortest_paths import as_csr
+
+INF = float('inf')
+
+# Vertices a witness search may settle before it gives up; a missed witness
+# only costs an unnecessary shortcut, never a wrong answer
+WITNESS_SETTLE_LIMIT = 64
+
+MAGIC = b'CHGRAPH1'
+# Magic, vertex count, arc count, build time and the typecode of the arc weights
+HEADER = struct.Struct('<8sqqdc7x')
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over an undirected graph.
+
+    Preprocessing contracts the vertices one by one in order of importance,
+    adding a shortcut u-w (remembering the contracted middle vertex)
+    whenever the only shortest u-w path ran through the contracted vertex.
+    Every vertex then keeps only its arcs to higher-ranked vertices, stored
+    as CSR arrays. A query is a bidirectional Dijkstra that only ever moves
+    upward, and shortcuts on the resulting path are unpacked recursively
+    through their middle vertices.
+    """
+
+    def __init__(self, rank, offsets, targets, weights, middles, graph=None, build_time=0.0):
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middles = middles
+        self.graph = graph
+        self.build_time = build_time
+        self.num_vertices = len(rank)
+
+    @classmethod
+    def build(cls, graph, settle_limit=WITNESS_SETTLE_LIMIT):
+        """
+        Order the vertices and contract them, adding shortcuts
+
+        Parameters:
+        - graph: Graph or CSRGraph (a Graph is frozen first)
+        - settle_limit: Vertex budget of each witness search
+
+        Returns:
+        - A ContractionHierarchy
+        """
+        start_time = time.perf_counter()
+
+        graph = as_csr(graph)
+        n = graph.num_vertices
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+        # Remaining graph as neighbor -> (weight, middle vertex or -1) dicts,
+        # keeping the lightest of any parallel edges
+        adj = [{} for _ in range(n)]
+        for u in range(n):
+            neighbors = adj[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if v != u and (v not in neighbors or weights[i] < neighbors[v][0]):
+                    neighbors[v] = (weights[i], -1)
+
+        contracted_neighbors = [0] * n
+
+        def priority(v):
+            return len(_shortcuts(adj, v, settle_limit)) - len(adj[v]) + contracted_neighbors[v]
+
+        pq = [(priority(v), v) for v in range(n)]
+        heapq.heapify(pq)
+
+        rank = array('q', bytes(8 * n))
+        upward = [None] * n
+        order = 0
+
+        while pq:
+            _, v = heapq.heappop(pq)
+
+            # Lazy update: contract v only if it is still the least important
+            current = priority(v)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, v))
+                continue
+
+            for u, w, weight in _shortcuts(adj, v, settle_limit):
+                if w not in adj[u] or weight < adj[u][w][0]:
+                    adj[u][w] = (weight, v)
+                    adj[w][u] = (weight, v)
+
+            rank[v] = order
+            order += 1
+            upward[v] = adj[v]
+            for u in adj[v]:
+                del adj[u][v]
+                contracted_neighbors[u] += 1
+            adj[v] = {}
+
+        # Flatten the upward arcs into CSR arrays
+        up_offsets = array('q', [0])
+        up_targets = array('q')
+        # Same typecode as the graph's weights, so integer graphs get integer distances
+        up_weights = array(_weight_code(weights))
+        up_middles = array('q')
+        for v in range(n):
+            for u, (weight, middle) in upward[v].items():
+                up_targets.append(u)
+                up_weights.append(weight)
+                up_middles.append(middle)
+            up_offsets.append(len(up_targets))
+
+        return cls(rank, up_offsets, up_targets, up_weights, up_middles, graph,
+                   time.perf_counter() - start_time)
+
+    @property
+    def num_shortcuts(self):
+        return sum(1 for m in self.middles if m >= 0)
+
+    def _search(self, s, t):
+        """
+        Upward bidirectional search between vertex indices
+
+        Returns:
+        - (distance, meeting vertex, forward parents, backward parents, num_settled)
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        dist = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})
+        pqs = ([(0, s)], [(0, t)])
+        best = INF
+        meeting_vertex = None
+        num_settled = 0
+
+        while True:
+            # Advance the side with the smaller key; a side whose key reaches
+            # the best distance so far cannot improve it any more
+            tops = [pq[0][0] if pq else INF for pq in pqs]
+            side = 0 if tops[0] <= tops[1] else 1
+            if tops[side] >= best:
+                break
+
+            current_dist, u = heapq.heappop(pqs[side])
+            side_dist = dist[side]
+            if current_dist > side_dist[u]:
+                continue
+            num_settled += 1
+
+            other = dist[1 - side].get(u)
+            if other is not None and current_dist + other < best:
+                best = current_dist + other
+                meeting_vertex = u
+
+            side_parent = parent[side]
+            start, end = offsets[u], offsets[u + 1]
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                new_dist = current_dist + weight
+                if new_dist < side_dist.get(v, INF):
+                    side_dist[v] = new_dist
+                    side_parent[v] = u
+                    heapq.heappush(pqs[side], (new_dist, v))
+
+        return best, meeting_vertex, parent[0], parent[1], num_settled
+
+    def _arc(self, a, b):
+        # The arc between two vertices is stored at the lower-ranked one
+        if self.rank[a] > self.rank[b]:
+            a, b = b, a
+        for i in range(self.offsets[a], self.offsets[a + 1]):
+            if self.targets[i] == b:
+                return self.weights[i], self.middles[i]
+        raise KeyError((a, b))
+
+    def _unpack(self, a, b, path):
+        # Append the original vertices after a on the a-b arc, ending with b
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            _, middle = self._arc(x, y)
+            if middle < 0:
+                path.append(y)
+            else:
+                stack.append((middle, y))
+                stack.append((x, middle))
+
+    def _indices(self, source, target):
+        if self.graph is None:
+            return source, target
+        return self.graph.index_of(source), self.graph.index_of(target)
+
+    def distance(self, source, target):
+        """
+        Shortest-path distance between two vertices, without unpacking the path
+        """
+        s, t = self._indices(source, target)
+        if s is None or t is None:
+            return INF
+        return self._search(s, t)[0]
+
+    def query(self, source, target):
+        """
+        Shortest path between two vertices
+
+        Returns:
+        - (path, distance, num_settled); path is [] and distance inf if target is unreachable
+        """
+        s, t = self._indices(source, target)
+        if s is None or t is None:
+            return [], INF, 0
+
+        distance, meeting_vertex, forward, backward, num_settled = self._search(s, t)
+        if meeting_vertex is None:
+            return [], INF, num_settled
+
+        # Upward chains s -> meeting vertex and t -> meeting vertex
+        up = [meeting_vertex]
+        while forward[up[-1]] is not None:
+            up.append(forward[up[-1]])
+        up.reverse()
+        down = [meeting_vertex]
+        while backward[down[-1]] is not None:
+            down.append(backward[down[-1]])
+        chain = up + down[1:]
+
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, path)
+
+        if self.graph is not None and self.graph.labels is not None:
+            labels = self.graph.labels
+            path = [labels[v] for v in path]
+
+        return path, distance, num_settled
+
+    def shortest_path(self, source, target):
+        """
+        Same as Graph.shortest_path, answered with the hierarchy
+        """
+        path, distance, _ = self.query(source, target)
+        return PathResult(path, distance)
+
+    def save(self, file_path):
+        """
+        Write the hierarchy (ranks and upward arcs) to a binary file
+        """
+        with open(file_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.num_vertices, len(self.targets), self.build_time,
+                                self.weights.typecode.encode()))
+            for buffer in (self.rank, self.offsets, self.targets, self.weights, self.middles):
+                buffer.tofile(f)
+
+    @classmethod
+    def load(cls, file_path, graph=None):
+        """
+        Read a hierarchy written by save
+
+        Without graph, queries take and return vertex indices instead of labels.
+        """
+        with open(file_path, 'rb') as f:
+            magic, n, num_arcs, build_time, weight_code = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("not a contraction hierarchy file")
+            weight_code = weight_code.decode()
+            buffers = []
+            for code, count in (('q', n), ('q', n + 1), ('q', num_arcs), (weight_code, num_arcs), ('q', num_arcs)):
+                buffer = array(code)
+                buffer.fromfile(f, count)
+                buffers.append(buffer)
+
+        if graph is not None:
+            graph = as_csr(graph)
+            if graph.num_vertices != n:
+                raise ValueError("contraction hierarchy was built for a different graph")
+
+        return cls(*buffers, graph=graph, build_time=build_time)
+
+def _weight_code(weights):
+    # array typecode matching a weight buffer (array, NumPy array or memoryview)
+    code = memoryview(weights).format.lstrip('@=<>!')
+    return code if code in 'bBhHiIlLqQfd' else 'd'
+
+def _shortcuts(adj, v, settle_limit):
+    """
+    Shortcuts needed to contract v from the remaining graph adj
+
+    Returns:
+    - A list of (u, w, weight), each unordered neighbor pair once
+    """
+    neighbors = adj[v]
+    if len(neighbors) < 2:
+        return []
+
+    shortcuts = []
+    items = list(neighbors.items())
+    for i, (u, (weight_u, _)) in enumerate(items):
+        # Witness search from u avoiding v, bounded by the longest path via v
+        needed = {w: weight_u + weight_w for w, (weight_w, _) in items[i + 1:]}
+        if not needed:
+            break
+        limit = max(needed.values())
+
+        dist = {u: 0}
+        pq = [(0, u)]
+        settled = 0
+        while pq and settled < settle_limit:
+            d, x = heapq.heappop(pq)
+            if d > limit:
+                break
+            if d > dist[x]:
+                continue
+            settled += 1
+            for y, (weight, _) in adj[x].items():
+                if y == v:
+                    continue
+                new_dist = d + weight
+                if new_dist < dist.get(y, INF):
+                    dist[y] = new_dist
+                    heapq.heappush(pq, (new_dist, y))
+
+        for w, via in needed.items():
+            if dist.get(w, INF) > via:
+                shortcuts.append((u, w, via))
+
+    return shortcuts
+
+def validate(graph, hierarchy, sources=None, rel_tol=1e-9):
+    """
+    Check hierarchy distances and unpacked paths against dijkstra_shortest_path
+
+    Distances are compared with math.isclose, since float weights summed in
+    a different order than Dijkstra's may differ in the last bits.
+
+    Returns:
+    - The number of (source, target) pairs checked; raises ValueError on a mismatch
+    """
+    checked = 0
+    for source in sources if sources is not None else graph.get_vertices():
+        dist = graph.dijkstra_shortest_path(source).dist
+        for target, expected in dist.items():
+            path, distance, _ = hierarchy.query(source, target)
+            if not math.isclose(distance, expected, rel_tol=rel_tol):
+                raise ValueError(f"distance {source} -> {target} is {distance}, Dijkstra gives {expected}")
+            if expected != INF:
+                length = sum(graph.get_weight(a, b) for a, b in zip(path, path[1:]))
+                if path[0] != source or path[-1] != target or not math.isclose(length, expected, rel_tol=rel_tol):
+                    raise ValueError(f"path {source} -> {target} is not a shortest path: {path}")
+            checked += 1
+    return checked
+
+if __name__ == "__main__":
+    from graph_loader import load_graph
+
+    for file_path in ("test_cities.gr", "test_large.gr"):
+        graph = load_graph(file_path)
+        hierarchy = ContractionHierarchy.build(graph)
+        pairs = validate(graph, hierarchy)
+        print(f"{file_path}: {graph.num_vertices} vertices, {hierarchy.num_shortcuts} shortcuts, "
+              f"built in {hierarchy.build_time:.3f}s, {pairs} pairs match Dijkstra")
@@ -0,0 +1,857 @@
+import heapq
+from array import array
+from operator import itemgetter
+
+from disjoint_set import DisjointSet
+from heaps import DIAL_MAX_WEIGHT, make_heap
+from instrumentation import CountingDisjointSet, CountingHeap, CountingQueue, phase
+from path_search import HEURISTICS, astar_path, bidirectional_dijkstra_path, dijkstra_path
+from query_cache import QueryCache, cached_query
+from results import MSTResult, PathResult, ShortestPathResult
+from spanning_forest import SpanningForest
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up construction and edge sorting; the array module does the rest
+    np = None
+
+# Largest weight for which sorted_edges uses a counting sort
+COUNTING_SORT_MAX_WEIGHT = (1 << 16) - 1
+
+def _weight_array(weights):
+    """
+    Pack weights into the most compact array type that holds them exactly
+    """
+    weights = list(weights)
+    if all(type(w) is int for w in weights):
+        try:
+            return array('q', weights)
+        except OverflowError:
+            pass
+    return array('d', weights)
+
+class CSRGraph:
+    """
+    Frozen, array-backed undirected graph in compressed sparse row form.
+
+    Vertices are stored as the integers 0..n-1. The arcs leaving vertex i
+    are targets[offsets[i]:offsets[i + 1]] with the matching entries of
+    weights; every undirected edge is stored as two arcs (a self-loop as
+    one). `labels` maps indices back to the original vertex names, or is
+    None when the vertices already are 0..n-1.
+
+    All methods that take or return vertices use the original labels, so a
+    CSRGraph can stand in for a Graph wherever the graph is not mutated.
+    """
+
+    def __init__(self, offsets, targets, weights, labels=None, num_edges=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = labels
+        self.num_vertices = len(offsets) - 1
+        self.vertex_attributes = {}
+        self._index = None
+        self._max_weight = None
+        self._sorted_edges = None
+        self.query_cache = None
+        # The arrays are never mutated, so only vertex attributes (which
+        # A* reads) change the version and invalidate cached query results
+        self.version = 0
+
+        if num_edges is None:
+            num_edges = 0
+            for u in range(self.num_vertices):
+                for i in range(offsets[u], offsets[u + 1]):
+                    if u <= targets[i]:
+                        num_edges += 1
+        self.num_edges = num_edges
+
+    @classmethod
+    def from_arcs(cls, num_vertices, sources, targets, weights, labels=None, num_edges=None):
+        """
+        Build a CSRGraph from parallel sequences of directed arcs.
+
+        Parameters:
+        - num_vertices: Number of vertices; arc endpoints must be in range(num_vertices)
+        - sources, targets, weights: Parallel sequences, one entry per arc
+        - labels: Optional list mapping vertex indices to vertex names
+        - num_edges: Number of undirected edges the arcs represent, if known
+
+        Returns:
+        - A CSRGraph whose arcs are grouped by source vertex
+        """
+        num_arcs = len(sources)
+        weights = weights if isinstance(weights, array) else _weight_array(weights)
+        target_code = 'i' if num_vertices < 2 ** 31 else 'q'
+
+        if np is not None and num_arcs:
+            # Stable argsort by source vertex, then copy the buffers back into arrays
+            source_ids = np.asarray(sources, dtype=np.int64)
+            order = np.argsort(source_ids, kind='stable')
+            offsets = array('q', [0])
+            offsets.frombytes(np.cumsum(np.bincount(source_ids, minlength=num_vertices), dtype=np.int64).tobytes())
+            csr_targets = array(target_code)
+            csr_targets.frombytes(np.asarray(targets, dtype=csr_targets.typecode)[order].tobytes())
+            csr_weights = array(weights.typecode)
+            csr_weights.frombytes(np.asarray(weights)[order].tobytes())
+            return cls(offsets, csr_targets, csr_weights, labels, num_edges)
+
+        # Counting sort of the arcs by source vertex
+        offsets = array('q', bytes(8 * (num_vertices + 1)))
+        for s in sources:
+            offsets[s + 1] += 1
+        for i in range(num_vertices):
+            offsets[i + 1] += offsets[i]
+
+        csr_targets = array(target_code, bytes(array(target_code).itemsize * num_arcs))
+        csr_weights = array(weights.typecode, bytes(weights.itemsize * num_arcs))
+
+        position = offsets[:-1]
+        for s, t, w in zip(sources, targets, weights):
+            p = position[s]
+            csr_targets[p] = t
+            csr_weights[p] = w
+            position[s] = p + 1
+
+        return cls(offsets, csr_targets, csr_weights, labels, num_edges)
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges, labels=None):
+        """
+        Build a CSRGraph from (u, v, weight) undirected edges over vertex indices
+        """
+        sources = []
+        targets = []
+        weights = []
+        num_edges = 0
+        for u, v, w in edges:
+            num_edges += 1
+            sources.append(u)
+            targets.append(v)
+            weights.append(w)
+            if u != v:
+                sources.append(v)
+                targets.append(u)
+                weights.append(w)
+        return cls.from_arcs(num_vertices, sources, targets, weights, labels, num_edges)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CSRGraph snapshot of a Graph
+        """
+        vertices = list(graph.vertices)
+        n = len(vertices)
+
+        # Integer vertices 0..n-1 are used directly, anything else is relabelled
+        if all(type(v) is int for v in vertices) and (n == 0 or (min(vertices) == 0 and max(vertices) == n - 1)):
+            labels = None
+            sources = array('q', (u for u, _ in graph.weights))
+            targets = array('q', (v for _, v in graph.weights))
+        else:
+            try:
+                vertices.sort()
+            except TypeError:
+                pass
+            labels = vertices
+            index = {v: i for i, v in enumerate(vertices)}
+            sources = array('q', (index[u] for u, _ in graph.weights))
+            targets = array('q', (index[v] for _, v in graph.weights))
+
+        # graph.weights holds each undirected edge in both directions, a self-loop once
+        self_loops = sum(1 for u, v in graph.weights if u == v)
+        num_edges = (len(graph.weights) + self_loops) // 2
+
+        csr = cls.from_arcs(n, sources, targets, _weight_array(graph.weights.values()), labels, num_edges)
+        csr.vertex_attributes = {v: dict(attrs) for v, attrs in graph.vertex_attributes.items()}
+        return csr
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes held by the offsets, targets and weights buffers
+        """
+        return sum(len(a) * a.itemsize for a in (self.offsets, self.targets, self.weights))
+
+    def enable_query_cache(self, max_entries=128, max_items=None):
+        """
+        Memoize prim_mst, kruskal_mst, dijkstra_shortest_path, shortest_path
+        and astar results until a vertex attribute is next set with
+        set_vertex_attribute, the only change a CSRGraph allows (see
+        QueryCache)
+
+        Returns:
+        - The QueryCache, whose stats() reports hits and misses
+        """
+        self.query_cache = QueryCache(max_entries, max_items)
+        return self.query_cache
+
+    def disable_query_cache(self):
+        self.query_cache = None
+
+    def integer_weight_bound(self):
+        """
+        Largest edge weight if all weights are non-negative integers, else None
+        """
+        if self._max_weight is None:
+            weights = self.weights
+            if memoryview(weights).format not in ('q', 'l', 'i') or min(weights, default=0) < 0:
+                self._max_weight = -1
+            else:
+                self._max_weight = max(weights, default=0)
+        return self._max_weight if self._max_weight >= 0 else None
+
+    def _choose_heap(self, heap):
+        # 'auto' picks Dial's bucket queue for small non-negative integer
+        # weights; setting up max_weight + 1 buckets must also be cheap next
+        # to the search itself, so there should be at least as many arcs
+        if heap == 'auto':
+            bound = self.integer_weight_bound()
+            if bound is not None and bound <= min(DIAL_MAX_WEIGHT, len(self.targets)):
+                return 'dial'
+            return 'heapq'
+        if heap in ('dial', 'radix') and self.integer_weight_bound() is None:
+            raise ValueError(f"heap {heap!r} needs non-negative integer weights")
+        return heap
+
+    def index_of(self, vertex):
+        """
+        Return the index of a vertex label, or None if it is not in the graph
+        """
+        if self.labels is None:
+            if type(vertex) is int and 0 <= vertex < self.num_vertices:
+                return vertex
+            return None
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self.labels)}
+        return self._index.get(vertex)
+
+    def label_of(self, index):
+        return index if self.labels is None else self.labels[index]
+
+    def set_vertex_attribute(self, vertex, name, value):
+        self.version += 1
+        self.vertex_attributes.setdefault(vertex, {})[name] = value
+
+    def get_vertex_attribute(self, vertex, name, default=None):
+        return self.vertex_attributes.get(vertex, {}).get(name, default)
+
+    def get_vertices(self):
+        if self.labels is None:
+            return list(range(self.num_vertices))
+        return list(self.labels)
+
+    def iter_edges(self):
+        """
+        Yield each undirected edge once as (u, v, weight)
+        """
+        offsets, targets, weights, labels = self.offsets, self.targets, self.weights, self.labels
+        for u in range(self.num_vertices):
+            start, end = offsets[u], offsets[u + 1]
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                if u <= v:
+                    if labels is None:
+                        yield (u, v, weight)
+                    else:
+                        yield (labels[u], labels[v], weight)
+
+    def get_edges(self):
+        return list(self.iter_edges())
+
+    def get_neighbors(self, vertex):
+        u = self.index_of(vertex)
+        if u is None:
+            return []
+        return [self.label_of(v) for v in self.targets[self.offsets[u]:self.offsets[u + 1]]]
+
+    def get_weight(self, u, v):
+        u = self.index_of(u)
+        v = self.index_of(v)
+        best = float('inf')
+        if u is None or v is None:
+            return best
+        targets, weights = self.targets, self.weights
+        for i in range(self.offsets[u], self.offsets[u + 1]):
+            if targets[i] == v and weights[i] < best:
+                best = weights[i]
+        return best
+
+    def weighted_neighbors(self, vertex):
+        u = self.index_of(vertex)
+        if u is None:
+            return []
+        start, end = self.offsets[u], self.offsets[u + 1]
+        if self.labels is None:
+            return zip(self.targets[start:end], self.weights[start:end])
+        labels = self.labels
+        return [(labels[v], w) for v, w in zip(self.targets[start:end], self.weights[start:end])]
+
+    def connected_components(self):
+        """
+        Group the vertices into connected components
+
+        Returns:
+        - A list of vertex lists, one per component
+        """
+        offsets, targets = self.offsets, self.targets
+        components = DisjointSet(self.num_vertices)
+        components.union_many((u, targets[i]) for u in range(self.num_vertices)
+                              for i in range(offsets[u], offsets[u + 1]) if u < targets[i])
+        groups = components.groups()
+        if self.labels is not None:
+            labels = self.labels
+            groups = [[labels[i] for i in group] for group in groups]
+        return groups
+
+    @cached_query
+    def prim_mst(self, heap='auto', stats=None):
+        """
+        Prim's algorithm for Minimum Spanning Tree (a spanning forest if the
+        graph is disconnected)
+
+        heap selects the priority queue: 'heapq' pushes duplicate entries and
+        skips stale ones, while 'binary', 'dary' and 'pairing' are indexed
+        heaps (see heaps.py) with true decrease-key and at most V entries.
+        'dial' keeps one bucket per key value and needs non-negative integer
+        weights; 'auto' uses it when the weights allow, else heapq.
+
+        Passing an AlgorithmStats as stats records heap operations and phase
+        timings (see instrumentation.py); without it nothing is counted.
+
+        Returns:
+        - An MSTResult
+        """
+        n = self.num_vertices
+        if n == 0:
+            return MSTResult([], 0)
+
+        heap = self._choose_heap(heap)
+        if heap == 'radix':
+            raise ValueError("a radix heap needs monotone keys, which Prim's algorithm does not produce; use 'dial'")
+
+        if stats is not None:
+            stats.begin('prim', heap, n, self.num_edges)
+            with stats.phase('search'):
+                mst_edges, total_weight = self._prim_counted(heap, stats)
+        elif heap == 'heapq':
+            mst_edges, total_weight = self._prim_lazy()
+        elif heap == 'dial':
+            mst_edges, total_weight = self._prim_dial()
+        else:
+            mst_edges, total_weight = self._prim_indexed(make_heap(heap, n))
+
+        if self.labels is not None:
+            labels = self.labels
+            with phase(stats, 'convert'):
+                mst_edges = [(labels[u], labels[v], w) for u, v, w in mst_edges]
+
+        return MSTResult(mst_edges, total_weight)
+
+    def _prim_counted(self, heap, stats):
+        # The usual loops, handed a counting queue; every vertex is settled
+        # once and scans all of its arcs
+        n = self.num_vertices
+        if heap == 'heapq' or heap == 'dial':
+            queue = CountingQueue(stats)
+            if heap == 'heapq':
+                mst_edges, total_weight = self._prim_lazy(queue)
+            else:
+                mst_edges, total_weight = self._prim_dial(queue.bucket)
+            queue.record(n - len(mst_edges), n, len(self.targets))
+            return mst_edges, total_weight
+
+        result = self._prim_indexed(CountingHeap(make_heap(heap, n), stats))
+        stats.edges_scanned += len(self.targets)
+        return result
+
+    def _prim_lazy(self, queue=heapq):
+        # queue provides heappush and heappop: the heapq module, or a
+        # CountingQueue
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        heappush, heappop = queue.heappush, queue.heappop
+
+        key = [float('inf')] * n
+        parent = [-1] * n
+        in_mst = bytearray(n)
+
+        mst_edges = []
+        total_weight = 0
+
+        # Grow a tree from every vertex not reached yet, giving a spanning forest
+        for root in range(n):
+            if in_mst[root]:
+                continue
+            key[root] = 0
+            pq = []
+            heappush(pq, (0, root))
+
+            while pq:
+                current_key, u = heappop(pq)
+
+                if in_mst[u]:
+                    continue
+                in_mst[u] = 1
+
+                if parent[u] >= 0:
+                    mst_edges.append((parent[u], u, current_key))
+                    total_weight += current_key
+
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    if not in_mst[v] and weight < key[v]:
+                        key[v] = weight
+                        parent[v] = u
+                        heappush(pq, (weight, v))
+
+        return mst_edges, total_weight
+
+    def _prim_dial(self, make_bucket=list):
+        # Prim keys are single edge weights, so bucket w holds the vertices
+        # with key w. Keys are not monotone: moving the cursor back to a
+        # smaller key and stepping forward again over the empty buckets
+        # could cost O(W) per relaxation. Instead the cursor only moves
+        # forward (over all trees of the forest, so O(W) steps in total)
+        # and the few non-empty buckets below it are kept on a small heap
+        # of bucket indices, emptied first. make_bucket makes an empty
+        # bucket (a CountingBucket when counting)
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        key = [float('inf')] * n
+        parent = [-1] * n
+        in_mst = bytearray(n)
+
+        buckets = [make_bucket() for _ in range(self.integer_weight_bound() + 1)]
+        cursor = 0
+        # Indices of the non-empty buckets below the cursor, each once
+        below = []
+
+        mst_edges = []
+        total_weight = 0
+
+        for root in range(n):
+            if in_mst[root]:
+                continue
+            key[root] = 0
+            # Every bucket is empty between trees
+            if cursor > 0:
+                heapq.heappush(below, 0)
+            buckets[0].append(root)
+            pending = 1
+
+            while pending:
+                if below:
+                    current = below[0]
+                    bucket = buckets[current]
+                    u = bucket.pop()
+                    if not bucket:
+                        heapq.heappop(below)
+                else:
+                    bucket = buckets[cursor]
+                    while not bucket:
+                        cursor += 1
+                        bucket = buckets[cursor]
+                    current = cursor
+                    u = bucket.pop()
+                pending -= 1
+
+                if in_mst[u] or key[u] != current:
+                    continue
+                in_mst[u] = 1
+
+                if parent[u] >= 0:
+                    mst_edges.append((parent[u], u, current))
+                    total_weight += current
+
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    if not in_mst[v] and weight < key[v]:
+                        key[v] = weight
+                        parent[v] = u
+                        bucket = buckets[weight]
+                        if weight < cursor and not bucket:
+                            heapq.heappush(below, weight)
+                        bucket.append(v)
+                        pending += 1
+
+        return mst_edges, total_weight
+
+    def _prim_indexed(self, pq):
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        key = [float('inf')] * n
+        parent = [-1] * n
+        in_mst = bytearray(n)
+
+        update = pq.update
+
+        mst_edges = []
+        total_weight = 0
+
+        for root in range(n):
+            if in_mst[root]:
+                continue
+            key[root] = 0
+            pq.push(root, 0)
+
+            while pq:
+                u, current_key = pq.pop()
+                in_mst[u] = 1
+
+                if parent[u] >= 0:
+                    mst_edges.append((parent[u], u, current_key))
+                    total_weight += current_key
+
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    if not in_mst[v] and weight < key[v]:
+                        key[v] = weight
+                        parent[v] = u
+                        update(v, weight)
+
+        return mst_edges, total_weight
+
+    def sorted_edges(self):
+        """
+        Every edge once (self-loops left out), ordered by weight
+
+        The order is computed on first use and cached, since a CSRGraph
+        never changes. Non-negative integer weights up to
+        COUNTING_SORT_MAX_WEIGHT are ordered with a counting sort (with
+        NumPy, a stable 16-bit argsort, which is a radix sort).
+
+        Returns:
+        - (sources, targets, weights) as parallel NumPy arrays of vertex
+          indices and weights, or array.array objects without NumPy
+        """
+        if self._sorted_edges is None:
+            self._sorted_edges = self._sort_edges()
+        return self._sorted_edges
+
+    def clear_caches(self):
+        """
+        Forget the edge order and weight bound computed on first use, so the
+        next call pays for them again (benchmarks use this to time cold runs)
+        """
+        self._sorted_edges = None
+        self._max_weight = None
+
+    def _sort_edges(self):
+        n = self.num_vertices
+        bound = self.integer_weight_bound()
+        counting = bound is not None and bound <= COUNTING_SORT_MAX_WEIGHT
+
+        if np is not None:
+            offsets = np.asarray(self.offsets, dtype=np.int64)
+            sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+            targets = np.asarray(self.targets)
+            weights = np.asarray(self.weights)
+            keep = sources < targets
+            sources, targets, weights = sources[keep], targets[keep], weights[keep]
+            order = np.argsort(weights.astype(np.uint16) if counting else weights, kind='stable')
+            return sources[order], targets[order], weights[order]
+
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        sorted_sources = array('q')
+        sorted_targets = array('q')
+        sorted_weights = array(memoryview(weights).format)
+
+        if counting:
+            bucket_sources = [[] for _ in range(bound + 1)]
+            bucket_targets = [[] for _ in range(bound + 1)]
+            for u in range(n):
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    if u < v:
+                        bucket_sources[weight].append(u)
+                        bucket_targets[weight].append(v)
+            for weight, (us, vs) in enumerate(zip(bucket_sources, bucket_targets)):
+                sorted_sources.extend(us)
+                sorted_targets.extend(vs)
+                sorted_weights.extend([weight] * len(us))
+        else:
+            edges = []
+            for u in range(n):
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    if u < v:
+                        edges.append((weight, u, v))
+            edges.sort(key=itemgetter(0))
+            for weight, u, v in edges:
+                sorted_sources.append(u)
+                sorted_targets.append(v)
+                sorted_weights.append(weight)
+
+        return sorted_sources, sorted_targets, sorted_weights
+
+    @cached_query
+    def kruskal_mst(self, stats=None):
+        """
+        Kruskal's algorithm for Minimum Spanning Tree
+
+        Edges come from sorted_edges(), so only the first call on a graph
+        pays for sorting.
+
+        Parameters:
+        - stats: AlgorithmStats recording union-find operations and the
+          sort, union and convert phases
+
+        Returns:
+        - An MSTResult backed by index arrays (NumPy arrays, or array.array
+          without NumPy); its labelled edge list is built on first use
+        """
+        n = self.num_vertices
+        if stats is not None:
+            stats.begin('kruskal', None, n, self.num_edges)
+
+        with phase(stats, 'sort'):
+            sources, targets, weights = self.sorted_edges()
+            if np is not None:
+                edge_sources, edge_targets = sources.tolist(), targets.tolist()
+            else:
+                edge_sources, edge_targets = sources, targets
+
+        if stats is None:
+            union = DisjointSet(n).union
+        else:
+            union = CountingDisjointSet(n, stats).union
+
+        # Positions of the accepted edges in the sorted arrays
+        chosen = []
+
+        # A spanning tree is complete after V - 1 edges
+        needed = n - 1
+        with phase(stats, 'union'):
+            for i, (u, v) in enumerate(zip(edge_sources, edge_targets)):
+                if len(chosen) == needed:
+                    break
+                if union(u, v):
+                    chosen.append(i)
+
+        with phase(stats, 'convert'):
+            if np is not None:
+                chosen = np.array(chosen, dtype=np.int64)
+                mst_sources, mst_targets, mst_weights = sources[chosen], targets[chosen], weights[chosen]
+                total_weight = sum(mst_weights.tolist())
+            else:
+                mst_sources = array('q', [sources[i] for i in chosen])
+                mst_targets = array('q', [targets[i] for i in chosen])
+                mst_weights = array(memoryview(weights).format, [weights[i] for i in chosen])
+                total_weight = sum(mst_weights)
+
+        return MSTResult.from_arrays(mst_sources, mst_targets, mst_weights, total_weight, self.labels)
+
+    def minimum_spanning_tree(self, algorithm='kruskal', workers=None):
+        """
+        Minimum spanning tree with the named algorithm
+
+        Parameters:
+        - algorithm: 'prim', 'kruskal' or 'boruvka'
+        - workers: Worker processes for 'boruvka' (see boruvka.boruvka_mst)
+
+        Returns:
+        - An MSTResult
+        """
+        if algorithm == 'prim':
+            return self.prim_mst()
+        if algorithm == 'kruskal':
+            return self.kruskal_mst()
+        if algorithm == 'boruvka':
+            # boruvka imports this module through parallel.py
+            from boruvka import boruvka_mst
+            return boruvka_mst(self, workers)
+        raise ValueError(f"unknown MST algorithm {algorithm!r}; expected 'prim', 'kruskal' or 'boruvka'")
+
+    def minimum_spanning_forest(self, algorithm='kruskal', workers=None):
+        """
+        Minimum spanning forest with component ids and per-component totals,
+        from a single run of the named MST algorithm
+
+        Returns:
+        - A SpanningForest
+        """
+        result = self.minimum_spanning_tree(algorithm, workers)
+        return SpanningForest.from_edges(self.get_vertices(), result.edges)
+
+    @cached_query
+    def dijkstra_shortest_path(self, start_vertex, heap='auto', stats=None):
+        """
+        Dijkstra's algorithm for Shortest Path
+
+        heap selects the priority queue and stats records heap operations,
+        as for prim_mst; 'radix' (a radix heap, integer weights only) is also
+        accepted here because Dijkstra's keys never decrease below the last
+        one popped.
+
+        Returns:
+        - A ShortestPathResult holding a distance list and a parent array;
+          its dist and parent dicts are built on first use
+        """
+        source = self.index_of(start_vertex)
+        if source is None:
+            return ShortestPathResult(start_vertex, {}, {})
+
+        heap = self._choose_heap(heap)
+        if stats is not None:
+            stats.begin('dijkstra', heap, self.num_vertices, self.num_edges)
+            with stats.phase('search'):
+                dist, parent = self._dijkstra_counted(source, heap, stats)
+        elif heap == 'heapq':
+            dist, parent = self._dijkstra_lazy(source)
+        elif heap == 'dial':
+            dist, parent = self._dijkstra_dial(source)
+        else:
+            dist, parent = self._dijkstra_indexed(source, make_heap(heap, self.num_vertices))
+
+        with phase(stats, 'convert'):
+            parent = array('q', parent)
+
+        labels = self.labels if self.labels is not None else range(self.num_vertices)
+        return ShortestPathResult.from_arrays(start_vertex, dist, parent, labels, self.index_of)
+
+    def _dijkstra_counted(self, source, heap, stats):
+        # As _prim_counted; every reached vertex is settled once and scans
+        # all of its arcs
+        n = self.num_vertices
+        offsets = self.offsets
+        if heap == 'heapq' or heap == 'dial':
+            queue = CountingQueue(stats)
+            if heap == 'heapq':
+                dist, parent = self._dijkstra_lazy(source, queue)
+            else:
+                dist, parent = self._dijkstra_dial(source, queue.bucket)
+            reached = [u for u in range(n) if dist[u] != float('inf')]
+            queue.record(1, len(reached), sum(offsets[u + 1] - offsets[u] for u in reached))
+            return dist, parent
+
+        dist, parent = self._dijkstra_indexed(source, CountingHeap(make_heap(heap, n), stats))
+        stats.edges_scanned += sum(offsets[u + 1] - offsets[u] for u in range(n) if dist[u] != float('inf'))
+        return dist, parent
+
+    def _dijkstra_lazy(self, source, queue=heapq):
+        # queue as for _prim_lazy
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        heappush, heappop = queue.heappush, queue.heappop
+
+        dist = [float('inf')] * n
+        dist[source] = 0
+        parent = [-1] * n
+
+        pq = []
+        heappush(pq, (0, source))
+
+        while pq:
+            current_dist, u = heappop(pq)
+
+            if current_dist > dist[u]:
+                continue
+
+            start, end = offsets[u], offsets[u + 1]
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                new_dist = current_dist + weight
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    parent[v] = u
+                    heappush(pq, (new_dist, v))
+
+        return dist, parent
+
+    def _dijkstra_dial(self, source, make_bucket=list):
+        # Dial's algorithm: the tentative distances in the queue always lie
+        # within [d, d + max_weight], so max_weight + 1 circular buckets
+        # suffice and the current distance d just counts upwards. make_bucket
+        # as for _prim_dial
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        dist = [float('inf')] * n
+        dist[source] = 0
+        parent = [-1] * n
+
+        num_buckets = self.integer_weight_bound() + 1
+        buckets = [make_bucket() for _ in range(num_buckets)]
+        buckets[0].append(source)
+        pending = 1
+        d = 0
+
+        while pending:
+            bucket = buckets[d % num_buckets]
+            while bucket:
+                u = bucket.pop()
+                pending -= 1
+                if dist[u] != d:
+                    continue
+
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets[start:end], weights[start:end]):
+                    new_dist = d + weight
+                    if new_dist < dist[v]:
+                        dist[v] = new_dist
+                        parent[v] = u
+                        buckets[new_dist % num_buckets].append(v)
+                        pending += 1
+            d += 1
+
+        return dist, parent
+
+    def _dijkstra_indexed(self, source, pq):
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        dist = [float('inf')] * n
+        dist[source] = 0
+        parent = [-1] * n
+
+        pq.push(source, 0)
+        update = pq.update
+
+        while pq:
+            u, current_dist = pq.pop()
+
+            start, end = offsets[u], offsets[u + 1]
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                new_dist = current_dist + weight
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    parent[v] = u
+                    update(v, new_dist)
+
+        return dist, parent
+
+    @cached_query
+    def shortest_path(self, source, target, bidirectional=False):
+        """
+        Shortest path between two vertices, stopping once target is settled
+
+        Returns a PathResult like Graph.shortest_path.
+        """
+        if self.index_of(source) is None or self.index_of(target) is None:
+            return PathResult([], float('inf'))
+
+        search = bidirectional_dijkstra_path if bidirectional else dijkstra_path
+        path, distance, _ = search(self, source, target)
+        return PathResult(path, distance)
+
+    @cached_query
+    def astar(self, source, target, heuristic='great_circle'):
+        """
+        A* search for the shortest path between two vertices
+
+        heuristic is 'great_circle' (latitude, longitude in degrees) or
+        'euclidean' (planar x, y), which estimate the remaining distance from
+        the 'coordinates' vertex attribute (needed on every vertex) scaled
+        by consistent_scale so they never overestimate it, or any function
+        heuristic(vertex, target) that never overestimates it.
+        Returns a PathResult like shortest_path.
+        """
+        if self.index_of(source) is None or self.index_of(target) is None:
+            return PathResult([], float('inf'))
+
+        if isinstance(heuristic, str):
+            heuristic = HEURISTICS[heuristic](self)
+        path, distance, _ = astar_path(self, source, target, heuristic)
+        return PathResult(path, distance)
@@ -0,0 +1,92 @@
+class DisjointSet:
+    """
+    Union-find over the integers 0..n-1.
+
+    parent and size are flat lists indexed by element. find uses iterative
+    path halving (every visited element is pointed at its grandparent), so
+    there is no recursion however deep a tree gets, and union attaches the
+    smaller tree under the larger one.
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.num_sets = n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, x):
+        """
+        Return the representative of the set containing x
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    def union(self, a, b):
+        """
+        Merge the sets containing a and b
+
+        Returns:
+        - True if they were different sets, False if already joined
+        """
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a == b:
+            return False
+
+        size = self.size
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+        self.num_sets -= 1
+        return True
+
+    def union_many(self, pairs):
+        """
+        Merge the sets of every (a, b) pair
+
+        Returns:
+        - The number of pairs that joined two different sets
+        """
+        union = self.union
+        merged = 0
+        for a, b in pairs:
+            if union(a, b):
+                merged += 1
+        return merged
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def set_size(self, x):
+        return self.size[self.find(x)]
+
+    def component_ids(self):
+        """
+        Number the sets 0..num_sets-1 in order of their smallest element
+
+        Returns:
+        - A list giving the set number of every element
+        """
+        find = self.find
+        numbers = {}
+        ids = []
+        for x in range(len(self.parent)):
+            ids.append(numbers.setdefault(find(x), len(numbers)))
+        return ids
+
+    def groups(self):
+        """
+        Return the sets as lists of elements, ordered as in component_ids
+        """
+        groups = [[] for _ in range(self.num_sets)]
+        for x, i in enumerate(self.component_ids()):
+            groups[i].append(x)
+        return groups
@@ -0,0 +1,217 @@
+from spanning_forest import SpanningForest
+
+class DynamicMST:
+    """
+    Minimum spanning forest of a Graph kept current under edge insertions,
+    weight changes and deletions.
+
+    The forest is stored twice: as adjacency dicts (tree[v] maps each tree
+    neighbor to the edge weight) and as parent pointers rooting every tree.
+    The tree path between two vertices is found by climbing parent pointers,
+    so an insertion or weight decrease costs O(depth): if the new edge is
+    lighter than the heaviest edge on the path between its endpoints, the
+    two are swapped (cycle property). Deleting a tree edge, or making one
+    heavier, cuts it and searches the non-tree edges of the smaller of the
+    two halves for the lightest replacement (cut property).
+
+    Apply updates through add_edge/remove_edge so the graph and the forest
+    change together. If the graph is mutated directly, the forest is rebuilt
+    from scratch on the next call.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.num_rebuilds = 0
+        self._rebuild()
+
+    def _rebuild(self):
+        graph = self.graph
+        result = graph.kruskal_mst()
+
+        tree = {vertex: {} for vertex in graph.vertices}
+        for u, v, weight in result.edges:
+            tree[u][v] = weight
+            tree[v][u] = weight
+
+        parent = {}
+        for root in graph.vertices:
+            if root in parent:
+                continue
+            parent[root] = None
+            stack = [root]
+            while stack:
+                x = stack.pop()
+                for y in tree[x]:
+                    if y not in parent:
+                        parent[y] = x
+                        stack.append(y)
+
+        self.tree = tree
+        self.parent = parent
+        self._total_weight = result.total_weight
+        self._version = graph.version
+
+    def _sync(self):
+        if self._version != self.graph.version:
+            self.num_rebuilds += 1
+            self._rebuild()
+
+    def _add_vertex(self, vertex):
+        if vertex not in self.parent:
+            self.parent[vertex] = None
+            self.tree[vertex] = {}
+
+    def _path(self, u, v):
+        """
+        Vertices on the tree path from u to v, or None if they are in different trees
+        """
+        parent = self.parent
+
+        up = [u]
+        while parent[up[-1]] is not None:
+            up.append(parent[up[-1]])
+        position = {x: i for i, x in enumerate(up)}
+
+        down = [v]
+        while down[-1] not in position:
+            x = parent[down[-1]]
+            if x is None:
+                return None
+            down.append(x)
+
+        meeting_vertex = down[-1]
+        return up[:position[meeting_vertex] + 1] + down[-2::-1]
+
+    def _reroot(self, x):
+        # Reverse the parent pointers on the path from x to its root
+        parent = self.parent
+        previous = None
+        while x is not None:
+            parent[x], previous, x = previous, x, parent[x]
+
+    def _link(self, u, v, weight):
+        self._reroot(u)
+        self.parent[u] = v
+        self.tree[u][v] = weight
+        self.tree[v][u] = weight
+        self._total_weight += weight
+
+    def _cut(self, u, v):
+        weight = self.tree[u].pop(v)
+        del self.tree[v][u]
+        if self.parent[u] == v:
+            self.parent[u] = None
+        else:
+            self.parent[v] = None
+        self._total_weight -= weight
+
+    def _smaller_side(self, u, v):
+        # Breadth-first search from both ends of a cut edge in lockstep; the
+        # first search to run out has found the smaller tree
+        tree = self.tree
+        queues = ([u], [v])
+        seen = ({u}, {v})
+        heads = [0, 0]
+        while True:
+            for side in (0, 1):
+                queue = queues[side]
+                if heads[side] == len(queue):
+                    return seen[side]
+                x = queue[heads[side]]
+                heads[side] += 1
+                for y in tree[x]:
+                    if y not in seen[side]:
+                        seen[side].add(y)
+                        queue.append(y)
+
+    def _reconnect(self, u, v):
+        # Link the trees of u and v (just cut apart) with the lightest graph
+        # edge between them, if there is one
+        side = self._smaller_side(u, v)
+        graph = self.graph
+        best = None
+        for x in side:
+            for y in graph.get_neighbors(x):
+                if y not in side:
+                    weight = graph.weights[(x, y)]
+                    if best is None or weight < best[0]:
+                        best = (weight, x, y)
+        if best is not None:
+            weight, x, y = best
+            self._link(x, y, weight)
+
+    def add_vertex(self, vertex):
+        self._sync()
+        self.graph.add_vertex(vertex)
+        self._add_vertex(vertex)
+        self._version = self.graph.version
+
+    def add_edge(self, u, v, weight):
+        """
+        Insert an edge, or change the weight of an existing one, and update the forest
+        """
+        self._sync()
+        self.graph.add_edge(u, v, weight)
+        self._version = self.graph.version
+        self._add_vertex(u)
+        self._add_vertex(v)
+        if u == v:
+            return
+
+        tree = self.tree
+        if v in tree[u]:
+            old_weight = tree[u][v]
+            tree[u][v] = tree[v][u] = weight
+            self._total_weight += weight - old_weight
+            if weight > old_weight:
+                # A non-tree edge may now be the lightest across this cut
+                self._cut(u, v)
+                self._reconnect(u, v)
+            return
+
+        path = self._path(u, v)
+        if path is None:
+            self._link(u, v, weight)
+            return
+
+        a, b = max(zip(path, path[1:]), key=lambda edge: tree[edge[0]][edge[1]])
+        if weight < tree[a][b]:
+            self._cut(a, b)
+            self._link(u, v, weight)
+
+    def update_weight(self, u, v, weight):
+        self.add_edge(u, v, weight)
+
+    def remove_edge(self, u, v):
+        """
+        Delete an edge and update the forest
+
+        Returns:
+        - The weight the edge had; raises KeyError if there is no such edge
+        """
+        self._sync()
+        weight = self.graph.remove_edge(u, v)
+        self._version = self.graph.version
+        if v in self.tree[u]:
+            self._cut(u, v)
+            self._reconnect(u, v)
+        return weight
+
+    @property
+    def total_weight(self):
+        self._sync()
+        return self._total_weight
+
+    def mst_edges(self):
+        """
+        Return the forest edges as (u, v, weight) tuples, like MSTResult.edges
+        """
+        self._sync()
+        tree = self.tree
+        return [(x, p, tree[x][p]) for x, p in self.parent.items() if p is not None]
+
+    def forest(self):
+        """
+        Return the current forest as a SpanningForest
+        """
+        return SpanningForest.from_edges(self.graph.vertices, self.mst_edges())
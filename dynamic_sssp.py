@@ -0,0 +1,211 @@
+import heapq
+
+from path_search import reconstruct_path
+
+INF = float('inf')
+
+class ShortestPathTree:
+    """
+    Single-source shortest-path tree of a Graph kept current under edge
+    insertions, weight changes and deletions (in the manner of
+    Ramalingam and Reps).
+
+    A lighter or new edge u-v can only shorten paths through it, so a
+    Dijkstra pass starts at whichever endpoint improves and stops where
+    distances no longer drop. A heavier or deleted tree edge can only
+    lengthen paths in the subtree below it: those vertices are reset, each
+    takes the best distance offered by a neighbor outside the subtree, and
+    a Dijkstra pass restricted to the subtree settles the rest. Non-tree
+    edges getting heavier change nothing.
+
+    last_touched counts the vertices whose distance was reset or settled
+    by the most recent update; total_touched and num_updates accumulate
+    across updates. Apply updates through this object; if the graph is
+    mutated directly, the tree is rebuilt with a full Dijkstra run on the
+    next call.
+    """
+
+    def __init__(self, graph, source):
+        if source not in graph.vertices:
+            raise ValueError(f"vertex {source!r} is not in the graph")
+        self.graph = graph
+        self.source = source
+        self.last_touched = 0
+        self.total_touched = 0
+        self.num_updates = 0
+        self.num_rebuilds = 0
+        self._rebuild()
+
+    def _rebuild(self):
+        graph = self.graph
+        result = graph.dijkstra_shortest_path(self.source)
+        dist, parent = result.dist, result.parent
+
+        children = {vertex: set() for vertex in dist}
+        for vertex, p in parent.items():
+            if p is not None:
+                children[p].add(vertex)
+
+        # Copies, since the tree is updated in place and the graph's query
+        # cache may hold the originals
+        self.dist = dict(dist)
+        self.parent = dict(parent)
+        self.children = children
+        self._version = graph.version
+
+    def _sync(self):
+        if self._version != self.graph.version:
+            self.num_rebuilds += 1
+            self._rebuild()
+
+    def _add_vertex(self, vertex):
+        if vertex not in self.dist:
+            self.dist[vertex] = INF
+            self.parent[vertex] = None
+            self.children[vertex] = set()
+
+    def _set_parent(self, vertex, p):
+        old = self.parent[vertex]
+        if old is not None:
+            self.children[old].discard(vertex)
+        self.parent[vertex] = p
+        if p is not None:
+            self.children[p].add(vertex)
+
+    def _decrease(self, u, v, weight):
+        # Propagate a shorter path to v through u; returns vertices settled
+        dist = self.dist
+        new_dist = dist[u] + weight
+        if new_dist >= dist[v]:
+            return 0
+
+        dist[v] = new_dist
+        self._set_parent(v, u)
+        neighbors = self.graph.weighted_neighbors
+        pq = [(new_dist, v)]
+        touched = 0
+
+        while pq:
+            current_dist, x = heapq.heappop(pq)
+            if current_dist > dist[x]:
+                continue
+            touched += 1
+            for y, w in neighbors(x):
+                candidate = current_dist + w
+                if candidate < dist[y]:
+                    dist[y] = candidate
+                    self._set_parent(y, x)
+                    heapq.heappush(pq, (candidate, y))
+
+        return touched
+
+    def _increase(self, root):
+        # Recompute the subtree below root after the edge to its parent got
+        # heavier or disappeared; returns the subtree size
+        dist, children = self.dist, self.children
+        neighbors = self.graph.weighted_neighbors
+
+        affected = []
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            affected.append(x)
+            stack.extend(children[x])
+        affected_set = set(affected)
+
+        for x in affected:
+            self._set_parent(x, None)
+            dist[x] = INF
+
+        pq = []
+        for x in affected:
+            best, best_parent = INF, None
+            for y, w in neighbors(x):
+                if y not in affected_set and dist[y] + w < best:
+                    best, best_parent = dist[y] + w, y
+            if best_parent is not None:
+                dist[x] = best
+                self._set_parent(x, best_parent)
+                pq.append((best, x))
+        heapq.heapify(pq)
+
+        while pq:
+            current_dist, x = heapq.heappop(pq)
+            if current_dist > dist[x]:
+                continue
+            for y, w in neighbors(x):
+                candidate = current_dist + w
+                if y in affected_set and candidate < dist[y]:
+                    dist[y] = candidate
+                    self._set_parent(y, x)
+                    heapq.heappush(pq, (candidate, y))
+
+        return len(affected)
+
+    def _record(self, touched):
+        self.last_touched = touched
+        self.total_touched += touched
+        self.num_updates += 1
+        self._version = self.graph.version
+
+    def add_vertex(self, vertex):
+        self._sync()
+        self.graph.add_vertex(vertex)
+        self._add_vertex(vertex)
+        self._version = self.graph.version
+
+    def add_edge(self, u, v, weight):
+        """
+        Insert an edge, or change the weight of an existing one, and repair the tree
+        """
+        self._sync()
+        old_weight = self.graph.weights.get((u, v))
+        self.graph.add_edge(u, v, weight)
+        self._add_vertex(u)
+        self._add_vertex(v)
+
+        touched = 0
+        if old_weight is not None and weight > old_weight:
+            if self.parent[v] == u:
+                touched = self._increase(v)
+            elif self.parent[u] == v:
+                touched = self._increase(u)
+        elif u != v:
+            touched = self._decrease(u, v, weight) + self._decrease(v, u, weight)
+
+        self._record(touched)
+
+    def update_weight(self, u, v, weight):
+        self.add_edge(u, v, weight)
+
+    def remove_edge(self, u, v):
+        """
+        Delete an edge and repair the tree
+
+        Returns:
+        - The weight the edge had; raises KeyError if there is no such edge
+        """
+        self._sync()
+        weight = self.graph.remove_edge(u, v)
+
+        touched = 0
+        if self.parent[v] == u:
+            touched = self._increase(v)
+        elif self.parent[u] == v:
+            touched = self._increase(u)
+
+        self._record(touched)
+        return weight
+
+    def distance(self, vertex):
+        self._sync()
+        return self.dist.get(vertex, INF)
+
+    def path(self, vertex):
+        """
+        Shortest path from the source to vertex, or [] if it is unreachable
+        """
+        self._sync()
+        if self.dist.get(vertex, INF) == INF:
+            return []
+        return reconstruct_path(self.parent, vertex)
@@ -1,56 +1,193 @@
 import heapq
-import time
 from collections import defaultdict
 
+from boruvka import boruvka_mst
+from csr_graph import CSRGraph
+from disjoint_set import DisjointSet
+from instrumentation import CountingDisjointSet, CountingQueue, phase
+from path_search import HEURISTICS, astar_path, bidirectional_dijkstra_path, dijkstra_path
+from query_cache import QueryCache, cached_query
+from results import MSTResult, PathResult, ShortestPathResult
+from spanning_forest import SpanningForest
+
 class Graph:
     def __init__(self):
         self.vertices = set()
         self.edges = defaultdict(list)
         self.weights = {}
+        self._num_edges = 0
+        # Per-vertex attribute dicts, e.g. {'name': ..., 'coordinates': (lat, lon)}
+        self.vertex_attributes = {}
+        # Bumped on every mutation; freeze() reuses its snapshot while it is unchanged
+        self.version = 0
+        self._frozen = None
+        # Set by enable_query_cache
+        self.query_cache = None
         
     def add_vertex(self, vertex):
+        self.version += 1
         self.vertices.add(vertex)
         
     def add_edge(self, u, v, weight):
+        self.version += 1
         self.vertices.add(u)
         self.vertices.add(v)
-        self.edges[u].append(v)
-        self.edges[v].append(u)  # For undirected graph
+        # Re-adding an existing edge only updates its weight
+        if (u, v) not in self.weights:
+            self._num_edges += 1
+            self.edges[u].append(v)
+            self.edges[v].append(u)  # For undirected graph
         self.weights[(u, v)] = weight
         self.weights[(v, u)] = weight  # For undirected graph
         
+    def remove_edge(self, u, v):
+        """
+        Remove the edge between u and v
+
+        Returns:
+        - The weight the edge had; raises KeyError if there is no such edge
+        """
+        weight = self.weights[(u, v)]
+        self.version += 1
+        self._num_edges -= 1
+        self.edges[u] = [x for x in self.edges[u] if x != v]
+        self.edges[v] = [x for x in self.edges[v] if x != u]
+        del self.weights[(u, v)]
+        self.weights.pop((v, u), None)
+        return weight
+        
+    def set_vertex_attribute(self, vertex, name, value):
+        self.version += 1
+        self.vertex_attributes.setdefault(vertex, {})[name] = value
+
+    def get_vertex_attribute(self, vertex, name, default=None):
+        return self.vertex_attributes.get(vertex, {}).get(name, default)
+
     def get_vertices(self):
         return list(self.vertices)
     
+    @property
+    def num_edges(self):
+        return self._num_edges
+
+    def iter_edges(self):
+        """
+        Yield each undirected edge once as (u, v, weight), in O(V + E)
+        """
+        done = set()
+        for u, neighbors in self.edges.items():
+            seen = set()
+            for v in neighbors:
+                # (v, u) was yielded while scanning v, or (u, v) was added twice
+                if v in done or v in seen:
+                    continue
+                seen.add(v)
+                yield (u, v, self.weights[(u, v)])
+            done.add(u)
+
     def get_edges(self):
-        edges = []
-        for u in self.edges:
-            for v in self.edges[u]:
-                if (u, v) not in edges and (v, u) not in edges:
-                    edges.append((u, v, self.weights[(u, v)]))
-        return edges
+        return list(self.iter_edges())
     
     def get_neighbors(self, vertex):
         return self.edges[vertex]
     
     def get_weight(self, u, v):
         return self.weights.get((u, v), float('inf'))
+
+    def weighted_neighbors(self, vertex):
+        weights = self.weights
+        return [(v, weights[(vertex, v)]) for v in self.edges.get(vertex, ())]
+
+    def connected_components(self):
+        """
+        Group the vertices into connected components
+
+        Returns:
+        - A list of vertex lists, one per component
+        """
+        vertices = list(self.vertices)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        components = DisjointSet(len(vertices))
+        components.union_many((index[u], index[v]) for u, v, _ in self.iter_edges())
+        return [[vertices[i] for i in group] for group in components.groups()]
+
+    def enable_query_cache(self, max_entries=128, max_items=None):
+        """
+        Memoize prim_mst, kruskal_mst, dijkstra_shortest_path, shortest_path
+        and astar results until the graph is next mutated (see QueryCache)
+
+        Returns:
+        - The QueryCache, whose stats() reports hits and misses
+        """
+        self.query_cache = QueryCache(max_entries, max_items)
+        return self.query_cache
+
+    def disable_query_cache(self):
+        self.query_cache = None
+
+    def freeze(self):
+        """
+        Return a read-only, array-backed CSRGraph snapshot of this graph.
+
+        The snapshot runs prim_mst, kruskal_mst and dijkstra_shortest_path
+        on contiguous buffers instead of dicts keyed by vertex pairs; later
+        changes to this graph are not reflected in it. The snapshot (and
+        whatever it caches, such as its sorted edge order) is reused until
+        the graph is next mutated.
+        """
+        if self._frozen is None or self._frozen[0] != self.version:
+            self._frozen = (self.version, CSRGraph.from_graph(self))
+        return self._frozen[1]
     
-    def prim_mst(self):
+    def clear_caches(self):
         """
-        Prim's algorithm for Minimum Spanning Tree
+        Drop the frozen snapshot (and the edge order it caches), so the next
+        call that needs it builds it again
         """
-        start_time = time.time()
-        
+        self._frozen = None
+
+    @cached_query
+    def prim_mst(self, heap='auto', stats=None):
+        """
+        Prim's algorithm for Minimum Spanning Tree (a spanning forest if the
+        graph is disconnected)
+
+        Except with heap='heapq', which runs the search on the adjacency
+        dicts, the graph is frozen (the snapshot is reused until the graph
+        changes) and the CSRGraph version runs with that priority queue;
+        the default 'auto' picks Dial's buckets for small non-negative
+        integer weights and heapq otherwise (see CSRGraph.prim_mst). Passing
+        an AlgorithmStats as stats records heap operations and phase timings
+        (see instrumentation.py).
+
+        Returns:
+        - An MSTResult (use timing.Timer to measure the call)
+        """
+        if heap != 'heapq':
+            with phase(stats, 'freeze'):
+                frozen = self.freeze()
+            return frozen.prim_mst(heap, stats=stats)
+
         if not self.vertices:
-            return [], 0, 0
-        
-        # Start with an arbitrary vertex
-        start_vertex = next(iter(self.vertices))
-        
-        # Priority queue to store vertices and their key values
-        pq = [(0, start_vertex)]
-        
+            return MSTResult([], 0)
+
+        if stats is not None:
+            stats.begin('prim', heap, len(self.vertices), self.num_edges)
+            with stats.phase('search'):
+                queue = CountingQueue(stats)
+                result = self._prim_lazy(queue)
+            # Every vertex is settled once and scans all of its arcs
+            queue.record(len(self.vertices) - len(result), len(self.vertices),
+                         sum(len(neighbors) for neighbors in self.edges.values()))
+            return result
+
+        return self._prim_lazy()
+
+    def _prim_lazy(self, queue=heapq):
+        # queue provides heappush and heappop: the heapq module, or a
+        # CountingQueue
+        heappush, heappop = queue.heappush, queue.heappop
+
         # To keep track of vertices included in MST
         mst_set = set()
         
@@ -62,75 +199,82 @@ class Graph:
         
         # Dictionary to store key values of vertices
         key = {vertex: float('inf') for vertex in self.vertices}
-        key[start_vertex] = 0
         
         # Dictionary to store parent of each vertex in MST
         parent = {vertex: None for vertex in self.vertices}
         
-        while pq:
-            # Extract vertex with minimum key value
-            current_key, u = heapq.heappop(pq)
-            
-            # If vertex is already in MST, skip
-            if u in mst_set:
+        # Grow a tree from every vertex not reached yet, so a disconnected
+        # graph gets a spanning forest (as kruskal_mst returns)
+        for start_vertex in self.vertices:
+            if start_vertex in mst_set:
                 continue
+            key[start_vertex] = 0
             
-            # Add vertex to MST
-            mst_set.add(u)
+            # Priority queue to store vertices and their key values
+            pq = []
+            heappush(pq, (0, start_vertex))
             
-            # Add edge to MST if parent exists
-            if parent[u] is not None:
-                mst_edges.append((parent[u], u, self.get_weight(parent[u], u)))
-                total_weight += self.get_weight(parent[u], u)
-            
-            # Update key values of adjacent vertices
-            for v in self.get_neighbors(u):
-                weight = self.get_weight(u, v)
-                if v not in mst_set and weight < key[v]:
-                    key[v] = weight
-                    parent[v] = u
-                    heapq.heappush(pq, (key[v], v))
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
+            while pq:
+                # Extract vertex with minimum key value
+                current_key, u = heappop(pq)
+                
+                # If vertex is already in MST, skip
+                if u in mst_set:
+                    continue
+                
+                # Add vertex to MST
+                mst_set.add(u)
+                
+                # Add edge to MST if parent exists
+                if parent[u] is not None:
+                    mst_edges.append((parent[u], u, self.get_weight(parent[u], u)))
+                    total_weight += self.get_weight(parent[u], u)
+                
+                # Update key values of adjacent vertices
+                for v in self.get_neighbors(u):
+                    weight = self.get_weight(u, v)
+                    if v not in mst_set and weight < key[v]:
+                        key[v] = weight
+                        parent[v] = u
+                        heappush(pq, (key[v], v))
         
-        return mst_edges, total_weight, execution_time
+        return MSTResult(mst_edges, total_weight)
     
-    def kruskal_mst(self):
+    @cached_query
+    def kruskal_mst(self, arrays=False, stats=None):
         """
         Kruskal's algorithm for Minimum Spanning Tree
+
+        With arrays=True the frozen snapshot runs it on presorted edge
+        arrays and returns an MSTResult backed by index arrays (see
+        CSRGraph.kruskal_mst); repeated calls then skip sorting until the
+        graph is mutated. With stats, union-find operations and the sort
+        and union phases are recorded.
+
+        Returns:
+        - An MSTResult
         """
-        start_time = time.time()
-        
+        if arrays:
+            with phase(stats, 'freeze'):
+                frozen = self.freeze()
+            return frozen.kruskal_mst(stats=stats)
+
         if not self.vertices:
-            return [], 0, 0
+            return MSTResult([], 0)
+
+        if stats is not None:
+            stats.begin('kruskal', None, len(self.vertices), self.num_edges)
         
         # Sort all edges in non-decreasing order of their weight
-        edges = sorted(self.get_edges(), key=lambda x: x[2])
-        
-        # Initialize disjoint set for each vertex
-        parent = {vertex: vertex for vertex in self.vertices}
-        rank = {vertex: 0 for vertex in self.vertices}
+        with phase(stats, 'sort'):
+            edges = sorted(self.iter_edges(), key=lambda x: x[2])
         
-        def find(vertex):
-            if parent[vertex] != vertex:
-                parent[vertex] = find(parent[vertex])
-            return parent[vertex]
-        
-        def union(u, v):
-            root_u = find(u)
-            root_v = find(v)
-            
-            if root_u == root_v:
-                return
-            
-            if rank[root_u] < rank[root_v]:
-                parent[root_u] = root_v
-            elif rank[root_u] > rank[root_v]:
-                parent[root_v] = root_u
-            else:
-                parent[root_v] = root_u
-                rank[root_u] += 1
+        # Disjoint set over vertex indices
+        index = {vertex: i for i, vertex in enumerate(self.vertices)}
+        if stats is None:
+            union = DisjointSet(len(index)).union
+        else:
+            union = CountingDisjointSet(len(index), stats).union
         
         # To store MST edges
         mst_edges = []
@@ -138,28 +282,86 @@ class Graph:
         # To store the total weight of MST
         total_weight = 0
         
-        for u, v, weight in edges:
-            if find(u) != find(v):
-                mst_edges.append((u, v, weight))
-                total_weight += weight
-                union(u, v)
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
+        # A spanning tree is complete after V - 1 edges
+        needed = len(index) - 1
+        with phase(stats, 'union'):
+            for u, v, weight in edges:
+                if len(mst_edges) == needed:
+                    break
+                if union(index[u], index[v]):
+                    mst_edges.append((u, v, weight))
+                    total_weight += weight
         
-        return mst_edges, total_weight, execution_time
+        return MSTResult(mst_edges, total_weight)
     
-    def dijkstra_shortest_path(self, start_vertex):
+    def minimum_spanning_tree(self, algorithm='kruskal', workers=None):
+        """
+        Minimum spanning tree with the named algorithm
+
+        Parameters:
+        - algorithm: 'prim', 'kruskal' or 'boruvka'
+        - workers: Worker processes for 'boruvka' (see boruvka.boruvka_mst)
+
+        Returns:
+        - An MSTResult
+        """
+        if algorithm == 'prim':
+            return self.prim_mst()
+        if algorithm == 'kruskal':
+            return self.kruskal_mst()
+        if algorithm == 'boruvka':
+            return boruvka_mst(self, workers)
+        raise ValueError(f"unknown MST algorithm {algorithm!r}; expected 'prim', 'kruskal' or 'boruvka'")
+
+    def minimum_spanning_forest(self, algorithm='kruskal', workers=None):
+        """
+        Minimum spanning forest with component ids and per-component totals,
+        from a single run of the named MST algorithm
+
+        Returns:
+        - A SpanningForest
+        """
+        result = self.minimum_spanning_tree(algorithm, workers)
+        return SpanningForest.from_edges(self.get_vertices(), result.edges)
+
+    @cached_query
+    def dijkstra_shortest_path(self, start_vertex, heap='auto', stats=None):
         """
         Dijkstra's algorithm for Shortest Path
+
+        heap selects the priority queue and stats records heap operations,
+        as for prim_mst.
+
+        Returns:
+        - A ShortestPathResult
         """
-        start_time = time.time()
-        
+        if heap != 'heapq':
+            with phase(stats, 'freeze'):
+                frozen = self.freeze()
+            return frozen.dijkstra_shortest_path(start_vertex, heap, stats=stats)
+
         if start_vertex not in self.vertices:
-            return {}, {}, 0
-        
+            return ShortestPathResult(start_vertex, {}, {})
+
+        if stats is not None:
+            stats.begin('dijkstra', heap, len(self.vertices), self.num_edges)
+            with stats.phase('search'):
+                queue = CountingQueue(stats)
+                result = self._dijkstra_lazy(start_vertex, queue)
+            # Every reached vertex is settled once and scans all of its arcs
+            reached = [u for u, d in result.dist.items() if d != float('inf')]
+            queue.record(1, len(reached), sum(len(self.edges.get(u, ())) for u in reached))
+            return result
+
+        return self._dijkstra_lazy(start_vertex)
+
+    def _dijkstra_lazy(self, start_vertex, queue=heapq):
+        # queue as for _prim_lazy
+        heappush, heappop = queue.heappush, queue.heappop
+
         # Priority queue to store vertices and their distances
-        pq = [(0, start_vertex)]
+        pq = []
+        heappush(pq, (0, start_vertex))
         
         # Dictionary to store distances from start_vertex to each vertex
         dist = {vertex: float('inf') for vertex in self.vertices}
@@ -170,7 +372,7 @@ class Graph:
         
         while pq:
             # Extract vertex with minimum distance
-            current_dist, u = heapq.heappop(pq)
+            current_dist, u = heappop(pq)
             
             # If we've already found a shorter path, skip
             if current_dist > dist[u]:
@@ -182,9 +384,43 @@ class Graph:
                 if dist[u] + weight < dist[v]:
                     dist[v] = dist[u] + weight
                     parent[v] = u
-                    heapq.heappush(pq, (dist[v], v))
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
+                    heappush(pq, (dist[v], v))
         
-        return dist, parent, execution_time
+        return ShortestPathResult(start_vertex, dist, parent)
+
+    @cached_query
+    def shortest_path(self, source, target, bidirectional=False):
+        """
+        Shortest path between two vertices
+
+        Unlike dijkstra_shortest_path this stops as soon as target is
+        settled, and with bidirectional=True it searches from both ends.
+        Returns a PathResult; its path is the list of vertices from source
+        to target, or [] with distance inf if target is unreachable.
+        """
+        if source not in self.vertices or target not in self.vertices:
+            return PathResult([], float('inf'))
+
+        search = bidirectional_dijkstra_path if bidirectional else dijkstra_path
+        path, distance, _ = search(self, source, target)
+        return PathResult(path, distance)
+
+    @cached_query
+    def astar(self, source, target, heuristic='great_circle'):
+        """
+        A* search for the shortest path between two vertices
+
+        heuristic is 'great_circle' (latitude, longitude in degrees) or
+        'euclidean' (planar x, y), which estimate the remaining distance from
+        the 'coordinates' vertex attribute (needed on every vertex) scaled
+        by consistent_scale so they never overestimate it, or any function
+        heuristic(vertex, target) that never overestimates it.
+        Returns a PathResult like shortest_path.
+        """
+        if source not in self.vertices or target not in self.vertices:
+            return PathResult([], float('inf'))
+
+        if isinstance(heuristic, str):
+            heuristic = HEURISTICS[heuristic](self)
+        path, distance, _ = astar_path(self, source, target, heuristic)
+        return PathResult(path, distance)
@@ -0,0 +1,174 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from csr_graph import CSRGraph
+
+# File layout: a fixed 128-byte header followed by the offsets, targets,
+# weights and (optional) labels buffers, each starting on an 8-byte boundary,
+# and optionally the vertex attributes as JSON up to the end of the file
+MAGIC = b'CSRGRAPH'
+VERSION = 1
+HEADER = struct.Struct('<8sII5qcc6x32s')
+HEADER_SIZE = 128
+# Byte offset of the source mtime within the header
+SOURCE_MTIME_OFFSET = struct.calcsize('<8sII4q')
+
+# Length of the source digest field; graph_loader stores a 32-byte blake2b
+DIGEST_SIZE = 32
+
+FLAG_LABELS = 1
+FLAG_BIG_ENDIAN = 2
+FLAG_ATTRIBUTES = 4
+
+def _padding(size):
+    return -size % 8
+
+def write_binary_graph(graph, file_path, source_info=None):
+    """
+    Write a CSRGraph to file_path in the binary graph format
+
+    Parameters:
+    - graph: CSRGraph to write; labels, if any, must be integers, and
+      vertex attributes must be JSON-serializable
+    - file_path: Destination path; the file is replaced atomically
+    - source_info: Optional (size, mtime_ns, digest) of the text file the
+      graph was parsed from, used to validate the file as a cache; digest
+      is DIGEST_SIZE bytes
+
+    Returns:
+    - None
+    """
+    flags = 0 if sys.byteorder == 'little' else FLAG_BIG_ENDIAN
+    buffers = [graph.offsets, graph.targets, graph.weights]
+
+    if graph.labels is not None:
+        try:
+            buffers.append(array('q', graph.labels))
+        except (TypeError, OverflowError):
+            raise ValueError("binary graph format only supports integer vertex labels")
+        flags |= FLAG_LABELS
+
+    attributes = b''
+    if graph.vertex_attributes:
+        attributes = json.dumps({str(v): attrs for v, attrs in graph.vertex_attributes.items()}).encode()
+        flags |= FLAG_ATTRIBUTES
+
+    size, mtime_ns, digest = source_info or (0, 0, bytes(DIGEST_SIZE))
+    if len(digest) != DIGEST_SIZE:
+        raise ValueError(f"source digest must be {DIGEST_SIZE} bytes, got {len(digest)}")
+    header = HEADER.pack(
+        MAGIC, VERSION, flags,
+        graph.num_vertices, len(graph.targets), graph.num_edges, size, mtime_ns,
+        memoryview(graph.targets).format.encode(), memoryview(graph.weights).format.encode(),
+        digest
+    )
+    header += bytes(HEADER_SIZE - len(header))
+
+    # Write next to the destination and rename, so readers never see a partial file
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            for buffer in buffers:
+                data = memoryview(buffer).cast('B')
+                f.write(data)
+                f.write(bytes(_padding(len(data))))
+            f.write(attributes)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_binary_header(file_path):
+    """
+    Read and validate the header of a binary graph file
+
+    Returns:
+    - A dict with the header fields
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    return _unpack_header(raw)
+
+def update_source_mtime(file_path, mtime_ns):
+    """
+    Overwrite the source mtime in the header of a binary graph file in
+    place, for a source that was touched but still has the same content
+    """
+    with open(file_path, 'r+b') as f:
+        f.seek(SOURCE_MTIME_OFFSET)
+        f.write(struct.pack('<q', mtime_ns))
+
+def _unpack_header(raw):
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("truncated binary graph header")
+
+    (magic, version, flags, num_vertices, num_arcs, num_edges, size, mtime_ns,
+     target_code, weight_code, digest) = HEADER.unpack_from(raw)
+
+    if magic != MAGIC:
+        raise ValueError("not a binary graph file")
+    if version != VERSION:
+        raise ValueError(f"unsupported binary graph version {version}")
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise ValueError("binary graph file was written with a different byte order")
+
+    return {
+        'flags': flags,
+        'num_vertices': num_vertices,
+        'num_arcs': num_arcs,
+        'num_edges': num_edges,
+        'target_code': target_code.decode(),
+        'weight_code': weight_code.decode(),
+        'source_size': size,
+        'source_mtime_ns': mtime_ns,
+        # Stored and compared at full length: a digest may end in zero bytes
+        'source_digest': digest,
+    }
+
+def read_binary_graph(file_path, use_mmap=True):
+    """
+    Open a binary graph file as a CSRGraph
+
+    With use_mmap the buffers are zero-copy views of a read-only memory map,
+    so pages are only loaded when touched and are shared between processes
+    that map the same file. Otherwise the buffers are read into arrays.
+    """
+    with open(file_path, 'rb') as f:
+        if use_mmap:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = f.read()
+
+    header = _unpack_header(data[:HEADER_SIZE])
+    n = header['num_vertices']
+    num_arcs = header['num_arcs']
+
+    sections = [('q', n + 1), (header['target_code'], num_arcs), (header['weight_code'], num_arcs)]
+    if header['flags'] & FLAG_LABELS:
+        sections.append(('q', n))
+
+    buffers = []
+    position = HEADER_SIZE
+    for code, count in sections:
+        nbytes = count * array(code).itemsize
+        if position + nbytes > len(data):
+            raise ValueError("truncated binary graph file")
+        chunk = data[position:position + nbytes]
+        buffers.append(chunk.cast(code) if use_mmap else array(code, chunk))
+        position += nbytes + _padding(nbytes)
+
+    labels = buffers[3] if len(buffers) > 3 else None
+    graph = CSRGraph(buffers[0], buffers[1], buffers[2], labels, header['num_edges'])
+
+    if header['flags'] & FLAG_ATTRIBUTES:
+        for vertex, attrs in json.loads(bytes(data[position:])).items():
+            if 'coordinates' in attrs:
+                attrs['coordinates'] = tuple(attrs['coordinates'])
+            graph.vertex_attributes[int(vertex)] = attrs
+
+    return graph
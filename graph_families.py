@@ -0,0 +1,215 @@
+import argparse
+import math
+import random
+
+from csr_graph import CSRGraph
+from graph_writer import write_edges
+
+# Every generator below returns (num_vertices, edges, coordinates): edges is
+# a generator of (u, v, weight) over vertices 0..num_vertices-1, produced in
+# O(V + E) time, and coordinates is a list of (x, y) per vertex or None.
+# Geometric families use integer coordinates in weight units and round edge
+# lengths up, so the 'euclidean' A* heuristic never overestimates.
+
+def _length(a, b):
+    return max(1, math.ceil(math.hypot(a[0] - b[0], a[1] - b[1])))
+
+def grid_graph(rows, cols, spacing=100, jitter=0.3, removal_prob=0.1, diagonal_prob=0.1, detour=0.5, seed=None):
+    """
+    Road-like planar graph: jittered grid points joined to their right and
+    lower neighbors, with some streets removed and some cells crossed by a
+    diagonal
+
+    Weights are the euclidean edge length times a random detour factor in
+    [1, 1 + detour]. Only vertical streets off the first column are ever
+    removed, so the graph stays connected.
+
+    Parameters:
+    - rows, cols: Grid size (rows * cols vertices)
+    - spacing: Distance between neighboring grid points
+    - jitter: Maximum displacement of a point, as a fraction of spacing
+    - removal_prob: Probability that a removable street is left out
+    - diagonal_prob: Probability that a cell gets one diagonal street
+    - detour: Maximum extra length of a street over the straight line
+    - seed: Random seed
+    """
+    rng = random.Random(seed)
+    uniform = rng.random
+    shift = int(jitter * spacing)
+    coordinates = [(c * spacing + rng.randint(-shift, shift), r * spacing + rng.randint(-shift, shift))
+                   for r in range(rows) for c in range(cols)]
+
+    def edges():
+        for r in range(rows):
+            for c in range(cols):
+                u = r * cols + c
+                streets = []
+                if c + 1 < cols:
+                    streets.append((u, u + 1))
+                if r + 1 < rows and (c == 0 or uniform() >= removal_prob):
+                    streets.append((u, u + cols))
+                if r + 1 < rows and c + 1 < cols and uniform() < diagonal_prob:
+                    # One of the two diagonals, so the graph stays planar
+                    streets.append((u, u + cols + 1) if uniform() < 0.5 else (u + 1, u + cols))
+                for a, b in streets:
+                    yield (a, b, math.ceil(_length(coordinates[a], coordinates[b]) * (1 + detour * uniform())))
+
+    return rows * cols, edges(), coordinates
+
+def barabasi_albert_graph(num_vertices, m=3, seed=None, min_weight=1, max_weight=100):
+    """
+    Power-law (Barabási–Albert) graph: starting from a clique of m + 1
+    vertices, every new vertex attaches to m distinct existing vertices
+    chosen with probability proportional to their degree
+
+    Sampling uniformly from a list holding every edge endpoint makes each
+    choice O(1), so the graph takes O(V * m) time. The high-degree hubs give
+    heaps many decrease-keys per settled vertex.
+    """
+    if not 1 <= m < num_vertices:
+        raise ValueError(f"need 1 <= m < num_vertices, got m={m} for {num_vertices} vertices")
+    rng = random.Random(seed)
+    uniform = rng.random
+    span = max_weight - min_weight + 1
+
+    def edges():
+        # Every vertex appears here once per incident edge
+        endpoints = []
+        for v in range(1, m + 1):
+            for u in range(v):
+                endpoints.extend((u, v))
+                yield (u, v, min_weight + int(uniform() * span))
+
+        for v in range(m + 1, num_vertices):
+            targets = set()
+            while len(targets) < m:
+                targets.add(endpoints[int(uniform() * len(endpoints))])
+            for u in targets:
+                endpoints.extend((u, v))
+                yield (u, v, min_weight + int(uniform() * span))
+
+    return num_vertices, edges(), None
+
+def random_geometric_graph(num_vertices, average_degree=8, radius=100, seed=None):
+    """
+    Random geometric graph: uniform random points in a square, joined when
+    they are at most radius apart, with the distance as weight
+
+    The square is sized for the requested average degree. Points are
+    bucketed into cells of side radius, so only the 3x3 block of cells
+    around a point is searched and the graph takes O(V + E) expected time.
+    """
+    rng = random.Random(seed)
+    side = max(1, int(radius * math.sqrt(num_vertices * math.pi / max(average_degree, 1e-9))))
+    coordinates = [(rng.randrange(side), rng.randrange(side)) for _ in range(num_vertices)]
+
+    cells = {}
+    for v, (x, y) in enumerate(coordinates):
+        cells.setdefault((x // radius, y // radius), []).append(v)
+
+    def edges():
+        limit = radius * radius
+        for (cx, cy), members in cells.items():
+            for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                # Each pair of cells is visited from one side only
+                others = members if (dx, dy) == (0, 0) else cells.get((cx + dx, cy + dy), ())
+                for i, u in enumerate(members):
+                    ux, uy = coordinates[u]
+                    for v in (others[i + 1:] if others is members else others):
+                        vx, vy = coordinates[v]
+                        if (ux - vx) ** 2 + (uy - vy) ** 2 <= limit:
+                            yield (u, v, _length(coordinates[u], coordinates[v]))
+
+    return num_vertices, edges(), coordinates
+
+def path_graph(num_vertices, shuffle=True, seed=None, min_weight=1, max_weight=100):
+    """
+    A single long path: as deep as a tree can get, so searches settle one
+    vertex at a time and dynamic trees walk O(V) paths. With shuffle the
+    vertex numbers along the path are a random permutation, which destroys
+    memory locality.
+    """
+    rng = random.Random(seed)
+    order = list(range(num_vertices))
+    if shuffle:
+        rng.shuffle(order)
+    uniform = rng.random
+    span = max_weight - min_weight + 1
+
+    def edges():
+        for u, v in zip(order, order[1:]):
+            yield (u, v, min_weight + int(uniform() * span))
+
+    return num_vertices, edges(), None
+
+def heap_churn_graph(chain_length, num_targets):
+    """
+    Worst case for lazy priority queues: a chain of unit-weight edges whose
+    every vertex also reaches every target vertex, with target edges that
+    get lighter further along the chain
+
+    Chain vertex i is settled at distance i and offers each target the
+    distance K - i (edge weight K - 2i, K = 2 * chain_length + 1), a new
+    best every time. Dijkstra and Prim therefore decrease every target key
+    chain_length times: chain_length * num_targets pushes of which all but
+    num_targets are stale, or as many decrease-keys with an indexed heap.
+    """
+    k = 2 * chain_length + 1
+
+    def edges():
+        for i in range(chain_length):
+            if i + 1 < chain_length:
+                yield (i, i + 1, 1)
+            for t in range(chain_length, chain_length + num_targets):
+                yield (i, t, k - 2 * i)
+
+    return chain_length + num_targets, edges(), None
+
+# Chain length of the 'heap_churn' family: every target gets this many stale entries
+HEAP_CHURN_CHAIN = 16
+
+# Name -> function(num_vertices, seed) returning about that many vertices
+FAMILIES = {
+    'grid': lambda n, seed: grid_graph(max(1, math.isqrt(n)), max(1, math.isqrt(n)), seed=seed),
+    'barabasi_albert': lambda n, seed: barabasi_albert_graph(n, seed=seed),
+    'geometric': lambda n, seed: random_geometric_graph(n, seed=seed),
+    'path': lambda n, seed: path_graph(n, seed=seed),
+    'heap_churn': lambda n, seed: heap_churn_graph(min(HEAP_CHURN_CHAIN, max(1, n // 2)), max(1, n - HEAP_CHURN_CHAIN)),
+}
+
+def build_graph(family, num_vertices, seed=None):
+    """
+    Build a graph of the named family (see FAMILIES) as a CSRGraph, with
+    the 'coordinates' vertex attribute set for geometric families
+    """
+    n, edges, coordinates = FAMILIES[family](num_vertices, seed)
+    graph = CSRGraph.from_edges(n, edges)
+    if coordinates is not None:
+        graph.vertex_attributes = {v: {'coordinates': xy} for v, xy in enumerate(coordinates)}
+    return graph
+
+def write_graph(file_path, family, num_vertices, seed=None):
+    """
+    Stream a graph of the named family to a .gr file (see
+    graph_writer.write_edges)
+
+    Returns:
+    - (num_vertices, num_edges) as written
+    """
+    n, edges, coordinates = FAMILIES[family](num_vertices, seed)
+    return n, write_edges(file_path, n, edges, coordinates)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic benchmark graph as a .gr file")
+    parser.add_argument('family', choices=sorted(FAMILIES))
+    parser.add_argument('--vertices', '-n', type=int, default=10000, help="Approximate number of vertices")
+    parser.add_argument('--seed', type=int, help="Random seed")
+    parser.add_argument('--output', '-o', help="Output .gr file (default: <family>_<vertices>.gr)")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"{args.family}_{args.vertices}.gr"
+    num_vertices, num_edges = write_graph(output, args.family, args.vertices, args.seed)
+    print(f"{args.family}: {num_vertices} vertices and {num_edges} edges saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,377 @@
+import hashlib
+import os
+from array import array
+from itertools import compress
+
+from csr_graph import CSRGraph
 from graph import Graph
+from graph_binary import DIGEST_SIZE, read_binary_graph, read_binary_header, update_source_mtime, write_binary_graph
+from graph_writer import open_graph_file
+from instrumentation import phase
 
-def load_large_graph(file_path):
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; parsing and deduplication fall back to pure Python
+    np = None
+
+# Bytes read per block by the bulk parser
+CHUNK_SIZE = 1 << 24
+
+# Suffix of the binary cache written next to a parsed .gr file
+CACHE_SUFFIX = '.csr'
+
+# Line prefixes of edge lines in the e-dialect (generated graphs) and a-dialect (DIMACS)
+EDGE_TAGS = (b'e ', b'a ')
+
+def _read_blocks(f, chunk_size=CHUNK_SIZE):
     """
-    Load large graph from file
+    Yield the file in large blocks, each ending on a line boundary
+    """
+    tail = b''
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b'\n') + 1
+        tail = block[cut:]
+        if cut:
+            yield block[:cut]
+    if tail:
+        yield tail
+
+def _integer_triples(body, num_lines):
+    """
+    Whether every line of body is three space-separated integers, checked
+    without parsing: only digits, '-' signs, spaces and newlines may occur,
+    and the start of every third field must fall between the right newlines
+    """
+    if body.translate(None, b'0123456789- \n'):
+        return False
+    raw = np.frombuffer(body, dtype=np.uint8)
+    newline = raw == ord('\n')
+    blank = newline | (raw == ord(' '))
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    # A '-' may only start a field and must be followed by a digit
+    minus = np.flatnonzero(raw == ord('-'))
+    if len(minus) and (not starts[minus].all() or minus[-1] + 1 == len(raw)
+                       or not (raw[minus + 1] >= ord('0')).all()):
+        return False
+    fields = np.flatnonzero(starts)
+    newlines = np.flatnonzero(newline)
+    if len(fields) != 3 * num_lines or len(newlines) != num_lines - 1:
+        return False
+    # Fields 3k..3k+2 come before newline k, field 3k+3 after it
+    return bool((fields[2:-1:3] < newlines).all() and (fields[3::3] > newlines).all())
+
+class _EdgeColumns:
+    """
+    Accumulates the numeric columns of edge lines into parallel arrays
+    """
+
+    def __init__(self):
+        self.num_vertices = None
+        self.attributes = {}
+        self.sources = array('q')
+        self.destinations = array('q')
+        self.weights = array('q')
+
+    def add_weights(self, tokens):
+        if self.weights.typecode == 'q':
+            try:
+                self.weights.extend(list(map(int, tokens)))
+                return
+            except ValueError:
+                # Non-integer weight: keep everything as floats from here on
+                self.weights = array('d', self.weights)
+        self.weights.extend(map(float, tokens))
+
+    def add_block(self, block):
+        lines = block.splitlines()
+        edge_lines = [line for line in lines if line[:2] in EDGE_TAGS]
+
+        if len(edge_lines) < len(lines):
+            for line in lines:
+                if line[:2] not in EDGE_TAGS:
+                    self.add_other_line(line)
+
+        if np is not None and self.weights.typecode == 'q' and edge_lines:
+            # Let NumPy parse the numeric part of every edge line in one call,
+            # once the lines are known to hold exactly three integers each
+            body = b'\n'.join([line[2:] for line in edge_lines])
+            if _integer_triples(body, len(edge_lines)):
+                try:
+                    values = np.fromstring(body, dtype=np.int64, sep=' ')
+                except ValueError:  # e.g. a lone '-'
+                    values = ()
+                if len(values) == 3 * len(edge_lines):
+                    self.sources.frombytes(values[0::3].tobytes())
+                    self.destinations.frombytes(values[1::3].tobytes())
+                    self.weights.frombytes(values[2::3].tobytes())
+                    return
+
+        # Fast path: every edge line has exactly four tokens, so the columns
+        # are strided slices of one big token list. Every fourth token being
+        # a tag rules out a short line balanced by a long one.
+        tokens = b' '.join(edge_lines).split()
+        tags = tokens[0::4]
+        if len(tokens) == 4 * len(edge_lines) and tags.count(b'e') + tags.count(b'a') == len(edge_lines):
+            self.sources.extend(map(int, tokens[1::4]))
+            self.destinations.extend(map(int, tokens[2::4]))
+            self.add_weights(tokens[3::4])
+            return
+
+        for line in edge_lines:
+            self.add_edge_line(line.split())
+
+    def add_edge_line(self, parts):
+        if len(parts) >= 4:
+            self.sources.append(int(parts[1]))
+            self.destinations.append(int(parts[2]))
+            self.add_weights(parts[3:4])
+
+    def add_other_line(self, line):
+        parts = line.split()
+        if not parts:
+            return
+        tag = parts[0]
+        if tag in (b'e', b'a'):
+            self.add_edge_line(parts)
+        elif tag == b'c':
+            self.add_comment(parts)
+        elif tag == b'v' and len(parts) >= 4:
+            # DIMACS coordinate line: v vertex x y
+            self.attributes.setdefault(int(parts[1]), {})['coordinates'] = (float(parts[2]), float(parts[3]))
+        elif tag == b'p' and len(parts) >= 4:
+            # DIMACS problem line: p sp num_vertices num_edges
+            self.num_vertices = int(parts[2])
+        elif tag.isdigit() and self.num_vertices is None and not self.sources:
+            # Bare header line: num_vertices num_edges
+            self.num_vertices = int(tag)
+
+    def add_comment(self, parts):
+        # Vertex comments look like "c 0: London" or "c 0: London 51.5074 -0.1278"
+        if len(parts) < 3 or not parts[1].endswith(b':') or not parts[1][:-1].isdigit():
+            return
+        vertex = int(parts[1][:-1])
+        words = parts[2:]
+        attributes = self.attributes.setdefault(vertex, {})
+
+        if len(words) >= 3:
+            try:
+                attributes['coordinates'] = (float(words[-2]), float(words[-1]))
+                words = words[:-2]
+            except ValueError:
+                pass
+
+        name = b' '.join(words)
+        try:
+            attributes['name'] = name.decode('utf-8')
+        except UnicodeDecodeError:
+            attributes['name'] = name.decode('latin-1')
+
+def parse_graph_file(file_path, chunk_size=CHUNK_SIZE, digest=None):
+    """
+    Parse a graph file in any of the supported .gr dialects
     Format:
-    num_vertices num_edges
+    num_vertices num_edges            (optional header, e-dialect)
+    p sp num_vertices num_edges       (optional header, a-dialect)
+    c comment
+    c vertex: name [latitude longitude]
+    v vertex x y
     e source_vertex destination_vertex weight
+    a source_vertex destination_vertex weight
+
+    The file is read in binary blocks of chunk_size bytes and the numeric
+    columns of each block are converted in bulk. If digest is a hashlib
+    object it is updated with the file contents along the way.
+
+    Returns:
+    - (num_vertices, sources, destinations, weights, attributes) where
+      num_vertices is the header vertex count (None without a header),
+      the next three are parallel arrays with one entry per edge line, and
+      attributes maps vertices to the names and coordinates found in
+      vertex comments and v lines
     """
-    graph = Graph()
+    columns = _EdgeColumns()
+
+    with open_graph_file(file_path) as f:
+        for block in _read_blocks(f, chunk_size):
+            if digest is not None:
+                digest.update(block)
+            columns.add_block(block)
+
+    return columns.num_vertices, columns.sources, columns.destinations, columns.weights, columns.attributes
+
+def _dedupe_edges(sources, destinations, weights):
+    """
+    Drop repeated undirected edges, keeping the last weight like Graph.add_edge does
+    """
+    num_edges = len(sources)
+
+    if np is not None and num_edges:
+        src = np.asarray(sources)
+        dst = np.asarray(destinations)
+        low, high = np.minimum(src, dst), np.maximum(src, dst)
+        bound = int(high.max()) + 1
+        if bound * bound <= 1 << 63:
+            # One int64 key per edge, much faster to unique than rows
+            _, last = np.unique((low * bound + high)[::-1], return_index=True)
+        else:
+            # Vertex ids too large for the key to fit in int64
+            _, last = np.unique(np.stack((low, high), axis=1)[::-1], return_index=True, axis=0)
+        if len(last) == num_edges:
+            return sources, destinations, weights
+        keep = np.sort(num_edges - 1 - last)
+        columns = []
+        for column in (sources, destinations, weights):
+            kept = array(column.typecode)
+            kept.frombytes(np.asarray(column)[keep].tobytes())
+            columns.append(kept)
+        return tuple(columns)
+
+    last = dict(zip(zip(map(min, sources, destinations), map(max, sources, destinations)), range(num_edges)))
+    if len(last) == num_edges:
+        return sources, destinations, weights
+    keep = sorted(last.values())
+    return tuple(array(column.typecode, map(column.__getitem__, keep)) for column in (sources, destinations, weights))
+
+def _file_digest(file_path):
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open_graph_file(file_path) as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.digest()
+
+def _open_cache(file_path, cache_path):
+    """
+    Return the cached CSRGraph for file_path, or None if the cache is missing or stale
+    """
+    try:
+        header = read_binary_header(cache_path)
+    except (OSError, ValueError):
+        return None
 
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
+    stat = os.stat(file_path)
+    if header['source_size'] != stat.st_size:
+        return None
+    # Same size but a different mtime (touched or copied): fall back to the content hash
+    if header['source_mtime_ns'] != stat.st_mtime_ns:
+        if header['source_digest'] != _file_digest(file_path):
+            return None
+        # Record the new mtime, so later loads skip hashing the file again
+        try:
+            update_source_mtime(cache_path, stat.st_mtime_ns)
+        except OSError:
+            pass
 
-        # First line contains number of vertices and edges
-        header = lines[0].strip().split()
-        num_vertices = int(header[0])
+    try:
+        return read_binary_graph(cache_path)
+    except (OSError, ValueError):
+        return None
 
-        # Add vertices
+def load_graph(file_path, cache=True, stats=None):
+    """
+    Load any .gr file directly into an array-backed CSRGraph
+
+    The vertices are 0..n-1, where n covers both the header vertex count and
+    the largest vertex id that appears in an edge. An edge listed more than
+    once (in either direction) is kept once with its last weight.
+
+    With cache, the parsed graph is also written to file_path + CACHE_SUFFIX
+    in the binary graph format. Later loads memory-map that file instead of
+    parsing, as long as the .gr file keeps its size and either its mtime or
+    its content hash (a match by hash records the new mtime in the cache).
+
+    An AlgorithmStats passed as stats receives the time spent on the cache
+    lookup, parsing, deduplication, building and writing the cache.
+    """
+    cache_path = file_path + CACHE_SUFFIX
+    if cache:
+        with phase(stats, 'read cache'):
+            graph = _open_cache(file_path, cache_path)
+        if graph is not None:
+            if stats is not None:
+                stats.begin('load', None, graph.num_vertices, graph.num_edges)
+            return graph
+
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with phase(stats, 'parse'):
+        num_vertices, sources, destinations, weights, attributes = parse_graph_file(file_path, digest=digest)
+    with phase(stats, 'dedupe'):
+        sources, destinations, weights = _dedupe_edges(sources, destinations, weights)
+
+    num_edges = len(sources)
+    if num_edges:
+        num_vertices = max(num_vertices or 0, max(sources) + 1, max(destinations) + 1)
+    num_vertices = num_vertices or 0
+
+    with phase(stats, 'build'):
+        # Each edge becomes two arcs, except self-loops which are stored once
+        reverse = sources, destinations, weights
+        if any(map(int.__eq__, sources, destinations)):
+            not_loop = list(map(int.__ne__, sources, destinations))
+            reverse = [array(column.typecode, compress(column, not_loop)) for column in reverse]
+        reverse_sources, reverse_destinations, reverse_weights = reverse
+        arc_sources = sources + reverse_destinations
+        arc_targets = destinations + reverse_sources
+        arc_weights = weights + reverse_weights
+
+        graph = CSRGraph.from_arcs(num_vertices, arc_sources, arc_targets, arc_weights, num_edges=num_edges)
+        graph.vertex_attributes = attributes
+
+    if cache:
+        try:
+            with phase(stats, 'write cache'):
+                write_binary_graph(graph, cache_path, (stat.st_size, stat.st_mtime_ns, digest.digest()))
+        except OSError:
+            # The cache is an optimisation only, e.g. the directory may be read-only
+            pass
+
+    if stats is not None:
+        stats.begin('load', None, num_vertices, num_edges)
+    return graph
+
+def _load_mutable_graph(file_path, add_header_vertices):
+    """
+    Load a .gr file into a Graph, optionally adding every header vertex
+    """
+    num_vertices, sources, destinations, weights, attributes = parse_graph_file(file_path)
+
+    graph = Graph()
+    graph.vertex_attributes = attributes
+
+    if add_header_vertices and num_vertices:
         for i in range(num_vertices):
             graph.add_vertex(i)
 
-        # Add edges
-        for i in range(1, len(lines)):
-            line = lines[i].strip()
-            if line.startswith('e '):
-                parts = line.split()
-                if len(parts) >= 4:
-                    source = int(parts[1])
-                    dest = int(parts[2])
-                    weight = int(parts[3])
-                    graph.add_edge(source, dest, weight)
+    for source, dest, weight in zip(sources, destinations, weights):
+        graph.add_edge(source, dest, weight)
 
     return graph
 
+def load_large_graph(file_path):
+    """
+    Load large graph from file
+    Format:
+    num_vertices num_edges
+    e source_vertex destination_vertex weight
+    """
+    return _load_mutable_graph(file_path, add_header_vertices=True)
+
 def load_cities_graph(file_path):
     """
     Load cities graph from file
     Format:
+    c vertex: city_name latitude longitude
     a source_vertex destination_vertex weight
-    """
-    graph = Graph()
 
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('a '):
-                parts = line.split()
-                if len(parts) >= 4:
-                    source = int(parts[1])
-                    dest = int(parts[2])
-                    weight = int(parts[3])
-                    graph.add_edge(source, dest, weight)
-
-    return graph
+    City names and coordinates become the 'name' and 'coordinates' vertex
+    attributes, which the A* heuristics use.
+    """
+    return _load_mutable_graph(file_path, add_header_vertices=False)
 
 def load_cyclic_graph(file_path):
     """
@@ -60,20 +379,7 @@ def load_cyclic_graph(file_path):
     Format:
     a source_vertex destination_vertex weight
     """
-    graph = Graph()
-
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('a '):
-                parts = line.split()
-                if len(parts) >= 4:
-                    source = int(parts[1])
-                    dest = int(parts[2])
-                    weight = int(parts[3])
-                    graph.add_edge(source, dest, weight)
-
-    return graph
+    return _load_mutable_graph(file_path, add_header_vertices=False)
 
 def load_random_graph(file_path):
     """
@@ -82,31 +388,7 @@ def load_random_graph(file_path):
     num_vertices num_edges
     e source_vertex destination_vertex weight
     """
-    graph = Graph()
-
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-
-        # First line contains number of vertices and edges
-        header = lines[0].strip().split()
-        num_vertices = int(header[0])
-
-        # Add vertices
-        for i in range(num_vertices):
-            graph.add_vertex(i)
-
-        # Add edges
-        for i in range(1, len(lines)):
-            line = lines[i].strip()
-            if line.startswith('e '):
-                parts = line.split()
-                if len(parts) >= 4:
-                    source = int(parts[1])
-                    dest = int(parts[2])
-                    weight = int(parts[3])
-                    graph.add_edge(source, dest, weight)
-
-    return graph
+    return _load_mutable_graph(file_path, add_header_vertices=True)
 
 def load_standard_graph():
     """
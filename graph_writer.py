@@ -0,0 +1,186 @@
+import gzip
+import struct
+from itertools import chain, islice
+
+from csr_graph import CSRGraph
+from graph_binary import write_binary_graph
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip comes with the standard library
+    zstandard = None
+
+# Edges formatted per write call
+WRITE_BATCH = 1 << 16
+
+# Width the edge count is padded to in a header written before the count is known
+HEADER_COUNT_WIDTH = 20
+
+# File suffix -> compression picked by compression='auto'
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+
+# Fast levels: at these a dump is limited by formatting and I/O, not by the compressor
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+EDGE_LINE = "e %s %s %s\n"
+VERTEX_LINE = "v %s %s %s\n"
+
+# zstd frame with a single raw block (RFC 8878): magic number, a frame
+# header holding only a 4-byte content size (single segment), and a 3-byte
+# block header
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_RAW_FRAME = struct.Struct('<IBI')
+
+def compression_of(file_path, compression='auto'):
+    """
+    Resolve compression='auto' from the file suffix
+
+    Returns:
+    - 'gzip', 'zstd' or None
+    """
+    if compression == 'auto':
+        compression = next((name for suffix, name in COMPRESSION_SUFFIXES.items()
+                            if str(file_path).endswith(suffix)), None)
+    if compression not in (None, 'gzip', 'zstd'):
+        raise ValueError(f"unknown compression {compression!r}, expected 'gzip', 'zstd', 'auto' or None")
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    return compression
+
+def open_graph_file(file_path, compression='auto'):
+    """
+    Open a .gr file for reading in binary mode, decompressing .gz and .zst
+    files (or as given by compression) on the fly
+    """
+    compression = compression_of(file_path, compression)
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'zstd':
+        # A file written by write_edges holds the header and the edges as separate frames
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True, closefd=True)
+    return open(file_path, 'rb')
+
+def _stored(data, compression):
+    # data as a self-contained compressed member whose size only depends on
+    # len(data), so it can be overwritten in place once the edge count is known
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=0, mtime=0)
+    if compression == 'zstd':
+        block_header = 1 | len(data) << 3  # last block, raw
+        frame = ZSTD_RAW_FRAME.pack(ZSTD_MAGIC, 0b10100000, len(data))
+        return frame + block_header.to_bytes(3, 'little') + data
+    return data
+
+def _compressing_writer(raw, compression):
+    # Writer appending compressed data to raw; closing it leaves raw open
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return None
+
+def _header(num_vertices, num_edges, padded):
+    if padded:
+        return f"{num_vertices} {'' if num_edges is None else num_edges:<{HEADER_COUNT_WIDTH}}\n".encode()
+    return f"{num_vertices} {num_edges}\n".encode()
+
+def _batches(items, size=WRITE_BATCH):
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+def _format(line, batch):
+    # One % over the whole batch is much cheaper than formatting line by line
+    return (line * len(batch) % tuple(chain.from_iterable(batch))).encode()
+
+def write_edges(file_path, num_vertices, edges, coordinates=None, num_edges=None, compression='auto', binary=False):
+    """
+    Stream edges to a .gr file, formatting them in batches of WRITE_BATCH
+    lines per write and without holding them in memory
+
+    Without num_edges the count is only known at the end, so the header is
+    written padded (as its own fixed-size gzip member or zstd frame when
+    compressed) and filled in afterwards. Readers of concatenated gzip
+    members and zstd frames, including graph_loader, see one stream.
+
+    The binary graph format groups arcs by vertex, so with binary the edges
+    are first collected into a CSRGraph and memory is O(V + E).
+
+    Parameters:
+    - file_path: Output file
+    - num_vertices: Number of vertices (0..num_vertices-1)
+    - edges: Iterable of (u, v, weight)
+    - coordinates: Optional (x, y) of every vertex, written as
+      "v vertex x y" lines that load as the 'coordinates' attribute
+    - num_edges: Number of edges, if known in advance
+    - compression: 'gzip', 'zstd', None, or 'auto' to pick by the .gz or
+      .zst suffix of file_path
+    - binary: Write the binary graph format of graph_binary instead of text
+
+    Returns:
+    - The number of edges written
+    """
+    if binary:
+        if compression_of(file_path, compression) is not None:
+            raise ValueError("binary graph files are memory-mapped and cannot be compressed")
+        graph = CSRGraph.from_edges(num_vertices, edges)
+        if coordinates is not None:
+            graph.vertex_attributes = {v: {'coordinates': xy} for v, xy in enumerate(coordinates)}
+        write_binary_graph(graph, file_path)
+        return graph.num_edges
+
+    compression = compression_of(file_path, compression)
+    padded = num_edges is None
+    count = 0
+    with open(file_path, 'wb') as raw:
+        raw.write(_stored(_header(num_vertices, num_edges, padded), compression))
+        out = _compressing_writer(raw, compression) or raw
+
+        if coordinates is not None:
+            for start in range(0, len(coordinates), WRITE_BATCH):
+                batch = coordinates[start:start + WRITE_BATCH]
+                out.write(_format(VERTEX_LINE, [(v, x, y) for v, (x, y) in enumerate(batch, start)]))
+
+        for batch in _batches(edges):
+            out.write(_format(EDGE_LINE, batch))
+            count += len(batch)
+
+        if out is not raw:
+            out.close()
+        if padded:
+            raw.seek(0)
+            raw.write(_stored(_header(num_vertices, count, padded), compression))
+    return count
+
+def save_graph_to_file(graph, file_path, compression='auto', binary=False):
+    """
+    Save a graph to a file in the format:
+    num_vertices num_edges
+    e source_vertex destination_vertex weight
+
+    Edges are streamed from the graph to write_edges in large formatted
+    batches, so the file is written in constant extra memory (except with
+    binary, which writes the CSRGraph snapshot of a Graph).
+
+    Parameters:
+    - graph: Graph or CSRGraph
+    - file_path: Output file
+    - compression: 'gzip', 'zstd', None, or 'auto' to pick by suffix
+    - binary: Write the binary graph format instead of text
+
+    Returns:
+    - The number of edges written
+    """
+    if binary:
+        if compression_of(file_path, compression) is not None:
+            raise ValueError("binary graph files are memory-mapped and cannot be compressed")
+        csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+        write_binary_graph(csr, file_path)
+        return csr.num_edges
+
+    num_vertices = graph.num_vertices if isinstance(graph, CSRGraph) else len(graph.vertices)
+    return write_edges(file_path, num_vertices, graph.iter_edges(), num_edges=graph.num_edges, compression=compression)
@@ -0,0 +1,322 @@
+# Indexed priority queues over the integer items 0..capacity-1.
+#
+# Unlike heapq with lazy deletion, every item is in the queue at most once
+# and its key can be lowered in place, so the queue never holds more than
+# capacity entries. All queues share the same interface:
+#   push(item, key), decrease_key(item, key), update(item, key)
+#   (push or decrease), pop() -> (item, key), len(queue), item in queue
+
+class IndexedDaryHeap:
+    """
+    d-ary min-heap stored in flat lists, with a position index per item
+    """
+
+    def __init__(self, capacity, arity=2):
+        self.arity = arity
+        self.items = []
+        self.keys = []
+        self.pos = [-1] * capacity
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return self.pos[item] >= 0
+
+    def _sift_up(self, i, item, key):
+        items, keys, pos, arity = self.items, self.keys, self.pos, self.arity
+        while i > 0:
+            parent = (i - 1) // arity
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            parent_item = items[parent]
+            items[i] = parent_item
+            keys[i] = parent_key
+            pos[parent_item] = i
+            i = parent
+        items[i] = item
+        keys[i] = key
+        pos[item] = i
+
+    def _sift_down(self, i, item, key):
+        items, keys, pos, arity = self.items, self.keys, self.pos, self.arity
+        n = len(items)
+        while True:
+            first = arity * i + 1
+            if first >= n:
+                break
+            best = first
+            best_key = keys[first]
+            for child in range(first + 1, min(first + arity, n)):
+                if keys[child] < best_key:
+                    best = child
+                    best_key = keys[child]
+            if best_key >= key:
+                break
+            best_item = items[best]
+            items[i] = best_item
+            keys[i] = best_key
+            pos[best_item] = i
+            i = best
+        items[i] = item
+        keys[i] = key
+        pos[item] = i
+
+    def push(self, item, key):
+        self.items.append(item)
+        self.keys.append(key)
+        self._sift_up(len(self.items) - 1, item, key)
+
+    def decrease_key(self, item, key):
+        i = self.pos[item]
+        if key < self.keys[i]:
+            self._sift_up(i, item, key)
+
+    def update(self, item, key):
+        if self.pos[item] < 0:
+            self.push(item, key)
+        else:
+            self.decrease_key(item, key)
+
+    def pop(self):
+        items, keys = self.items, self.keys
+        top_item = items[0]
+        top_key = keys[0]
+        self.pos[top_item] = -1
+
+        last_item = items.pop()
+        last_key = keys.pop()
+        if items:
+            self._sift_down(0, last_item, last_key)
+
+        return top_item, top_key
+
+class IndexedBinaryHeap(IndexedDaryHeap):
+    def __init__(self, capacity):
+        super().__init__(capacity, 2)
+
+class PairingHeap:
+    """
+    Pairing heap whose nodes are the items themselves, linked through flat
+    child/sibling/prev lists (prev is the parent for a leftmost child and
+    the left sibling otherwise)
+    """
+
+    def __init__(self, capacity):
+        self.key = [0] * capacity
+        self.child = [-1] * capacity
+        self.sibling = [-1] * capacity
+        self.prev = [-1] * capacity
+        self.in_heap = bytearray(capacity)
+        self.root = -1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item):
+        return self.in_heap[item] == 1
+
+    def _meld(self, a, b):
+        # Link two roots; the one with the larger key becomes the leftmost child
+        key, child, sibling, prev = self.key, self.child, self.sibling, self.prev
+        if key[b] < key[a]:
+            a, b = b, a
+        first = child[a]
+        sibling[b] = first
+        if first >= 0:
+            prev[first] = b
+        prev[b] = a
+        child[a] = b
+        return a
+
+    def push(self, item, key):
+        self.key[item] = key
+        self.child[item] = self.sibling[item] = self.prev[item] = -1
+        self.in_heap[item] = 1
+        self.size += 1
+        self.root = item if self.root < 0 else self._meld(self.root, item)
+
+    def decrease_key(self, item, key):
+        if key >= self.key[item]:
+            return
+        self.key[item] = key
+        if item == self.root:
+            return
+
+        # Cut the subtree rooted at item and meld it with the root
+        sibling, prev = self.sibling, self.prev
+        p = prev[item]
+        s = sibling[item]
+        if self.child[p] == item:
+            self.child[p] = s
+        else:
+            sibling[p] = s
+        if s >= 0:
+            prev[s] = p
+        sibling[item] = prev[item] = -1
+        self.root = self._meld(self.root, item)
+
+    def update(self, item, key):
+        if self.in_heap[item]:
+            self.decrease_key(item, key)
+        else:
+            self.push(item, key)
+
+    def pop(self):
+        sibling, prev = self.sibling, self.prev
+        top = self.root
+        self.in_heap[top] = 0
+        self.size -= 1
+
+        # Two-pass pairing: meld children left to right in pairs, then fold
+        # the pairs together from right to left
+        pairs = []
+        c = self.child[top]
+        while c >= 0:
+            b = sibling[c]
+            if b < 0:
+                sibling[c] = prev[c] = -1
+                pairs.append(c)
+                break
+            next_c = sibling[b]
+            sibling[c] = prev[c] = sibling[b] = prev[b] = -1
+            pairs.append(self._meld(c, b))
+            c = next_c
+
+        root = -1
+        for tree in reversed(pairs):
+            root = tree if root < 0 else self._meld(tree, root)
+        if root >= 0:
+            prev[root] = -1
+        self.root = root
+        self.child[top] = -1
+
+        return top, self.key[top]
+
+class RadixHeap:
+    """
+    Radix heap for non-negative integer keys that never drop below the last
+    key popped (true of Dijkstra's algorithm, not of Prim's).
+
+    Bucket b holds the entries whose highest bit differing from the last
+    popped key is bit b - 1, so each entry moves to a lower bucket at most
+    64 times. Decreasing a key files a new entry and leaves the old one to be
+    skipped as stale.
+    """
+
+    def __init__(self, capacity):
+        self.key = [None] * capacity
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item):
+        return self.key[item] is not None
+
+    def push(self, item, key):
+        if key < self.last:
+            raise ValueError("radix heap keys must not drop below the last key popped")
+        self.key[item] = key
+        self.size += 1
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+
+    def decrease_key(self, item, key):
+        if key < self.key[item]:
+            if key < self.last:
+                raise ValueError("radix heap keys must not drop below the last key popped")
+            self.key[item] = key
+            self.buckets[(key ^ self.last).bit_length()].append((key, item))
+
+    def update(self, item, key):
+        if self.key[item] is None:
+            self.push(item, key)
+        else:
+            self.decrease_key(item, key)
+
+    def pop(self):
+        buckets, keys = self.buckets, self.key
+        while True:
+            first = buckets[0]
+            while first:
+                key, item = first.pop()
+                if keys[item] == key:
+                    keys[item] = None
+                    self.size -= 1
+                    return item, key
+
+            # Redistribute the lowest non-empty bucket around its minimum
+            i = 1
+            while not buckets[i]:
+                i += 1
+            live = [(key, item) for key, item in buckets[i] if keys[item] == key]
+            buckets[i] = []
+            if live:
+                last = self.last = min(live)[0]
+                for key, item in live:
+                    buckets[(key ^ last).bit_length()].append((key, item))
+
+# Largest integer weight for which 'auto' picks Dial's bucket queue; Dial
+# keeps max_weight + 1 buckets and may step through that many empty ones
+DIAL_MAX_WEIGHT = 1 << 12
+
+HEAPS = {
+    'binary': IndexedBinaryHeap,
+    'dary': lambda capacity: IndexedDaryHeap(capacity, 4),
+    'pairing': PairingHeap,
+    'radix': RadixHeap,
+}
+
+def make_heap(kind, capacity):
+    """
+    Create an indexed priority queue by name: 'binary', 'dary' (4-ary),
+    'pairing' or 'radix'
+    """
+    try:
+        factory = HEAPS[kind]
+    except KeyError:
+        raise ValueError(f"unknown heap {kind!r}; expected 'auto', 'heapq', 'dial' or one of {sorted(HEAPS)}")
+    return factory(capacity)
+
+def compare_heaps(graph, kinds=('heapq', 'binary', 'dary', 'pairing'), source=None, min_time=0.2):
+    """
+    Time prim_mst and dijkstra_shortest_path with each heap on one graph
+
+    A Graph is frozen once up front, so every heap runs the same CSRGraph
+    code on the same arrays and none of them pays for the snapshot. Each
+    call is repeated for at least min_time seconds (see benchmark.measure)
+    and the median is reported.
+
+    Parameters:
+    - graph: Graph or CSRGraph
+    - kinds: Heap names to compare; add 'dial' (and 'radix', Dijkstra
+      only) for graphs with non-negative integer weights
+    - source: Dijkstra start vertex (default: the first vertex)
+    - min_time: Seconds of timed calls per heap and algorithm
+
+    Returns:
+    - A dict mapping each heap name to (prim seconds, dijkstra seconds);
+      prim seconds is None for 'radix'
+    """
+    # benchmark imports csr_graph, which imports this module
+    from benchmark import measure
+
+    if source is None:
+        source = graph.get_vertices()[0]
+    if hasattr(graph, 'freeze'):
+        graph = graph.freeze()
+
+    results = {}
+    for kind in kinds:
+        prim_time = None
+        if kind != 'radix':
+            prim_time = measure(lambda: graph.prim_mst(heap=kind), min_time=min_time).median / 1e9
+
+        dijkstra_time = measure(lambda: graph.dijkstra_shortest_path(source, heap=kind), min_time=min_time).median / 1e9
+        results[kind] = (prim_time, dijkstra_time)
+
+    return results
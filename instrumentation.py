@@ -0,0 +1,255 @@
+import heapq
+import time
+from contextlib import contextmanager, nullcontext
+
+from disjoint_set import DisjointSet
+
+# Operation counters of an AlgorithmStats, all starting at zero
+COUNTERS = (
+    'heap_pushes',       # Entries pushed (a decrease-key counts separately)
+    'heap_pops',         # Entries popped, stale ones included
+    'stale_skips',       # Popped entries discarded as outdated
+    'decrease_keys',     # Decrease-key calls on an indexed heap
+    'edges_scanned',     # Arcs looked at from settled vertices
+    'relaxations',       # Arcs that improved a key or distance
+    'vertices_settled',  # Vertices taken into the tree
+    'union_calls',       # DisjointSet.union calls (edges tried by Kruskal)
+    'unions',            # Unions that merged two sets
+    'find_steps',        # Parent pointers followed by finds and unions
+)
+
+_NO_PHASE = nullcontext()
+
+class AlgorithmStats:
+    """
+    Operation counts and phase timings of one instrumented algorithm call.
+
+    Pass an instance as stats= to prim_mst, kruskal_mst or
+    dijkstra_shortest_path (of Graph or CSRGraph), or to
+    graph_loader.load_graph, and it is filled in as the call runs. The
+    search loops are the same either way: with stats they are handed
+    counting versions of their queue (CountingHeap, CountingQueue) or
+    union-find (CountingDisjointSet), so instrumentation costs nothing
+    unless asked for. An instance may be reused: counts and phase times
+    accumulate across calls.
+    """
+
+    def __init__(self):
+        self.algorithm = None
+        self.heap = None
+        self.num_vertices = 0
+        self.num_edges = 0
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        # Phase name -> seconds, in the order the phases first ran
+        self.phases = {}
+
+    def begin(self, algorithm, heap, num_vertices, num_edges):
+        """
+        Record what is about to run and on how large a graph
+        """
+        self.algorithm = algorithm
+        self.heap = heap
+        self.num_vertices = num_vertices
+        self.num_edges = num_edges
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager adding the time spent inside it to phases[name]
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total_time(self):
+        return sum(self.phases.values())
+
+    @property
+    def density(self):
+        """
+        Edges as a fraction of the V(V-1)/2 possible ones
+        """
+        n = self.num_vertices
+        return 2 * self.num_edges / (n * (n - 1)) if n > 1 else 0.0
+
+    @property
+    def pops_per_vertex(self):
+        """
+        Heap pops per settled vertex; 1.0 means no churn from stale entries
+        """
+        return self.heap_pops / self.vertices_settled if self.vertices_settled else 0.0
+
+    def to_dict(self):
+        stats = {
+            'algorithm': self.algorithm,
+            'heap': self.heap,
+            'num_vertices': self.num_vertices,
+            'num_edges': self.num_edges,
+            'density': self.density,
+        }
+        for name in COUNTERS:
+            stats[name] = getattr(self, name)
+        stats['pops_per_vertex'] = self.pops_per_vertex
+        stats['phases'] = dict(self.phases)
+        stats['total_time'] = self.total_time
+        return stats
+
+    def summary(self):
+        """
+        Multi-line, human-readable report of the non-zero counters and the phases
+        """
+        heap = f" ({self.heap})" if self.heap else ""
+        lines = [f"{self.algorithm}{heap} on {self.num_vertices} vertices, "
+                 f"{self.num_edges} edges (density {self.density:.2e})"]
+        for name in COUNTERS:
+            value = getattr(self, name)
+            if value:
+                lines.append(f"  {name:<18} {value:>12}")
+        if self.heap_pops:
+            lines.append(f"  {'pops_per_vertex':<18} {self.pops_per_vertex:>12.2f}")
+        for name, seconds in self.phases.items():
+            lines.append(f"  phase {name:<12} {seconds * 1000:>12.3f} ms")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"AlgorithmStats({self.algorithm!r}, heap={self.heap!r}, pops={self.heap_pops}, unions={self.unions})"
+
+def phase(stats, name):
+    """
+    stats.phase(name), or a shared no-op context manager when stats is None
+    """
+    if stats is None:
+        return _NO_PHASE
+    return stats.phase(name)
+
+class CountingHeap:
+    """
+    Wrapper around an indexed heap from heaps.py that counts its operations
+    into an AlgorithmStats; every update call follows a relaxation
+    """
+
+    def __init__(self, pq, stats):
+        self.pq = pq
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.pq)
+
+    def __contains__(self, item):
+        return item in self.pq
+
+    def push(self, item, key):
+        self.stats.heap_pushes += 1
+        self.pq.push(item, key)
+
+    def decrease_key(self, item, key):
+        self.stats.decrease_keys += 1
+        self.pq.decrease_key(item, key)
+
+    def update(self, item, key):
+        stats = self.stats
+        stats.relaxations += 1
+        if item in self.pq:
+            stats.decrease_keys += 1
+        else:
+            stats.heap_pushes += 1
+        self.pq.update(item, key)
+
+    def pop(self):
+        self.stats.heap_pops += 1
+        self.stats.vertices_settled += 1
+        return self.pq.pop()
+
+class CountingDisjointSet(DisjointSet):
+    """
+    DisjointSet that counts union calls, merges and followed parent pointers
+    into an AlgorithmStats
+    """
+
+    def __init__(self, n, stats):
+        super().__init__(n)
+        self.stats = stats
+
+    def find(self, x):
+        parent = self.parent
+        steps = 0
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+            steps += 1
+        self.stats.find_steps += steps
+        return x
+
+    def union(self, a, b):
+        stats = self.stats
+        stats.union_calls += 1
+        merged = super().union(self.find(a), self.find(b))
+        if merged:
+            stats.unions += 1
+        return merged
+
+class CountingQueue:
+    """
+    Counts the entries pushed to and popped from the lazy queues of the
+    heapq and Dial loops, which push a vertex again on every relaxation and
+    skip the stale entries when they come out
+
+    heappush and heappop stand in for the heapq functions and bucket()
+    makes a Dial bucket; record() adds the counts to an AlgorithmStats
+    once the search is over.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.pushes = 0
+        self.pops = 0
+
+    def heappush(self, pq, entry):
+        self.pushes += 1
+        heapq.heappush(pq, entry)
+
+    def heappop(self, pq):
+        self.pops += 1
+        return heapq.heappop(pq)
+
+    def bucket(self):
+        return CountingBucket(self)
+
+    def record(self, roots, settled, scanned):
+        """
+        Add the counts to stats, deriving the rest: every push other than
+        those of the roots followed a relaxation, and every pop that did not
+        settle a vertex skipped a stale entry
+
+        Parameters:
+        - roots: Number of search roots pushed (trees grown)
+        - settled: Number of vertices settled
+        - scanned: Number of arcs looked at from the settled vertices
+        """
+        stats = self.stats
+        stats.heap_pushes += self.pushes
+        stats.heap_pops += self.pops
+        stats.relaxations += self.pushes - roots
+        stats.stale_skips += self.pops - settled
+        stats.vertices_settled += settled
+        stats.edges_scanned += scanned
+
+class CountingBucket(list):
+    """
+    Dial bucket counting its appends and pops into a CountingQueue
+    """
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+
+    def append(self, item):
+        self.queue.pushes += 1
+        super().append(item)
+
+    def pop(self):
+        self.queue.pops += 1
+        return super().pop()
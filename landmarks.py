@@ -0,0 +1,223 @@
+import random
+import struct
+import time
+from array import array
+from operator import sub
+
+from path_search import astar_path, dijkstra_path
+from results import PathResult
+from shortest_paths import as_csr, dijkstra_distances
+
+# Distance stored for vertices a landmark cannot reach. It is finite so that
+# differences stay well defined: two unreachable entries cancel out, and an
+# unreachable/reachable pair gives a huge bound, which is correct because the
+# two vertices are then in different components.
+UNREACHABLE = 1e300
+
+MAGIC = b'ALTINDEX'
+VERSION = 1
+HEADER = struct.Struct('<8sIqqqd')
+
+class LandmarkIndex:
+    """
+    ALT (A*, landmarks, triangle inequality) preprocessing for repeated
+    shortest-path queries on a static graph.
+
+    For every landmark L the exact distance d(L, v) to every vertex is
+    stored; |d(L, t) - d(L, v)| is then a lower bound on d(v, t), and the
+    largest such bound over all landmarks guides an A* search. Distances
+    are kept vertex-major in one float64 array, so the k values a query
+    needs for a vertex are contiguous.
+    """
+
+    def __init__(self, graph, landmarks, table, build_time=0.0):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.table = table
+        self.build_time = build_time
+        self.num_queries = 0
+        self.total_settled = 0
+        self.total_query_time = 0.0
+
+    @classmethod
+    def build(cls, graph, num_landmarks=8, strategy='farthest', seed=None):
+        """
+        Select landmarks and precompute their distance tables
+
+        Parameters:
+        - graph: Graph or CSRGraph (a Graph is frozen first)
+        - num_landmarks: Number of landmarks k; memory is 8 * k * V bytes
+        - strategy: 'farthest' picks each landmark as far as possible from the
+          ones already chosen, 'random' picks them uniformly
+        - seed: Seed for the random choices
+
+        Returns:
+        - A LandmarkIndex
+        """
+        start_time = time.perf_counter()
+
+        graph = as_csr(graph)
+        n = graph.num_vertices
+        k = min(num_landmarks, n)
+        rng = random.Random(seed)
+
+        rows = []
+        landmarks = []
+
+        if strategy == 'random':
+            landmarks = rng.sample(range(n), k)
+            rows = [dijkstra_distances(graph, landmark) for landmark in landmarks]
+        elif strategy == 'farthest':
+            # Start from the vertex farthest from a random one, then repeatedly
+            # take the vertex whose nearest landmark is farthest away; vertices
+            # no landmark reaches (other components) are taken first
+            nearest = dijkstra_distances(graph, rng.randrange(n)) if n else []
+            while len(landmarks) < k:
+                candidate = max(range(n), key=nearest.__getitem__)
+                if candidate in landmarks:
+                    break
+                landmarks.append(candidate)
+                rows.append(dijkstra_distances(graph, candidate))
+                if len(landmarks) == 1:
+                    nearest = rows[0][:]
+                else:
+                    nearest = list(map(min, nearest, rows[-1]))
+        else:
+            raise ValueError(f"unknown landmark strategy {strategy!r}")
+
+        k = len(landmarks)
+        table = array('d', bytes(8 * n * k))
+        for j, row in enumerate(rows):
+            table[j::k] = array('d', (UNREACHABLE if d == float('inf') else d for d in row))
+
+        return cls(graph, array('q', landmarks), table, time.perf_counter() - start_time)
+
+    @property
+    def num_landmarks(self):
+        return len(self.landmarks)
+
+    @property
+    def nbytes(self):
+        return len(self.table) * self.table.itemsize + len(self.landmarks) * self.landmarks.itemsize
+
+    def lower_bound(self, u, v):
+        """
+        Lower bound on the distance between two vertex indices
+        """
+        k = len(self.landmarks)
+        if not k:
+            return 0
+        table = self.table
+        return max(map(abs, map(sub, table[u * k:u * k + k], table[v * k:v * k + k])))
+
+    def _heuristic(self):
+        graph, table, k = self.graph, self.table, len(self.landmarks)
+        target_rows = {}
+
+        def heuristic(vertex, target):
+            target_row = target_rows.get(target)
+            if target_row is None:
+                t = graph.index_of(target)
+                target_row = target_rows[target] = table[t * k:t * k + k]
+            u = graph.index_of(vertex)
+            return max(map(abs, map(sub, table[u * k:u * k + k], target_row)))
+
+        return heuristic
+
+    def query(self, source, target):
+        """
+        Landmark-guided A* search between two vertices
+
+        Returns:
+        - (path, distance, num_settled); path is [] and distance inf if target is unreachable
+        """
+        if self.graph.index_of(source) is None or self.graph.index_of(target) is None:
+            return [], float('inf'), 0
+        if not len(self.landmarks):
+            return dijkstra_path(self.graph, source, target)
+
+        start_time = time.perf_counter()
+        path, distance, num_settled = astar_path(self.graph, source, target, self._heuristic())
+
+        self.num_queries += 1
+        self.total_settled += num_settled
+        self.total_query_time += time.perf_counter() - start_time
+
+        return path, distance, num_settled
+
+    def shortest_path(self, source, target):
+        """
+        Same as Graph.shortest_path, answered with the landmark index
+        """
+        path, distance, _ = self.query(source, target)
+        return PathResult(path, distance)
+
+    def report(self, num_queries=100, seed=0):
+        """
+        Measure the index against plain early-exit Dijkstra on random queries
+
+        Returns:
+        - A dict with build time, memory and per-query averages for both searches
+        """
+        rng = random.Random(seed)
+        vertices = self.graph.get_vertices()
+        pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(num_queries)]
+
+        stats = {}
+        for name, search in (('alt', lambda s, t: astar_path(self.graph, s, t, self._heuristic())),
+                             ('dijkstra', lambda s, t: dijkstra_path(self.graph, s, t))):
+            settled = 0
+            start_time = time.perf_counter()
+            for s, t in pairs:
+                settled += search(s, t)[2]
+            elapsed = time.perf_counter() - start_time
+            stats[name] = (elapsed / max(num_queries, 1), settled / max(num_queries, 1))
+
+        return {
+            'num_landmarks': self.num_landmarks,
+            'build_time': self.build_time,
+            'memory_bytes': self.nbytes,
+            'num_queries': num_queries,
+            'alt_query_time': stats['alt'][0],
+            'alt_settled': stats['alt'][1],
+            'dijkstra_query_time': stats['dijkstra'][0],
+            'dijkstra_settled': stats['dijkstra'][1],
+            'speedup': stats['dijkstra'][0] / stats['alt'][0] if stats['alt'][0] else float('inf'),
+        }
+
+    def save(self, file_path):
+        """
+        Write the landmark tables to a binary file
+        """
+        header = HEADER.pack(MAGIC, VERSION, self.graph.num_vertices, self.graph.num_edges,
+                             len(self.landmarks), self.build_time)
+        with open(file_path, 'wb') as f:
+            f.write(header)
+            self.landmarks.tofile(f)
+            self.table.tofile(f)
+
+    @classmethod
+    def load(cls, file_path, graph):
+        """
+        Read landmark tables written by save for the same graph
+        """
+        graph = as_csr(graph)
+        with open(file_path, 'rb') as f:
+            magic, version, num_vertices, num_edges, k, build_time = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("not a landmark index file")
+            if num_vertices != graph.num_vertices or num_edges != graph.num_edges:
+                raise ValueError("landmark index was built for a different graph")
+            landmarks = array('q')
+            landmarks.fromfile(f, k)
+            table = array('d')
+            table.fromfile(f, k * num_vertices)
+        return cls(graph, landmarks, table, build_time)
+
+def compare_landmark_counts(graph, counts=(1, 2, 4, 8, 16), num_queries=100, seed=0):
+    """
+    Build indexes with different numbers of landmarks and report each one,
+    to trade index size against query latency
+    """
+    graph = as_csr(graph)
+    return [LandmarkIndex.build(graph, k, seed=seed).report(num_queries, seed) for k in counts]
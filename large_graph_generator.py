@@ -1,13 +1,108 @@
+import argparse
+import math
 import random
+
+from csr_graph import CSRGraph
 from graph import Graph
+from graph_writer import write_edges
+
+# save_graph_to_file used to be defined here; it moved to graph_writer and is
+# re-exported so existing imports from this module keep working
+from graph_writer import save_graph_to_file
+
+__all__ = ['gnp_edges', 'gnm_edges', 'random_edges', 'generate_large_graph', 'generate_csr_graph',
+           'write_random_graph', 'save_graph_to_file', 'main']
+
+def gnp_edges(num_vertices, p, seed=None, min_weight=1, max_weight=100):
+    """
+    Yield the edges of an Erdős–Rényi G(n, p) random graph in O(V + E)
 
-def generate_large_graph(num_vertices, edge_density=0.3):
+    Instead of drawing a random number for each of the V(V-1)/2 vertex
+    pairs, the gap to the next chosen pair is drawn from the geometric
+    distribution (Batagelj and Brandes, 2005), so the work is proportional
+    to the number of edges produced.
+
+    Parameters:
+    - num_vertices: Number of vertices (0..num_vertices-1)
+    - p: Probability of an edge between any two vertices (0.0 to 1.0)
+    - seed: Seed for random.Random; the same seed gives the same graph
+    - min_weight, max_weight: Range of the uniform integer edge weights
+
+    Returns:
+    - A generator of (u, v, weight) with u < v, ordered by v then u
+    """
+    if not 0 <= p <= 1:
+        raise ValueError(f"edge probability must be in [0, 1], got {p}")
+    rng = random.Random(seed)
+    uniform = rng.random
+    span = max_weight - min_weight + 1
+
+    if p == 0:
+        return
+    if p == 1:
+        for v in range(1, num_vertices):
+            for u in range(v):
+                yield (u, v, min_weight + int(uniform() * span))
+        return
+
+    log_q = math.log(1 - p)
+    v, u = 1, -1
+    while v < num_vertices:
+        u += 1 + int(math.log(1 - uniform()) / log_q)
+        while u >= v and v < num_vertices:
+            u -= v
+            v += 1
+        if v < num_vertices:
+            yield (u, v, min_weight + int(uniform() * span))
+
+def _pair(index):
+    # Inverse of index = v(v-1)/2 + u over the pairs u < v
+    v = (1 + math.isqrt(1 + 8 * index)) // 2
+    return index - v * (v - 1) // 2, v
+
+def gnm_edges(num_vertices, num_edges, seed=None, min_weight=1, max_weight=100):
+    """
+    Yield the edges of a G(n, m) random graph: num_edges distinct vertex
+    pairs chosen uniformly at random
+
+    The pairs are sampled as distinct indices into the V(V-1)/2 possible
+    pairs (random.sample does this in O(m) without listing them), sorted
+    and decoded, so the cost is O(V + E log E) time and O(E) memory.
+
+    Returns:
+    - A generator of (u, v, weight) with u < v, ordered by v then u
+    """
+    max_edges = num_vertices * (num_vertices - 1) // 2
+    if not 0 <= num_edges <= max_edges:
+        raise ValueError(f"a graph with {num_vertices} vertices has between 0 and {max_edges} edges, not {num_edges}")
+    rng = random.Random(seed)
+    indices = rng.sample(range(max_edges), num_edges)
+    indices.sort()
+
+    uniform = rng.random
+    span = max_weight - min_weight + 1
+    for index in indices:
+        u, v = _pair(index)
+        yield (u, v, min_weight + int(uniform() * span))
+
+def random_edges(num_vertices, edge_density=None, num_edges=None, seed=None, min_weight=1, max_weight=100):
+    """
+    G(n, p) edges if edge_density is given, G(n, m) edges if num_edges is
+    """
+    if (edge_density is None) == (num_edges is None):
+        raise ValueError("give exactly one of edge_density and num_edges")
+    if num_edges is not None:
+        return gnm_edges(num_vertices, num_edges, seed, min_weight, max_weight)
+    return gnp_edges(num_vertices, edge_density, seed, min_weight, max_weight)
+
+def generate_large_graph(num_vertices, edge_density=0.3, seed=None):
     """
     Generate a large random graph
 
     Parameters:
     - num_vertices: Number of vertices in the graph
     - edge_density: Probability of an edge between any two vertices (0.0 to 1.0)
+    - seed: Seed for reproducible graphs (default: different every call)
 
     Returns:
     - A Graph object
@@ -18,39 +113,53 @@ def generate_large_graph(num_vertices, edge_density=0.3):
     for i in range(num_vertices):
         graph.add_vertex(i)
 
-    # Add random edges
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            if random.random() < edge_density:
-                weight = random.randint(1, 100)
-                graph.add_edge(i, j, weight)
+    # Add random edges, skipping straight from one chosen pair to the next
+    for u, v, weight in gnp_edges(num_vertices, edge_density, seed):
+        graph.add_edge(u, v, weight)
 
     return graph
 
-def save_graph_to_file(graph, file_path):
+def generate_csr_graph(num_vertices, edge_density=None, num_edges=None, seed=None):
     """
-    Save a graph to a file in the format:
-    num_vertices num_edges
-    e source_vertex destination_vertex weight
+    Random G(n, p) or G(n, m) graph built directly as an array-backed
+    CSRGraph, which holds millions of vertices in a fraction of the memory
+    of a Graph
     """
-    vertices = graph.get_vertices()
-    edges = graph.get_edges()
+    edges = random_edges(num_vertices, edge_density, num_edges, seed)
+    return CSRGraph.from_edges(num_vertices, list(edges))
 
-    with open(file_path, 'w') as f:
-        f.write(f"{len(vertices)} {len(edges)}\n")
-
-        for u, v, weight in edges:
-            f.write(f"e {u} {v} {weight}\n")
+def write_random_graph(file_path, num_vertices, edge_density=None, num_edges=None, seed=None):
+    """
+    Stream a random G(n, p) or G(n, m) graph straight to a .gr file (see
+    graph_writer.write_edges) without holding it in memory, beyond the sampled pair
+    indices of G(n, m)
 
-if __name__ == "__main__":
-    print("Starting large graph generation...")
+    Returns:
+    - The number of edges written
+    """
+    edges = random_edges(num_vertices, edge_density, num_edges, seed)
+    return write_edges(file_path, num_vertices, edges)
 
-    # Generate a large graph with 200 vertices (reduced for faster execution)
-    large_graph = generate_large_graph(200, edge_density=0.05)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a random graph and write it as a .gr file")
+    parser.add_argument('--vertices', '-n', type=int, default=200, help="Number of vertices")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--density', '-p', type=float, help="Edge probability, G(n, p) (default 0.05)")
+    size.add_argument('--edges', '-m', type=int, help="Exact number of edges, G(n, m)")
+    size.add_argument('--degree', '-d', type=float, help="Average degree, G(n, p) with p = degree / (n - 1)")
+    parser.add_argument('--seed', type=int, help="Random seed")
+    parser.add_argument('--output', '-o', default="test_large.gr", help="Output .gr file")
+    args = parser.parse_args(argv)
 
-    print(f"Graph generated with {len(large_graph.get_vertices())} vertices and {len(large_graph.get_edges())} edges")
+    density = args.density
+    if args.degree is not None:
+        density = min(1.0, args.degree / max(1, args.vertices - 1))
+    elif density is None and args.edges is None:
+        density = 0.05
 
-    # Save the graph to a file
-    save_graph_to_file(large_graph, "test_large.gr")
+    print("Starting large graph generation...")
+    count = write_random_graph(args.output, args.vertices, density, args.edges, args.seed)
+    print(f"Graph with {args.vertices} vertices and {count} edges saved to {args.output}")
 
-    print(f"Graph saved to test_large.gr")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from csr_graph import CSRGraph
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def _aligned(size):
+    return size + (-size % 8)
+
+class SharedBuffers:
+    """
+    A set of typed buffers laid out in one shared memory block.
+
+    The parent process creates the block with `create`, hands `spec` to
+    worker processes (it is a small picklable tuple), and the workers call
+    `attach` to get memoryviews onto the same pages without copying.
+    """
+
+    def __init__(self, shm, layout):
+        self.shm = shm
+        self.layout = layout
+        self.views = []
+        position = 0
+        for code, length in layout:
+            nbytes = length * array(code).itemsize
+            self.views.append(shm.buf[position:position + nbytes].cast(code))
+            position += _aligned(nbytes)
+
+    @classmethod
+    def create(cls, layout):
+        """
+        Allocate a block for buffers given as (typecode, length) pairs
+        """
+        size = sum(_aligned(length * array(code).itemsize) for code, length in layout)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        return cls(shm, layout)
+
+    @classmethod
+    def attach(cls, spec):
+        name, layout = spec
+        # Pool workers share the parent's resource tracker, so attaching
+        # re-registers the same name and the parent's unlink clears it
+        return cls(shared_memory.SharedMemory(name=name), layout)
+
+    @property
+    def spec(self):
+        return (self.shm.name, self.layout)
+
+    def close(self, unlink=True):
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def share_graph(graph):
+    """
+    Copy the CSR buffers of a graph into shared memory
+
+    Returns:
+    - A SharedBuffers holding offsets, targets and weights
+    """
+    buffers = (graph.offsets, graph.targets, graph.weights)
+    shared = SharedBuffers.create([(memoryview(b).format, len(b)) for b in buffers])
+    for view, buffer in zip(shared.views, buffers):
+        view[:] = memoryview(buffer)
+    return shared
+
+def attach_graph(spec, num_edges=None):
+    """
+    Rebuild a label-free CSRGraph over buffers created by share_graph
+
+    Returns:
+    - (shared, graph); keep `shared` alive for as long as the graph is used
+    """
+    shared = SharedBuffers.attach(spec)
+    offsets, targets, weights = shared.views
+    return shared, CSRGraph(offsets, targets, weights, num_edges=num_edges)
@@ -0,0 +1,270 @@
+import heapq
+import math
+import weakref
+
+INF = float('inf')
+
+# Point-to-point searches. They only need graph.weighted_neighbors(vertex),
+# which both Graph and CSRGraph provide, and keep their distance and parent
+# dicts limited to the vertices they actually reach.
+
+def reconstruct_path(parent, target):
+    """
+    Follow parent pointers back from target and return the path from the root
+    """
+    path = []
+    vertex = target
+    while vertex is not None:
+        path.append(vertex)
+        vertex = parent[vertex]
+    path.reverse()
+    return path
+
+def dijkstra_path(graph, source, target):
+    """
+    Dijkstra's algorithm from source that stops as soon as target is settled
+
+    Returns:
+    - (path, distance, num_settled); path is [] and distance inf if target is unreachable
+    """
+    neighbors = graph.weighted_neighbors
+
+    dist = {source: 0}
+    parent = {source: None}
+    pq = [(0, source)]
+    num_settled = 0
+
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+
+        if current_dist > dist[u]:
+            continue
+        num_settled += 1
+
+        if u == target:
+            return reconstruct_path(parent, target), current_dist, num_settled
+
+        for v, weight in neighbors(u):
+            new_dist = current_dist + weight
+            if new_dist < dist.get(v, INF):
+                dist[v] = new_dist
+                parent[v] = u
+                heapq.heappush(pq, (new_dist, v))
+
+    return [], INF, num_settled
+
+def bidirectional_dijkstra_path(graph, source, target):
+    """
+    Dijkstra's algorithm run from both ends at once, always advancing the
+    side with the smaller frontier key, until the two frontier keys add up
+    to at least the best source-target distance found so far
+
+    Returns:
+    - (path, distance, num_settled); path is [] and distance inf if target is unreachable
+    """
+    if source == target:
+        return [source], 0, 1
+
+    neighbors = graph.weighted_neighbors
+
+    dist = ({source: 0}, {target: 0})
+    parent = ({source: None}, {target: None})
+    pqs = ([(0, source)], [(0, target)])
+    num_settled = 0
+
+    best = INF
+    meeting_vertex = None
+
+    while pqs[0] and pqs[1]:
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+
+        side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+        side_dist, side_parent, pq = dist[side], parent[side], pqs[side]
+        other_dist = dist[1 - side]
+
+        current_dist, u = heapq.heappop(pq)
+        if current_dist > side_dist[u]:
+            continue
+        num_settled += 1
+
+        for v, weight in neighbors(u):
+            new_dist = current_dist + weight
+            if new_dist < side_dist.get(v, INF):
+                side_dist[v] = new_dist
+                side_parent[v] = u
+                heapq.heappush(pq, (new_dist, v))
+            if v in other_dist and side_dist[v] + other_dist[v] < best:
+                best = side_dist[v] + other_dist[v]
+                meeting_vertex = v
+
+    if meeting_vertex is None:
+        return [], INF, num_settled
+
+    forward = reconstruct_path(parent[0], meeting_vertex)
+    backward = reconstruct_path(parent[1], meeting_vertex)
+    backward.reverse()
+    return forward + backward[1:], best, num_settled
+
+def astar_path(graph, source, target, heuristic):
+    """
+    A* search: Dijkstra's algorithm ordered by distance plus heuristic(vertex, target)
+
+    The heuristic must never overestimate the remaining distance for the
+    returned path to be a shortest one.
+
+    Returns:
+    - (path, distance, num_settled); path is [] and distance inf if target is unreachable
+    """
+    neighbors = graph.weighted_neighbors
+
+    dist = {source: 0}
+    parent = {source: None}
+    pq = [(heuristic(source, target), 0, source)]
+    num_settled = 0
+
+    while pq:
+        _, current_dist, u = heapq.heappop(pq)
+
+        if current_dist > dist[u]:
+            continue
+        num_settled += 1
+
+        if u == target:
+            return reconstruct_path(parent, target), current_dist, num_settled
+
+        for v, weight in neighbors(u):
+            new_dist = current_dist + weight
+            if new_dist < dist.get(v, INF):
+                dist[v] = new_dist
+                parent[v] = u
+                heapq.heappush(pq, (new_dist + heuristic(v, target), new_dist, v))
+
+    return [], INF, num_settled
+
+# Mean Earth radius in kilometres, the unit of the cities graph weights
+EARTH_RADIUS_KM = 6371.0088
+
+def _coordinates(graph):
+    return {v: attrs['coordinates'] for v, attrs in graph.vertex_attributes.items() if 'coordinates' in attrs}
+
+def great_circle_distance(a, b, radius=EARTH_RADIUS_KM):
+    """
+    Haversine distance between two (latitude, longitude) points in degrees
+    """
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * radius * math.asin(min(1.0, math.sqrt(h)))
+
+def euclidean_distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+def coordinate_heuristic(graph, distance, scale=None):
+    """
+    Build an A* heuristic from the 'coordinates' vertex attribute
+
+    Every vertex needs coordinates, or none does (the heuristic is then 0
+    and A* a plain Dijkstra search); with only some annotated it raises
+    ValueError. consistent_scale only sees edges between annotated
+    vertices, so it does not bound paths through the others, and A* could
+    return a longer path.
+
+    Parameters:
+    - graph: Graph or CSRGraph whose vertices carry coordinates
+    - distance: Function of two coordinate pairs, e.g. great_circle_distance
+    - scale: Factor converting distance into weight units; by default the
+      graph's consistent_scale, which keeps the heuristic admissible even
+      when weights are rounded below the geometric distance or measured in
+      other units than the coordinates
+
+    Returns:
+    - A function heuristic(vertex, target)
+    """
+    annotated, missing = _cached(graph, 'coverage', _coordinate_coverage)
+    if not annotated:
+        return lambda vertex, target: 0
+    if missing is not None:
+        raise ValueError(f"vertex {missing!r} has no coordinates; a coordinate heuristic needs them "
+                         f"on every vertex (pass a heuristic function for partially annotated graphs)")
+
+    if scale is None:
+        scale = cached_consistent_scale(graph, distance)
+    attributes = graph.vertex_attributes
+
+    def heuristic(vertex, target):
+        return scale * distance(attributes[vertex]['coordinates'], attributes[target]['coordinates'])
+
+    return heuristic
+
+def great_circle_heuristic(graph, scale=None):
+    """
+    Heuristic from (latitude, longitude) coordinates in degrees
+    """
+    return coordinate_heuristic(graph, great_circle_distance, scale)
+
+def euclidean_heuristic(graph, scale=None):
+    """
+    Heuristic from planar (x, y) coordinates; the default scale converts
+    coordinate units into weight units, so with scale=1.0 the coordinates
+    must already be in weight units
+    """
+    return coordinate_heuristic(graph, euclidean_distance, scale)
+
+HEURISTICS = {
+    'great_circle': great_circle_heuristic,
+    'euclidean': euclidean_heuristic,
+}
+
+def consistent_scale(graph, distance):
+    """
+    Largest scale for which scale * distance never exceeds an edge weight
+
+    With that scale a coordinate heuristic is consistent (distance obeys the
+    triangle inequality), so A* returns exact shortest paths even when
+    weights are rounded below the true geometric distance. The scale is not
+    capped at 1: it also converts coordinate units into weight units. A
+    graph without an edge between two vertices with coordinates gets 1.0.
+    """
+    coordinates = _coordinates(graph)
+    scale = INF
+    for u, v, weight in graph.iter_edges():
+        if u in coordinates and v in coordinates:
+            d = distance(coordinates[u], coordinates[v])
+            if d > 0 and weight < scale * d:
+                scale = weight / d
+                # weight / d * d may round up past weight
+                while scale * d > weight:
+                    scale = math.nextafter(scale, 0)
+    return 1.0 if scale == INF else scale
+
+# graph -> (version, vertex_attributes, {key: value}) for the values derived
+# from the coordinates: consistent scales by distance function, and coverage
+_derived = weakref.WeakKeyDictionary()
+
+def _cached(graph, key, compute):
+    version, attributes, values = _derived.get(graph, (None, None, None))
+    if version != graph.version or attributes is not graph.vertex_attributes:
+        values = {}
+        _derived[graph] = (graph.version, graph.vertex_attributes, values)
+    if key not in values:
+        values[key] = compute(graph)
+    return values[key]
+
+def _coordinate_coverage(graph):
+    # (number of vertices with coordinates, the first vertex without or None)
+    attributes = graph.vertex_attributes
+    annotated = 0
+    missing = None
+    for v in graph.get_vertices():
+        if 'coordinates' in attributes.get(v, ()):
+            annotated += 1
+        elif missing is None:
+            missing = v
+    return annotated, missing
+
+def cached_consistent_scale(graph, distance):
+    """
+    consistent_scale, computed once per graph version and distance function
+    """
+    return _cached(graph, distance, lambda graph: consistent_scale(graph, distance))
@@ -0,0 +1,126 @@
+import functools
+import inspect
+from collections import OrderedDict
+
+from results import MSTResult, PathResult, ShortestPathResult
+
+# Result types whose len() counts towards result_size
+SIZED_RESULTS = (list, dict, set, MSTResult, ShortestPathResult, PathResult)
+
+class QueryCache:
+    """
+    Least-recently-used cache of query results for one graph.
+
+    Entries are keyed by method name and arguments and are only valid for
+    the graph version they were computed at: the first lookup after the
+    graph changes drops every entry. The cache holds at most max_entries
+    results and, if max_items is set, at most that many items in total,
+    where a result's size is the number of elements in its lists and
+    dicts (see result_size). Cached results are shared between callers and
+    must not be modified.
+    """
+
+    def __init__(self, max_entries=128, max_items=None):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.entries = OrderedDict()
+        self.version = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def get_or_compute(self, version, key, compute):
+        """
+        Return the cached result for key at this graph version, calling
+        compute() and storing its result on a miss
+        """
+        if version != self.version:
+            if self.entries:
+                self.invalidations += 1
+                self.clear()
+            self.version = version
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        result = compute()
+        size = result_size(result)
+        if self.max_items is not None and size > self.max_items:
+            return result
+
+        self.entries[key] = (result, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or (self.max_items is not None and self.size > self.max_items):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+        return result
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current occupancy as a dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self.entries),
+            'items': self.size,
+        }
+
+def result_size(result):
+    """
+    Approximate size of a query result: one per result plus the length of
+    every list, dict, set or result object (edges, vertices or path
+    vertices) it consists of
+    """
+    parts = result if isinstance(result, tuple) else (result,)
+    return 1 + sum(len(part) for part in parts if isinstance(part, SIZED_RESULTS))
+
+def cached_query(method):
+    """
+    Decorator for graph query methods: while graph.query_cache is set,
+    results are memoized by method name and arguments until graph.version
+    changes; otherwise, or when a stats object is passed (by keyword or
+    position) to instrument the call, the method runs as before
+    """
+    name = method.__name__
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.query_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        # Bind the arguments, so positional and keyword calls (and defaults
+        # left out) share an entry and a positional stats is seen
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if arguments.get('stats') is not None:
+            return method(self, *args, **kwargs)
+        key = (name, tuple(value for parameter, value in arguments.items() if parameter != 'self'))
+        try:
+            hash(key)
+        except TypeError:  # Unhashable arguments are never cached
+            return method(self, *args, **kwargs)
+        return cache.get_or_compute(self.version, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
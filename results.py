@@ -0,0 +1,188 @@
+from path_search import reconstruct_path
+
+INF = float('inf')
+
+class MSTResult:
+    """
+    Edges and total weight of a minimum spanning tree (a forest if the
+    graph is disconnected).
+
+    Kruskal and Borůvka on a CSRGraph fill it with parallel arrays of
+    vertex indices (NumPy arrays or array.array) plus the vertex labels, and
+    the labelled (u, v, weight) tuples are only built the first time edges
+    is read. Other algorithms hand over the edge list directly.
+    """
+
+    __slots__ = ('total_weight', 'sources', 'targets', 'weights', 'labels', '_edges')
+
+    def __init__(self, edges, total_weight):
+        self._edges = edges
+        self.total_weight = total_weight
+        self.sources = self.targets = self.weights = self.labels = None
+
+    @classmethod
+    def from_arrays(cls, sources, targets, weights, total_weight, labels=None):
+        """
+        Result backed by index arrays; labels maps indices to vertices (None
+        when the indices are the vertices)
+        """
+        result = cls(None, total_weight)
+        result.sources = sources
+        result.targets = targets
+        result.weights = weights
+        result.labels = labels
+        return result
+
+    def __len__(self):
+        if self._edges is None:
+            return len(self.sources)
+        return len(self._edges)
+
+    @property
+    def edges(self):
+        """
+        The tree edges as a list of (u, v, weight) tuples
+        """
+        if self._edges is None:
+            sources, targets, weights = self.sources.tolist(), self.targets.tolist(), self.weights.tolist()
+            labels = self.labels
+            if labels is None:
+                self._edges = list(zip(sources, targets, weights))
+            else:
+                self._edges = [(labels[u], labels[v], w) for u, v, w in zip(sources, targets, weights)]
+        return self._edges
+
+    def arrays(self):
+        """
+        Return the (sources, targets, weights) index arrays
+
+        Raises ValueError for results built from an edge list; freeze the
+        graph (or use Graph.kruskal_mst(arrays=True)) to get arrays.
+        """
+        if self.sources is None:
+            raise ValueError("this MSTResult holds an edge list, not index arrays")
+        return self.sources, self.targets, self.weights
+
+    def to_dict(self):
+        return {'edges': self.edges, 'total_weight': self.total_weight}
+
+    def __repr__(self):
+        return f"MSTResult({len(self)} edges, total_weight={self.total_weight})"
+
+class ShortestPathResult:
+    """
+    Single-source shortest-path distances and parents.
+
+    A CSRGraph fills it with a distance list and a parent array (-1 for no
+    parent) indexed by vertex, which take a fraction of the memory of two
+    dicts; dist and parent build those dicts only when first read, and
+    distance() and path() answer without them. A Graph hands over its dicts
+    directly.
+    """
+
+    __slots__ = ('source', 'distances', 'parents', 'labels', '_index_of', '_dist', '_parent')
+
+    def __init__(self, source, dist, parent):
+        self.source = source
+        self._dist = dist
+        self._parent = parent
+        self.distances = self.parents = self.labels = self._index_of = None
+
+    @classmethod
+    def from_arrays(cls, source, distances, parents, labels, index_of):
+        """
+        Result backed by per-index lists
+
+        Parameters:
+        - source: The source vertex
+        - distances: Distance of every vertex index (inf if unreachable)
+        - parents: Parent index of every vertex index, -1 for none
+        - labels: Vertex of every index
+        - index_of: Function mapping a vertex to its index, or None
+        """
+        result = cls(source, None, None)
+        result.distances = distances
+        result.parents = parents
+        result.labels = labels
+        result._index_of = index_of
+        return result
+
+    def __len__(self):
+        if self._dist is None:
+            return len(self.distances)
+        return len(self._dist)
+
+    @property
+    def dist(self):
+        """
+        {vertex: distance} over all vertices
+        """
+        if self._dist is None:
+            self._dist = dict(zip(self.labels, self.distances))
+        return self._dist
+
+    @property
+    def parent(self):
+        """
+        {vertex: parent vertex}, None for the source and unreachable vertices
+        """
+        if self._parent is None:
+            labels = self.labels
+            self._parent = {v: (None if p < 0 else labels[p]) for v, p in zip(labels, self.parents)}
+        return self._parent
+
+    def distance(self, vertex):
+        """
+        Distance from the source to vertex, inf if unreachable or unknown
+        """
+        if self.distances is None:
+            return self._dist.get(vertex, INF)
+        i = self._index_of(vertex)
+        return INF if i is None else self.distances[i]
+
+    def path(self, vertex):
+        """
+        Vertices from the source to vertex, or [] if it is unreachable
+        """
+        if self.distance(vertex) == INF:
+            return []
+        if self.distances is None:
+            return reconstruct_path(self._parent, vertex)
+
+        parents, labels = self.parents, self.labels
+        i = self._index_of(vertex)
+        path = [i]
+        while parents[path[-1]] >= 0:
+            path.append(parents[path[-1]])
+        return [labels[i] for i in reversed(path)]
+
+    def to_dict(self):
+        return {'source': self.source, 'dist': self.dist, 'parent': self.parent}
+
+    def __repr__(self):
+        return f"ShortestPathResult(source={self.source!r}, {len(self)} vertices)"
+
+class PathResult:
+    """
+    One shortest path: the vertices from source to target and its length
+    ([] and inf if the target is unreachable)
+    """
+
+    __slots__ = ('path', 'distance')
+
+    def __init__(self, path, distance):
+        self.path = path
+        self.distance = distance
+
+    def __len__(self):
+        return len(self.path)
+
+    @property
+    def found(self):
+        return self.distance != INF
+
+    def to_dict(self):
+        return {'path': self.path, 'distance': self.distance}
+
+    def __repr__(self):
+        return f"PathResult({len(self.path)} vertices, distance={self.distance})"
@@ -0,0 +1,243 @@
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from csr_graph import CSRGraph
+from parallel import SharedBuffers, attach_graph, default_workers, share_graph
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; Floyd-Warshall falls back to pure Python
+    np = None
+
+# all_pairs_shortest_paths picks Floyd-Warshall for graphs at most this large...
+FLOYD_WARSHALL_MAX_VERTICES = 1024
+# ...whose arcs fill at least this fraction of the adjacency matrix
+FLOYD_WARSHALL_MIN_DENSITY = 0.05
+
+# Most sources handed to a worker process per task
+SOURCES_PER_TASK = 16
+
+INF = float('inf')
+
+class DistanceMatrix:
+    """
+    Distances from a list of sources to every vertex, stored row-major in one
+    float64 array (unreachable vertices are inf)
+    """
+
+    def __init__(self, graph, sources, data):
+        self.graph = graph
+        self.sources = sources
+        self.data = data
+        self.num_vertices = graph.num_vertices
+        self._row_of = None
+
+    def __len__(self):
+        return len(self.sources)
+
+    def row(self, source):
+        """
+        Return the distances from source as an array indexed by vertex index
+        """
+        if self._row_of is None:
+            self._row_of = {s: i for i, s in enumerate(self.sources)}
+        start = self._row_of[source] * self.num_vertices
+        return self.data[start:start + self.num_vertices]
+
+    def get(self, source, target):
+        """
+        Distance from source to target; raises KeyError for a source that
+        is not a row or a target that is not in the graph
+        """
+        index = self.graph.index_of(target)
+        if index is None:
+            raise KeyError(target)
+        return self.row(source)[index]
+
+    def to_dict(self):
+        """
+        Return {source: {vertex: distance}}, with rows shaped like ShortestPathResult.dist
+        """
+        vertices = self.graph.get_vertices()
+        return {s: dict(zip(vertices, self.row(s))) for s in self.sources}
+
+def as_csr(graph):
+    """
+    Return graph itself if it is a CSRGraph, otherwise a frozen snapshot of it
+    """
+    return graph if isinstance(graph, CSRGraph) else graph.freeze()
+
+def dijkstra_distances(graph, source):
+    """
+    Distances from a vertex index to every vertex index of a CSRGraph, as a list
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    dist = [INF] * graph.num_vertices
+    dist[source] = 0
+    pq = [(0, source)]
+
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+
+        if current_dist > dist[u]:
+            continue
+
+        start, end = offsets[u], offsets[u + 1]
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            new_dist = current_dist + weight
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                heapq.heappush(pq, (new_dist, v))
+
+    return dist
+
+def _fill_rows(graph, out, tasks):
+    n = graph.num_vertices
+    for row, source in tasks:
+        out[row * n:(row + 1) * n] = array('d', dijkstra_distances(graph, source))
+
+# Per-process state of pool workers, set up once by _init_worker
+_worker = {}
+
+def _init_worker(graph_spec, num_edges, result_spec):
+    _worker['graph'] = attach_graph(graph_spec, num_edges)
+    _worker['result'] = SharedBuffers.attach(result_spec)
+
+def _run_tasks(tasks):
+    _, graph = _worker['graph']
+    _fill_rows(graph, _worker['result'].views[0], tasks)
+
+def _source_indices(graph, sources):
+    indices = []
+    for source in sources:
+        index = graph.index_of(source)
+        if index is None:
+            raise ValueError(f"vertex {source!r} is not in the graph")
+        indices.append(index)
+    return indices
+
+def dijkstra_many(graph, sources, workers=None):
+    """
+    Run Dijkstra from many sources, optionally across a process pool
+
+    Parameters:
+    - graph: Graph or CSRGraph to search
+    - sources: Source vertices
+    - workers: Number of worker processes; None or 1 runs in this process,
+      0 uses one worker per CPU
+
+    Returns:
+    - A DistanceMatrix with one row per source
+
+    Workers see the graph through shared memory and write their rows straight
+    into a shared result block, so neither the graph nor the distances are
+    pickled.
+    """
+    graph = as_csr(graph)
+    sources = list(sources)
+    indices = _source_indices(graph, sources)
+    n = graph.num_vertices
+
+    if workers == 0:
+        workers = default_workers()
+    workers = min(workers or 1, len(sources))
+
+    tasks = list(enumerate(indices))
+
+    if workers <= 1:
+        data = array('d', bytes(8 * n * len(sources)))
+        _fill_rows(graph, data, tasks)
+        return DistanceMatrix(graph, sources, data)
+
+    # Small enough batches that every worker gets a share of the sources
+    per_task = max(1, min(SOURCES_PER_TASK, len(tasks) // workers))
+    chunks = [tasks[i:i + per_task] for i in range(0, len(tasks), per_task)]
+
+    with share_graph(graph) as shared_graph, SharedBuffers.create([('d', n * len(sources))]) as result:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared_graph.spec, graph.num_edges, result.spec)
+        ) as pool:
+            for _ in pool.map(_run_tasks, chunks):
+                pass
+        data = array('d')
+        data.frombytes(result.views[0].cast('B'))
+
+    return DistanceMatrix(graph, sources, data)
+
+def floyd_warshall(graph):
+    """
+    All-pairs distances by Floyd-Warshall, vectorized with NumPy when available
+
+    Returns:
+    - A DistanceMatrix with one row per vertex
+    """
+    graph = as_csr(graph)
+    n = graph.num_vertices
+    sources = graph.get_vertices()
+
+    if np is not None:
+        dist = np.full((n, n), INF)
+        arc_sources = np.repeat(np.arange(n), np.diff(np.asarray(graph.offsets)))
+        np.minimum.at(dist, (arc_sources, np.asarray(graph.targets)), np.asarray(graph.weights, dtype=np.float64))
+        np.fill_diagonal(dist, 0)
+        for k in range(n):
+            np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+        data = array('d')
+        data.frombytes(dist.tobytes())
+        return DistanceMatrix(graph, sources, data)
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [[INF] * n for _ in range(n)]
+    for u in range(n):
+        row = dist[u]
+        row[u] = 0
+        for i in range(offsets[u], offsets[u + 1]):
+            if weights[i] < row[targets[i]]:
+                row[targets[i]] = weights[i]
+
+    for k in range(n):
+        row_k = dist[k]
+        for i in range(n):
+            d_ik = dist[i][k]
+            if d_ik == INF:
+                continue
+            dist[i] = list(map(min, dist[i], [d_ik + d for d in row_k]))
+
+    data = array('d')
+    for row in dist:
+        data.extend(row)
+    return DistanceMatrix(graph, sources, data)
+
+def all_pairs_shortest_paths(graph, method='auto', workers=None):
+    """
+    Distances between every pair of vertices
+
+    Parameters:
+    - graph: Graph or CSRGraph to search
+    - method: 'dijkstra', 'floyd_warshall' or 'auto'; auto uses the
+      vectorized Floyd-Warshall for small dense graphs when NumPy is
+      installed, and Dijkstra from every vertex otherwise
+    - workers: Worker processes for the Dijkstra method (see dijkstra_many)
+
+    Returns:
+    - A DistanceMatrix with one row per vertex
+    """
+    graph = as_csr(graph)
+    n = graph.num_vertices
+
+    if method == 'auto':
+        dense = n and len(graph.targets) >= FLOYD_WARSHALL_MIN_DENSITY * n * n
+        if np is not None and n <= FLOYD_WARSHALL_MAX_VERTICES and dense:
+            method = 'floyd_warshall'
+        else:
+            method = 'dijkstra'
+
+    if method == 'floyd_warshall':
+        return floyd_warshall(graph)
+    if method == 'dijkstra':
+        return dijkstra_many(graph, graph.get_vertices(), workers)
+    raise ValueError(f"unknown all-pairs method {method!r}")
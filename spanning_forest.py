@@ -0,0 +1,66 @@
+from disjoint_set import DisjointSet
+
+class SpanningForest:
+    """
+    Minimum spanning forest of a possibly disconnected graph: the tree
+    edges plus, for every connected component, its id, vertices and total
+    weight. Component ids are numbered 0..k-1 in the order of the graph's
+    vertex list; an isolated vertex is a component with no edges.
+    """
+
+    def __init__(self, edges, vertices, component_ids, totals):
+        self.edges = edges
+        self.vertices = vertices
+        self.component_ids = component_ids
+        self.totals = totals
+
+    @classmethod
+    def from_edges(cls, vertices, edges):
+        """
+        Group forest edges into components
+
+        Parameters:
+        - vertices: All vertices of the graph
+        - edges: (u, v, weight) edges of a spanning forest of that graph
+
+        Returns:
+        - A SpanningForest
+        """
+        vertices = list(vertices)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        components = DisjointSet(len(vertices))
+        components.union_many((index[u], index[v]) for u, v, _ in edges)
+        ids = components.component_ids()
+
+        totals = [0] * components.num_sets
+        for u, _, weight in edges:
+            totals[ids[index[u]]] += weight
+
+        return cls(edges, vertices, dict(zip(vertices, ids)), totals)
+
+    @property
+    def num_components(self):
+        return len(self.totals)
+
+    @property
+    def total_weight(self):
+        return sum(self.totals)
+
+    def component_of(self, vertex):
+        return self.component_ids[vertex]
+
+    def components(self):
+        """
+        Return the vertices of each component, indexed by component id
+        """
+        groups = [[] for _ in self.totals]
+        for vertex in self.vertices:
+            groups[self.component_ids[vertex]].append(vertex)
+        return groups
+
+    def component_edges(self, component):
+        """
+        Return the forest edges of one component
+        """
+        ids = self.component_ids
+        return [edge for edge in self.edges if ids[edge[0]] == component]
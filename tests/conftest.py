@@ -0,0 +1,36 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph import Graph
+
+def make_random_graph(seed, num_vertices=30, num_edges=60, max_weight=20, float_weights=False):
+    """
+    Seeded random connected Graph on vertices 0..num_vertices-1: a random
+    spanning tree plus num_edges extra insertions, which include parallel
+    edges and self-loops
+    """
+    rng = random.Random(seed)
+
+    def weight():
+        return rng.uniform(0, max_weight) if float_weights else rng.randint(1, max_weight)
+
+    graph = Graph()
+    order = list(range(num_vertices))
+    rng.shuffle(order)
+    for v in order:
+        graph.add_vertex(v)
+    for i in range(1, num_vertices):
+        graph.add_edge(order[rng.randrange(i)], order[i], weight())
+    for _ in range(num_edges):
+        graph.add_edge(rng.randrange(num_vertices), rng.randrange(num_vertices), weight())
+    return graph
+
+@pytest.fixture
+def random_graph():
+    return make_random_graph
@@ -0,0 +1,48 @@
+import json
+import random
+
+import pytest
+
+from benchmark import MAX_RUNS, Measurement, measure, run_suite, synthetic_graph
+
+def test_measure_trivial_callable():
+    calls = []
+    measurement = measure(lambda: calls.append(1), 'noop', {'size': 3}, min_time=0.001, min_runs=7, warmup=2)
+    assert measurement.name == 'noop'
+    assert measurement.params == {'size': 3}
+    assert 7 <= measurement.runs <= MAX_RUNS
+    # Warmup calls run but are not recorded
+    assert len(calls) == measurement.runs + 2
+    assert all(isinstance(sample, int) and sample >= 0 for sample in measurement.samples)
+
+    summary = measurement.to_dict()
+    assert summary['runs'] == measurement.runs
+    assert summary['min_ns'] <= summary['p25_ns'] <= summary['median_ns'] <= summary['p75_ns'] <= summary['max_ns']
+    low, high = summary['median_ci_ns']
+    assert low <= summary['median_ns'] <= high
+    json.dumps(summary)
+
+def test_measure_clamps_runs():
+    assert measure(lambda: None, min_time=10, max_runs=12).runs == 12
+    assert measure(lambda: None, min_time=0, min_runs=3).runs == 3
+
+def test_summary_statistics():
+    measurement = Measurement('fixed', [40, 10, 30, 20])
+    assert measurement.median == 25
+    assert measurement.mean == 25
+    assert measurement.percentile(0) == 10
+    assert measurement.percentile(100) == 40
+    assert measurement.percentile(50) == 25
+    assert measurement.stdev == pytest.approx(12.909944)
+    low, high = measurement.mean_ci()
+    assert low < 25 < high
+    assert Measurement('single', [5]).stdev == 0.0
+
+def test_run_suite():
+    graph = synthetic_graph(50, 4, random.Random(0))
+    assert graph.num_vertices == 50
+    report = run_suite(['kruskal', 'dijkstra'], graphs=[('tiny', graph)], min_time=0.001, verbose=False)
+    assert [result['name'] for result in report['results']] == ['kruskal/tiny', 'dijkstra/tiny']
+    assert report['results'][0]['params']['num_edges'] == graph.num_edges
+    assert report['metadata']['min_time'] == 0.001
+    json.dumps(report)
@@ -0,0 +1,60 @@
+import math
+import statistics
+
+import pytest
+
+import benchmark
+import benchmark_store
+from benchmark_store import ResultStore, compare, mann_whitney_p
+
+def test_mann_whitney_known_p_value():
+    # Candidate ranks 4, 5, 6: U = 15 - 6 = 9, mean 4.5, variance 9 / 12 * 7
+    assert mann_whitney_p([1, 2, 3], [4, 5, 6]) == pytest.approx(0.0247673, abs=1e-7)
+    # The other direction is the complementary tail
+    assert mann_whitney_p([4, 5, 6], [1, 2, 3]) == pytest.approx(1 - 0.0247673, abs=1e-7)
+
+def test_mann_whitney_ties():
+    # Combined 1 2 2 2 3 3 with the 2s sharing rank 3 and the 3s rank 5.5:
+    # U = 3 + 2 * 5.5 - 6 = 8, and the ties (3 and 2 of them) shrink the
+    # variance to 9 / 12 * (7 - 30 / 30)
+    expected = 0.5 * math.erfc((8 - 4.5) / math.sqrt(4.5) / math.sqrt(2))
+    assert mann_whitney_p([1, 2, 2], [2, 3, 3]) == pytest.approx(expected)
+    # All samples tied: no evidence either way
+    assert mann_whitney_p([5, 5, 5], [5, 5]) == 1.0
+    assert mann_whitney_p([], [1, 2]) == 1.0
+
+def report(commit, samples):
+    results = [{'name': name, 'params': {'algorithm': name, 'graph': 'g'},
+                'median_ns': statistics.median(runs), 'samples_ns': runs}
+               for name, runs in samples.items()]
+    metadata = {'timestamp': '2026-01-01T00:00:00', 'python': '3.11', 'machine': 'x86_64',
+                'git_commit': commit, 'git_dirty': False}
+    return {'metadata': metadata, 'results': results}
+
+def test_compare_two_stored_runs(tmp_path, monkeypatch):
+    # The commit comes from the metadata, not from git at record time
+    monkeypatch.setattr(benchmark_store, 'git_revision', None)
+    steady = [100, 101, 102, 103, 104, 105, 106, 107]
+    slower = [130, 131, 132, 133, 134, 135, 136, 137]
+    with ResultStore(str(tmp_path / 'results.sqlite')) as store:
+        before = store.record(report('aaa', {'prim': steady, 'kruskal': steady, 'old': steady}))
+        after = store.record(report('bbb', {'prim': slower, 'kruskal': steady, 'new': steady}))
+        assert [run[2] for run in store.runs()] == ['aaa', 'bbb']
+        assert store.latest_pair() == (before, after)
+        baseline, candidate = store.results(before), store.results(after)
+
+    # Only benchmarks in both runs are compared
+    rows = compare(baseline, candidate)
+    assert [row['name'] for row in rows] == ['kruskal', 'prim']
+    kruskal, prim = rows
+    assert prim['ratio'] == pytest.approx(133.5 / 103.5)
+    assert prim['regression'] and prim['p_value'] < 0.01
+    assert not kruskal['regression'] and kruskal['ratio'] == 1
+    # Flagging needs both the slowdown threshold and the significance level
+    assert not any(row['regression'] for row in compare(baseline, candidate, threshold=0.5))
+    assert not any(row['regression'] for row in compare(baseline, candidate, alpha=1e-9))
+
+def test_metadata_records_the_commit(monkeypatch):
+    monkeypatch.setattr(benchmark, 'git_revision', lambda: ('abc123', True))
+    metadata = benchmark.metadata()
+    assert (metadata['git_commit'], metadata['git_dirty']) == ('abc123', True)
@@ -0,0 +1,62 @@
+import pytest
+
+import boruvka
+import csr_graph
+from boruvka import boruvka_mst
+from graph import Graph
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(boruvka, 'np', None)
+        monkeypatch.setattr(csr_graph, 'np', None)
+    return request.param
+
+def tied_forest():
+    # Three components plus an isolated vertex; weights 1..3 give many ties
+    graph = Graph()
+    for offset, size in ((0, 12), (20, 7), (40, 5)):
+        for u in range(size):
+            for v in range(u + 1, size):
+                if (u * 7 + v * 3) % 4:
+                    graph.add_edge(offset + u, offset + v, 1 + (u + v) % 3)
+        for u in range(size - 1):
+            graph.add_edge(offset + u, offset + u + 1, 3)
+    graph.add_vertex(99)
+    return graph
+
+def edge_set(edges):
+    return sorted((min(u, v), max(u, v), w) for u, v, w in edges)
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_matches_kruskal_on_tied_forest(numpy_mode, monkeypatch, workers):
+    # Let even this small graph be split across the pool
+    monkeypatch.setattr(boruvka, 'MIN_EDGES_PER_TASK', 1)
+    graph = tied_forest().freeze()
+    expected = graph.kruskal_mst()
+    result = boruvka_mst(graph, workers=workers)
+    assert len(result) == graph.num_vertices - 4
+    assert result.total_weight == expected.total_weight
+    # Ties are broken by sorted-edge position in both, so the forests are identical
+    assert edge_set(result.edges) == edge_set(expected.edges)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_graphs(numpy_mode, random_graph, seed):
+    graph = random_graph(seed, float_weights=seed % 2 == 1)
+    result = graph.minimum_spanning_tree('boruvka')
+    assert result.total_weight == pytest.approx(graph.kruskal_mst().total_weight)
+    assert len(result.edges) == len(graph.vertices) - 1
+
+def test_minimum_spanning_tree_algorithms(random_graph):
+    graph = random_graph(2)
+    totals = {algorithm: g.minimum_spanning_tree(algorithm).total_weight for algorithm in ('prim', 'kruskal', 'boruvka')
+              for g in (graph, graph.freeze())}
+    assert len(set(totals.values())) == 1
+    with pytest.raises(ValueError):
+        graph.minimum_spanning_tree('reverse_delete')
+
+def test_empty_graph():
+    result = boruvka_mst(Graph())
+    assert (result.edges, result.total_weight) == ([], 0)
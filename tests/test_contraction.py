@@ -0,0 +1,67 @@
+import pytest
+
+from contraction import ContractionHierarchy, validate
+from graph import Graph
+
+INF = float('inf')
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('float_weights', [False, True])
+def test_queries_match_dijkstra(random_graph, seed, float_weights):
+    graph = random_graph(seed, num_vertices=40, num_edges=100, float_weights=float_weights).freeze()
+    hierarchy = ContractionHierarchy.build(graph)
+    assert validate(graph, hierarchy) == graph.num_vertices ** 2
+
+def test_disconnected_graph():
+    graph = Graph()
+    for v in range(6):
+        graph.add_edge(v, (v + 1) % 6, 1 + v % 3)
+        graph.add_edge(10 + v, 10 + (v + 2) % 6, 2)
+    graph.add_vertex(20)
+    hierarchy = ContractionHierarchy.build(graph)
+    assert hierarchy.distance(0, 10) == INF
+    assert hierarchy.query(20, 0)[:2] == ([], INF)
+    assert validate(hierarchy.graph, hierarchy) == 13 ** 2
+
+def test_labelled_graph(random_graph):
+    graph = random_graph(3)
+    labelled = Graph()
+    for (u, v), weight in graph.weights.items():
+        labelled.add_edge(f"v{u}", f"v{v}", weight)
+    hierarchy = ContractionHierarchy.build(labelled)
+    assert validate(hierarchy.graph, hierarchy) == len(labelled.vertices) ** 2
+
+def test_integer_weights_stay_integers(random_graph):
+    graph = random_graph(1).freeze()
+    hierarchy = ContractionHierarchy.build(graph)
+    assert hierarchy.weights.typecode == 'q'
+    distance = hierarchy.distance(0, 17)
+    assert distance == graph.dijkstra_shortest_path(0).distance(17)
+    assert isinstance(distance, int)
+
+@pytest.mark.parametrize('float_weights', [False, True])
+def test_save_and_load(random_graph, tmp_path, float_weights):
+    graph = random_graph(2, float_weights=float_weights).freeze()
+    hierarchy = ContractionHierarchy.build(graph)
+    file_path = str(tmp_path / 'g.ch')
+    hierarchy.save(file_path)
+    loaded = ContractionHierarchy.load(file_path, graph)
+    assert loaded.num_shortcuts == hierarchy.num_shortcuts
+    assert loaded.weights.typecode == hierarchy.weights.typecode == ('d' if float_weights else 'q')
+    assert validate(graph, loaded) == graph.num_vertices ** 2
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(file_path, random_graph(2, num_vertices=10))
+    (tmp_path / 'bad.ch').write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(str(tmp_path / 'bad.ch'))
+
+def test_unknown_vertices(random_graph):
+    hierarchy = ContractionHierarchy.build(random_graph(0).freeze())
+    assert hierarchy.distance(0, 'missing') == INF
+    assert hierarchy.shortest_path('missing', 0).path == []
+    assert not hierarchy.shortest_path('missing', 0).found
+
+def test_validate_reports_mismatch(random_graph):
+    hierarchy = ContractionHierarchy.build(random_graph(0).freeze())
+    with pytest.raises(ValueError):
+        validate(random_graph(1).freeze(), hierarchy)
@@ -0,0 +1,153 @@
+import pytest
+
+from csr_graph import CSRGraph
+from graph import Graph
+from heaps import DIAL_MAX_WEIGHT, HEAPS
+from instrumentation import AlgorithmStats
+
+# The radix heap needs monotone keys, so Prim rejects it
+PRIM_HEAPS = ['auto', 'heapq', 'dial'] + [kind for kind in HEAPS if kind != 'radix']
+DIJKSTRA_HEAPS = PRIM_HEAPS + ['radix']
+# Heaps that need non-negative integer weights
+INTEGER_HEAPS = ('dial', 'radix')
+
+def heaps_for(csr, kinds):
+    if csr.integer_weight_bound() is None:
+        return [kind for kind in kinds if kind not in INTEGER_HEAPS]
+    return kinds
+
+def relabelled(graph, label):
+    copy = Graph()
+    for v in graph.vertices:
+        copy.add_vertex(label(v))
+    for (u, v), weight in graph.weights.items():
+        copy.add_edge(label(u), label(v), weight)
+    return copy
+
+def undirected(edges):
+    return sorted({(*sorted((u, v), key=repr), w) for u, v, w in edges}, key=repr)
+
+def graph_edges(graph):
+    # Graph.get_edges lists every edge once per direction and per insertion
+    return undirected((u, v, w) for (u, v), w in graph.weights.items())
+
+def check_parity(graph):
+    csr = graph.freeze()
+    assert sorted(csr.get_vertices(), key=repr) == sorted(graph.get_vertices(), key=repr)
+    assert csr.num_edges == len(graph_edges(graph))
+    assert undirected(csr.get_edges()) == graph_edges(graph)
+    for v in graph.vertices:
+        assert sorted(csr.get_neighbors(v), key=repr) == sorted(set(graph.get_neighbors(v)), key=repr)
+
+    expected = graph.prim_mst('heapq')
+    results = [csr.kruskal_mst(), graph.kruskal_mst()]
+    results += [g.prim_mst(heap=heap) for heap in heaps_for(csr, PRIM_HEAPS) for g in (csr, graph)]
+    for result in results:
+        assert len(result) == len(expected)
+        assert result.total_weight == pytest.approx(expected.total_weight)
+        for u, v, weight in result.edges:
+            assert graph.get_weight(u, v) == weight
+
+    for source in graph.vertices:
+        expected = graph.dijkstra_shortest_path(source, 'heapq').dist
+        for heap in heaps_for(csr, DIJKSTRA_HEAPS):
+            for g in (csr, graph):
+                result = g.dijkstra_shortest_path(source, heap=heap)
+                assert result.dist == pytest.approx(expected)
+                for v, p in result.parent.items():
+                    assert result.distance(v) == pytest.approx(expected[v])
+                    if p is not None:
+                        assert expected[v] == pytest.approx(expected[p] + graph.get_weight(p, v))
+                        assert result.path(v)[-2:] == [p, v]
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('float_weights', [False, True])
+def test_random_graphs(random_graph, seed, float_weights):
+    check_parity(random_graph(seed, float_weights=float_weights))
+
+@pytest.mark.parametrize('label', [str, lambda v: (v, 'x'), lambda v: 10 * v + 7, lambda v: v if v % 2 else f"v{v}"],
+                         ids=['str', 'tuple', 'sparse_int', 'unsortable'])
+def test_non_integer_labels(random_graph, label):
+    # Float weights: the dict-based Graph breaks heap ties by comparing labels
+    graph = relabelled(random_graph(3, num_vertices=12, num_edges=20, float_weights=True), label)
+    assert graph.freeze().labels is not None
+    check_parity(graph)
+
+def test_parallel_edges_keep_the_last_weight():
+    graph = Graph()
+    graph.add_edge(0, 1, 5)
+    graph.add_edge(1, 2, 1)
+    graph.add_edge(0, 1, 2)
+    graph.add_edge(1, 0, 3)
+    csr = graph.freeze()
+    assert csr.num_edges == 2
+    assert csr.get_weight(0, 1) == csr.get_weight(1, 0) == 3
+    assert csr.get_neighbors(0) == [1]
+    check_parity(graph)
+
+def test_self_loops():
+    graph = Graph()
+    graph.add_edge(0, 0, 1)
+    graph.add_edge(0, 1, 4)
+    graph.add_edge(1, 1, 2)
+    csr = graph.freeze()
+    assert csr.num_edges == 3
+    assert undirected(csr.get_edges()) == [(0, 0, 1), (0, 1, 4), (1, 1, 2)]
+    result = csr.prim_mst()
+    assert result.edges == [(0, 1, 4)] and result.total_weight == 4
+    check_parity(graph)
+
+def test_empty_and_single_vertex():
+    assert Graph().freeze().prim_mst().edges == []
+    graph = Graph()
+    graph.add_vertex('a')
+    csr = graph.freeze()
+    assert csr.kruskal_mst().total_weight == 0
+    assert csr.dijkstra_shortest_path('a').dist == {'a': 0}
+    assert csr.dijkstra_shortest_path('missing').dist == {}
+
+def test_integer_heaps_reject_unsupported_graphs(random_graph):
+    csr = random_graph(0).freeze()
+    with pytest.raises(ValueError):
+        csr.prim_mst(heap='radix')
+    floats = random_graph(0, float_weights=True).freeze()
+    for heap in INTEGER_HEAPS:
+        with pytest.raises(ValueError):
+            floats.dijkstra_shortest_path(0, heap=heap)
+
+def chosen_heaps(graph):
+    prim, dijkstra = AlgorithmStats(), AlgorithmStats()
+    graph.prim_mst(stats=prim)
+    graph.dijkstra_shortest_path(next(iter(graph.vertices)), stats=dijkstra)
+    return prim.heap, dijkstra.heap
+
+def test_auto_picks_dial_for_small_integer_weights(random_graph):
+    graph = random_graph(0)
+    assert chosen_heaps(graph) == ('dial', 'dial')
+    # The default runs on the frozen snapshot, built once per graph version
+    snapshot = graph.freeze()
+    graph.prim_mst()
+    assert graph.freeze() is snapshot
+
+def test_auto_falls_back_for_float_weights(random_graph):
+    assert chosen_heaps(random_graph(0, float_weights=True)) == ('heapq', 'heapq')
+
+@pytest.mark.parametrize('max_weight, expected', [(DIAL_MAX_WEIGHT, 'dial'), (DIAL_MAX_WEIGHT + 1, 'heapq')])
+def test_auto_falls_back_above_dial_max_weight(random_graph, max_weight, expected):
+    # Enough arcs that the bucket count alone decides
+    graph = random_graph(0, num_vertices=500, num_edges=3000)
+    graph.add_edge(0, 1, max_weight)
+    assert graph.freeze().integer_weight_bound() == max_weight
+    assert chosen_heaps(graph) == (expected, expected)
+
+def test_prim_dial_keys_below_the_cursor():
+    # A comb: a spine of heavy edges with a zero-weight tooth at every spine
+    # vertex, so each settled spine vertex offers a key far below the
+    # current one; and a forest of heavy pairs, each tree starting over at 0
+    comb = [(i, i + 2, 900) for i in range(0, 40, 2)] + [(i, i + 1, 0) for i in range(0, 40, 2)]
+    pairs = [(i, i + 1, 900 - i) for i in range(42, 80, 2)]
+    graph = CSRGraph.from_edges(80, comb + pairs)
+    expected = graph.prim_mst('heapq')
+    result = graph.prim_mst('dial')
+    assert sorted(result.edges) == sorted(expected.edges)
+    assert result.total_weight == 20 * 900 + sum(900 - i for i in range(42, 80, 2))
@@ -0,0 +1,72 @@
+import pytest
+
+import csr_graph
+import graph as graph_module
+from disjoint_set import DisjointSet
+from graph import Graph
+
+def test_union_reports_merges():
+    sets = DisjointSet(5)
+    assert sets.union(0, 1)
+    assert sets.union(3, 4)
+    assert not sets.union(1, 0)
+    assert sets.union(1, 4)
+    assert not sets.union(0, 3)
+    assert sets.num_sets == 2
+    assert sets.connected(0, 4) and not sets.connected(0, 2)
+    assert sets.set_size(3) == 4 and sets.set_size(2) == 1
+
+def test_union_many_and_components():
+    sets = DisjointSet(7)
+    assert sets.union_many([(5, 6), (1, 3), (6, 5), (3, 5), (1, 6)]) == 3
+    assert len(sets) == 7
+    assert sets.component_ids() == [0, 1, 2, 1, 3, 1, 1]
+    assert sets.groups() == [[0], [1, 3, 5, 6], [2], [4]]
+
+def test_deep_chain_without_recursion():
+    # Union the chain by hand so the tree is one long path, then find from the bottom
+    n = 200000
+    sets = DisjointSet(n)
+    sets.parent = [max(i - 1, 0) for i in range(n)]
+    sets.num_sets = 1
+    assert sets.find(n - 1) == 0
+    # Path halving roughly halves the path on every find
+    depth = 0
+    x = n - 1
+    while sets.parent[x] != x:
+        x = sets.parent[x]
+        depth += 1
+    assert depth <= n // 2 + 1
+    assert sets.groups() == [list(range(n))]
+
+def test_connected_components():
+    graph = Graph()
+    graph.add_edge('a', 'b', 1)
+    graph.add_edge('c', 'b', 2)
+    graph.add_edge('d', 'e', 1)
+    graph.add_vertex('f')
+    expected = sorted([['a', 'b', 'c'], ['d', 'e'], ['f']])
+    for g in (graph, graph.freeze()):
+        assert sorted(sorted(component) for component in g.connected_components()) == expected
+
+@pytest.mark.parametrize('module', [csr_graph, graph_module])
+def test_kruskal_stops_after_spanning_tree(monkeypatch, module):
+    unions = []
+
+    class CountingDisjointSet(DisjointSet):
+        def union(self, a, b):
+            unions.append((a, b))
+            return super().union(a, b)
+
+    monkeypatch.setattr(module, 'DisjointSet', CountingDisjointSet)
+
+    # A light path over 0..9 followed by many heavier chords
+    graph = Graph()
+    for v in range(9):
+        graph.add_edge(v, v + 1, 1)
+    for u in range(10):
+        for v in range(u + 2, 10):
+            graph.add_edge(u, v, 5)
+    target = graph.freeze() if module is csr_graph else graph
+    assert target.kruskal_mst().total_weight == 9
+    assert len(unions) == 9
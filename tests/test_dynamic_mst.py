@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from disjoint_set import DisjointSet
+from dynamic_mst import DynamicMST
+from graph import Graph
+
+def check_forest(dynamic):
+    """
+    The maintained forest must be a spanning forest of the graph made of
+    graph edges, with the weight of one recomputed from scratch
+    """
+    graph = dynamic.graph
+    edges = dynamic.mst_edges()
+    index = {v: i for i, v in enumerate(graph.vertices)}
+    components = DisjointSet(len(index))
+    for u, v, weight in edges:
+        assert graph.weights[(u, v)] == weight
+        assert components.union(index[u], index[v]), "forest has a cycle"
+
+    expected = graph.freeze().kruskal_mst()
+    assert len(edges) == len(expected.edges)
+    assert dynamic.total_weight == pytest.approx(expected.total_weight)
+    assert sum(w for _, _, w in edges) == pytest.approx(expected.total_weight)
+    assert dynamic.num_rebuilds == 0
+
+def tree_edges(dynamic):
+    return sorted((min(u, v), max(u, v), w) for u, v, w in dynamic.mst_edges())
+
+def test_delete_bridge():
+    # Two triangles joined by the bridge c-d
+    graph = Graph()
+    for u, v, weight in [('a', 'b', 1), ('b', 'c', 2), ('a', 'c', 3), ('c', 'd', 9),
+                         ('d', 'e', 1), ('e', 'f', 2), ('d', 'f', 3)]:
+        graph.add_edge(u, v, weight)
+    dynamic = DynamicMST(graph)
+    assert dynamic.total_weight == 15
+    assert dynamic.remove_edge('d', 'c') == 9
+    assert dynamic.total_weight == 6
+    assert dynamic.forest().num_components == 2
+    assert tree_edges(dynamic) == [('a', 'b', 1), ('b', 'c', 2), ('d', 'e', 1), ('e', 'f', 2)]
+    check_forest(dynamic)
+
+def test_raise_tree_edge_above_non_tree_edge():
+    graph = Graph()
+    for u, v, weight in [(0, 1, 1), (1, 2, 2), (0, 2, 5), (2, 3, 4)]:
+        graph.add_edge(u, v, weight)
+    dynamic = DynamicMST(graph)
+    assert tree_edges(dynamic) == [(0, 1, 1), (1, 2, 2), (2, 3, 4)]
+    dynamic.update_weight(1, 0, 10)
+    assert tree_edges(dynamic) == [(0, 2, 5), (1, 2, 2), (2, 3, 4)]
+    assert dynamic.total_weight == 11
+    # Raising it less than the replacement keeps the tree edge
+    dynamic.update_weight(2, 1, 3)
+    assert tree_edges(dynamic) == [(0, 2, 5), (1, 2, 3), (2, 3, 4)]
+    check_forest(dynamic)
+
+def test_lighter_edge_replaces_heaviest_on_cycle():
+    graph = Graph()
+    for v in range(5):
+        graph.add_edge(v, v + 1, v + 1)
+    dynamic = DynamicMST(graph)
+    dynamic.add_edge(0, 5, 2)
+    assert tree_edges(dynamic) == [(0, 1, 1), (0, 5, 2), (1, 2, 2), (2, 3, 3), (3, 4, 4)]
+    dynamic.remove_edge(2, 3)
+    assert tree_edges(dynamic) == [(0, 1, 1), (0, 5, 2), (1, 2, 2), (3, 4, 4), (4, 5, 5)]
+    check_forest(dynamic)
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('float_weights', [False, True])
+def test_random_updates_match_recomputation(random_graph, seed, float_weights):
+    rng = random.Random(seed)
+    graph = random_graph(seed, num_vertices=25, num_edges=25, float_weights=float_weights)
+    dynamic = DynamicMST(graph)
+    check_forest(dynamic)
+
+    for _ in range(150):
+        edges = [edge for edge in graph.iter_edges() if edge[0] != edge[1]]
+        action = rng.random()
+        if action < 0.4 or not edges:
+            # Vertices up to 29 are new, so the forest also gains vertices
+            u, v = rng.randrange(30), rng.randrange(30)
+            dynamic.add_edge(u, v, rng.uniform(0, 20) if float_weights else rng.randint(1, 20))
+        elif action < 0.7:
+            u, v, weight = rng.choice(edges)
+            dynamic.update_weight(u, v, weight * rng.choice((0.5, 2)) if float_weights else rng.randint(1, 20))
+        else:
+            u, v, _ = rng.choice(edges)
+            dynamic.remove_edge(u, v)
+        check_forest(dynamic)
+
+def test_direct_graph_edit_triggers_rebuild(random_graph):
+    graph = random_graph(0)
+    dynamic = DynamicMST(graph)
+    graph.add_edge(0, 1, 1)
+    assert dynamic.total_weight == graph.freeze().kruskal_mst().total_weight
+    assert dynamic.num_rebuilds == 1
+
+def test_remove_missing_edge_raises():
+    graph = Graph()
+    graph.add_edge(0, 1, 1)
+    dynamic = DynamicMST(graph)
+    with pytest.raises(KeyError):
+        dynamic.remove_edge(0, 2)
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from dynamic_sssp import ShortestPathTree
+from graph import Graph
+
+INF = float('inf')
+
+def check_tree(tree):
+    """
+    Distances must match a Dijkstra run from scratch, and every path must
+    be made of graph edges adding up to its distance
+    """
+    graph = tree.graph
+    expected = graph.freeze().dijkstra_shortest_path(tree.source).dist
+    for vertex in graph.vertices:
+        assert tree.distance(vertex) == pytest.approx(expected[vertex])
+        path = tree.path(vertex)
+        if expected[vertex] == INF:
+            assert path == []
+            continue
+        assert path[0] == tree.source and path[-1] == vertex
+        assert sum(graph.weights[(a, b)] for a, b in zip(path, path[1:])) == pytest.approx(expected[vertex])
+    assert tree.num_rebuilds == 0
+
+def chain():
+    # s - a - b - c with a heavier direct edge s - b
+    graph = Graph()
+    for u, v, weight in [('s', 'a', 1), ('a', 'b', 1), ('b', 'c', 1), ('s', 'b', 5)]:
+        graph.add_edge(u, v, weight)
+    return graph
+
+def test_increase_tree_edge():
+    tree = ShortestPathTree(chain(), 's')
+    assert tree.path('c') == ['s', 'a', 'b', 'c']
+    tree.update_weight('a', 's', 10)
+    assert tree.last_touched == 3
+    assert tree.path('c') == ['s', 'b', 'c']
+    assert tree.distance('a') == 6
+    assert tree.path('a') == ['s', 'b', 'a']
+    check_tree(tree)
+
+def test_increase_non_tree_edge_touches_nothing():
+    tree = ShortestPathTree(chain(), 's')
+    tree.update_weight('s', 'b', 7)
+    assert tree.last_touched == 0
+    check_tree(tree)
+
+def test_delete_leaves_vertices_unreachable():
+    graph = chain()
+    graph.add_edge('c', 'd', 2)
+    tree = ShortestPathTree(graph, 's')
+    assert tree.remove_edge('b', 'c') == 1
+    assert tree.distance('c') == tree.distance('d') == INF
+    assert tree.path('d') == []
+    assert tree.distance('b') == 2
+    check_tree(tree)
+
+    # Reconnecting makes them reachable again
+    tree.add_edge('s', 'd', 4)
+    assert tree.path('c') == ['s', 'd', 'c']
+    check_tree(tree)
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('float_weights', [False, True])
+def test_random_updates_match_recomputation(random_graph, seed, float_weights):
+    rng = random.Random(seed)
+    graph = random_graph(seed, num_vertices=25, num_edges=25, float_weights=float_weights)
+    tree = ShortestPathTree(graph, 0)
+    check_tree(tree)
+
+    for _ in range(150):
+        edges = list(graph.iter_edges())
+        action = rng.random()
+        if action < 0.4 or not edges:
+            u, v = rng.randrange(30), rng.randrange(30)
+            tree.add_edge(u, v, rng.uniform(0, 20) if float_weights else rng.randint(1, 20))
+        elif action < 0.7:
+            u, v, weight = rng.choice(edges)
+            tree.update_weight(u, v, weight * rng.choice((0.5, 2)) if float_weights else rng.randint(1, 20))
+        else:
+            u, v, _ = rng.choice(edges)
+            tree.remove_edge(u, v)
+        check_tree(tree)
+        assert tree.last_touched <= len(graph.vertices)
+
+def test_direct_graph_edit_triggers_rebuild():
+    graph = chain()
+    tree = ShortestPathTree(graph, 's')
+    graph.add_edge('s', 'c', 1)
+    assert tree.distance('c') == 1
+    assert tree.num_rebuilds == 1
+
+def test_unknown_source_raises():
+    with pytest.raises(ValueError):
+        ShortestPathTree(chain(), 'missing')
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from csr_graph import CSRGraph
+from graph_binary import DIGEST_SIZE, read_binary_graph, read_binary_header, write_binary_graph
+import graph_loader
+
+def test_round_trip(tmp_path):
+    graph = CSRGraph.from_edges(4, [(0, 1, 5), (1, 2, 7), (2, 3, 1), (3, 3, 2)])
+    graph.set_vertex_attribute(2, 'coordinates', (1.5, 2.5))
+    file_path = str(tmp_path / 'g.csr')
+    write_binary_graph(graph, file_path)
+    for use_mmap in (True, False):
+        loaded = read_binary_graph(file_path, use_mmap)
+        assert sorted(loaded.iter_edges()) == sorted(graph.iter_edges())
+        assert loaded.num_edges == graph.num_edges
+        assert loaded.vertex_attributes == {2: {'coordinates': (1.5, 2.5)}}
+
+def test_digest_ending_in_zero_bytes(tmp_path):
+    graph = CSRGraph.from_edges(2, [(0, 1, 1)])
+    file_path = str(tmp_path / 'g.csr')
+    digest = bytes(range(1, DIGEST_SIZE - 1)) + b'\0\0'
+    write_binary_graph(graph, file_path, (10, 20, digest))
+    assert read_binary_header(file_path)['source_digest'] == digest
+
+def test_wrong_digest_size(tmp_path):
+    graph = CSRGraph.from_edges(2, [(0, 1, 1)])
+    with pytest.raises(ValueError):
+        write_binary_graph(graph, str(tmp_path / 'g.csr'), (10, 20, b'short'))
+
+def test_cache_survives_touch_by_content_hash(tmp_path, monkeypatch):
+    file_path = tmp_path / 'g.gr'
+    file_path.write_bytes(b"3 2\ne 0 1 5\ne 1 2 7\n")
+    # A content digest that ends in zero bytes
+    digest = b'\x07' * (DIGEST_SIZE - 2) + b'\0\0'
+    monkeypatch.setattr(graph_loader, '_file_digest', lambda path: digest)
+    monkeypatch.setattr(graph_loader.hashlib, 'blake2b', lambda digest_size: _FixedDigest(digest))
+
+    graph_loader.load_graph(str(file_path))
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache_path = str(file_path) + graph_loader.CACHE_SUFFIX
+    assert graph_loader._open_cache(str(file_path), cache_path) is not None
+
+class _FixedDigest:
+    def __init__(self, digest):
+        self._digest = digest
+
+    def update(self, data):
+        pass
+
+    def digest(self):
+        return self._digest
+
+def test_cache_records_new_mtime_after_hash_match(tmp_path, monkeypatch):
+    file_path = tmp_path / 'g.gr'
+    file_path.write_bytes(b"3 2\ne 0 1 5\ne 1 2 7\n")
+    cache_path = str(file_path) + graph_loader.CACHE_SUFFIX
+    graph_loader.load_graph(str(file_path))
+    stat = os.stat(file_path)
+    touched = stat.st_mtime_ns + 10**9
+    os.utime(file_path, ns=(stat.st_atime_ns, touched))
+
+    hashed = []
+    file_digest = graph_loader._file_digest
+    monkeypatch.setattr(graph_loader, '_file_digest', lambda path: hashed.append(path) or file_digest(path))
+    graph = graph_loader.load_graph(str(file_path))
+    assert sorted(graph.iter_edges()) == [(0, 1, 5), (1, 2, 7)]
+    assert read_binary_header(cache_path)['source_mtime_ns'] == touched
+    # The rest of the header is untouched
+    assert read_binary_header(cache_path)['source_size'] == stat.st_size
+
+    graph_loader.load_graph(str(file_path))
+    assert len(hashed) == 1
@@ -0,0 +1,87 @@
+import math
+
+import pytest
+
+from csr_graph import CSRGraph
+from graph_families import (FAMILIES, barabasi_albert_graph, build_graph, grid_graph, heap_churn_graph,
+                            path_graph, random_geometric_graph, write_graph)
+from graph_loader import load_graph
+
+def materialize(family):
+    num_vertices, edges, coordinates = family
+    edges = list(edges)
+    pairs = [(min(u, v), max(u, v)) for u, v, _ in edges]
+    assert len(set(pairs)) == len(pairs), "duplicate edge"
+    assert all(0 <= u < v < num_vertices for u, v in pairs), "self-loop or vertex out of range"
+    assert all(w >= 1 for _, _, w in edges)
+    if coordinates is not None:
+        assert len(coordinates) == num_vertices
+    return num_vertices, edges, coordinates
+
+def num_components(num_vertices, edges):
+    return len(CSRGraph.from_edges(num_vertices, edges).connected_components())
+
+def test_grid_counts():
+    n, edges, _ = materialize(grid_graph(7, 9, removal_prob=0, diagonal_prob=0, seed=1))
+    assert n == 63
+    assert len(edges) == 7 * 8 + 6 * 9
+
+    n, edges, coordinates = materialize(grid_graph(20, 30, seed=2))
+    assert n == 600
+    horizontal = 20 * 29
+    assert horizontal + 19 <= len(edges) <= horizontal + 19 * 30 + 19 * 29
+    assert num_components(n, edges) == 1
+    # Weights never undercut the straight-line distance
+    assert all(w >= math.hypot(coordinates[u][0] - coordinates[v][0], coordinates[u][1] - coordinates[v][1])
+               for u, v, w in edges)
+
+def test_barabasi_albert_counts():
+    n, edges, _ = materialize(barabasi_albert_graph(500, m=4, seed=3))
+    assert n == 500
+    assert len(edges) == 4 * 5 // 2 + (500 - 5) * 4
+    assert num_components(n, edges) == 1
+    with pytest.raises(ValueError):
+        barabasi_albert_graph(3, m=3)
+
+def test_random_geometric_matches_brute_force():
+    n, edges, coordinates = materialize(random_geometric_graph(300, average_degree=6, radius=50, seed=4))
+    expected = {(u, v) for v in range(n) for u in range(v)
+                if math.dist(coordinates[u], coordinates[v]) <= 50}
+    assert {(min(u, v), max(u, v)) for u, v, _ in edges} == expected
+    assert 3 <= 2 * len(edges) / n <= 9
+
+def test_path_counts():
+    n, edges, _ = materialize(path_graph(100, seed=5))
+    assert len(edges) == 99
+    assert num_components(n, edges) == 1
+    degrees = [0] * n
+    for u, v, _ in edges:
+        degrees[u] += 1
+        degrees[v] += 1
+    assert sorted(degrees) == [1, 1] + [2] * 98
+
+def test_heap_churn_counts():
+    n, edges, _ = materialize(heap_churn_graph(5, 7))
+    assert n == 12
+    assert len(edges) == 4 + 5 * 7
+
+@pytest.mark.parametrize('family', sorted(FAMILIES))
+def test_build_and_write(family, tmp_path):
+    graph = build_graph(family, 400, seed=6)
+    assert 300 <= graph.num_vertices <= 400
+    assert graph.num_edges > 0
+
+    file_path = str(tmp_path / f"{family}.gr")
+    num_vertices, num_edges = write_graph(file_path, family, 400, seed=6)
+    assert (num_vertices, num_edges) == (graph.num_vertices, graph.num_edges)
+    loaded = load_graph(file_path, cache=False)
+    assert (loaded.num_vertices, loaded.num_edges) == (num_vertices, num_edges)
+    assert loaded.vertex_attributes == graph.vertex_attributes
+
+@pytest.mark.parametrize('family', ['grid', 'geometric'])
+def test_euclidean_astar_is_exact(family):
+    graph = build_graph(family, 400, seed=7)
+    for source in (0, 57, 233):
+        expected = graph.dijkstra_shortest_path(source)
+        for target in range(0, graph.num_vertices, 13):
+            assert graph.astar(source, target, heuristic='euclidean').distance == expected.distance(target)
@@ -0,0 +1,102 @@
+from array import array
+
+import pytest
+
+import graph_loader
+from graph_loader import load_graph, parse_graph_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Parse with the NumPy fast path and with the pure-Python one
+PARSERS = [
+    pytest.param(True, id='numpy', marks=pytest.mark.skipif(np is None, reason="needs NumPy")),
+    pytest.param(False, id='python'),
+]
+
+@pytest.fixture(params=PARSERS)
+def parse(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(graph_loader, 'np', None)
+
+    def parse(tmp_path, text, chunk_size=graph_loader.CHUNK_SIZE):
+        file_path = tmp_path / 'g.gr'
+        file_path.write_bytes(text)
+        num_vertices, sources, destinations, weights, attributes = parse_graph_file(str(file_path), chunk_size)
+        return num_vertices, list(zip(sources, destinations, weights)), attributes
+
+    return parse
+
+def test_parses_dialects(parse, tmp_path):
+    text = b"4 3\nc 0: London 51.5 -0.1\ne 0 1 5\ne 1 2 -7\na 2 3 9\nv 3 1.5 2.5\n"
+    num_vertices, edges, attributes = parse(tmp_path, text)
+    assert num_vertices == 4
+    assert edges == [(0, 1, 5), (1, 2, -7), (2, 3, 9)]
+    assert attributes[0] == {'name': 'London', 'coordinates': (51.5, -0.1)}
+    assert attributes[3] == {'coordinates': (1.5, 2.5)}
+
+def test_short_line_balanced_by_long_line(parse, tmp_path):
+    # 2 + 4 numeric fields add up to 2 * 3: the columns must not shift
+    num_vertices, edges, _ = parse(tmp_path, b"e 0 1\ne 2 3 4 5\ne 6 7 8\n")
+    assert edges == [(2, 3, 4), (6, 7, 8)]
+
+def test_float_weights(parse, tmp_path):
+    _, edges, _ = parse(tmp_path, b"e 0 1 2\ne 1 2 2.5\ne 2 3 4\n", chunk_size=8)
+    assert edges == [(0, 1, 2.0), (1, 2, 2.5), (2, 3, 4.0)]
+    assert all(isinstance(w, float) for _, _, w in edges)
+
+@pytest.mark.parametrize('text, expected', [
+    (b"e 0 1 1e3\n", [(0, 1, 1000.0)]),
+    (b"e 0\t1 2\r\n", [(0, 1, 2)]),
+])
+def test_other_number_formats(parse, tmp_path, text, expected):
+    assert parse(tmp_path, text)[1] == expected
+
+@pytest.mark.parametrize('text', [b"e 0 1 2-3\n", b"e 0 1 -\n"])
+def test_malformed_numbers_raise(parse, tmp_path, text):
+    with pytest.raises(ValueError):
+        parse(tmp_path, text)
+
+@pytest.mark.skipif(np is None, reason="needs NumPy")
+def test_integer_triples():
+    check = graph_loader._integer_triples
+    assert check(b"0 1 2\n3 4 -5", 2)
+    assert check(b"0  1 2 \n 3 4 5", 2)
+    assert not check(b"0 1\n3 4 5 6", 2)
+    assert not check(b"0 1 2.5", 1)
+    assert not check(b"0 1 2-3", 1)
+    assert not check(b"0 1 -", 1)
+
+def test_load_graph_dedupes_and_caches(tmp_path):
+    file_path = tmp_path / 'g.gr'
+    file_path.write_bytes(b"5 3\ne 0 1 5\ne 1 0 3\ne 1 2 4\n")
+    graph = load_graph(str(file_path))
+    assert graph.num_vertices == 5
+    assert sorted(graph.iter_edges()) == [(0, 1, 3), (1, 2, 4)]
+    cached = load_graph(str(file_path))
+    assert sorted(cached.iter_edges()) == sorted(graph.iter_edges())
+
+def test_load_graph_self_loops(tmp_path):
+    file_path = tmp_path / 'g.gr'
+    file_path.write_bytes(b"3 5\ne 0 0 1\ne 0 1 2\ne 1 1 3\ne 1 2 4\ne 2 2 5\n")
+    graph = load_graph(str(file_path), cache=False)
+    assert graph.num_edges == 5
+    # Each self-loop is a single arc
+    assert len(graph.targets) == 7
+    assert sorted(graph.iter_edges()) == [(0, 0, 1), (0, 1, 2), (1, 1, 3), (1, 2, 4), (2, 2, 5)]
+    assert sorted(graph.get_neighbors(1)) == [0, 1, 2]
+
+@pytest.mark.parametrize('use_numpy', PARSERS)
+def test_dedupe_huge_vertex_ids(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(graph_loader, 'np', None)
+    # With ids up to 2**33, min * (max_id + 1) + max wraps around int64 and
+    # (5, big) would collide with (2**31 + 5, big)
+    big = (1 << 33) - 1
+    sources = array('q', [5, 1 << 31 | 5, big, 5])
+    destinations = array('q', [big, big, 5, 6])
+    weights = array('q', [1, 2, 3, 4])
+    kept = graph_loader._dedupe_edges(sources, destinations, weights)
+    assert [list(column) for column in kept] == [[1 << 31 | 5, big, 5], [big, 5, 6], [2, 3, 4]]
@@ -0,0 +1,66 @@
+import pytest
+
+import graph_writer
+import large_graph_generator
+from graph import Graph
+from graph_loader import load_graph
+from graph_writer import open_graph_file, save_graph_to_file, write_edges
+from large_graph_generator import gnm_edges
+
+SUFFIXES = [
+    pytest.param('.gr', id='plain'),
+    pytest.param('.gr.gz', id='gzip'),
+    pytest.param('.gr.zst', id='zstd',
+                 marks=pytest.mark.skipif(graph_writer.zstandard is None, reason="needs zstandard")),
+]
+
+NUM_VERTICES = 60
+EDGES = list(gnm_edges(NUM_VERTICES, 250, seed=7))
+
+def header(file_path):
+    # zstd stream readers have no readline
+    with open_graph_file(file_path) as f:
+        return f.read(256).split(b'\n', 1)[0].split()
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+@pytest.mark.parametrize('known_count', [True, False], ids=['num_edges', 'padded'])
+def test_write_edges_round_trip(tmp_path, suffix, known_count):
+    file_path = str(tmp_path / f"g{suffix}")
+    num_edges = len(EDGES) if known_count else None
+    # A generator: without num_edges the count is only known at the end
+    assert write_edges(file_path, NUM_VERTICES, iter(EDGES), num_edges=num_edges) == len(EDGES)
+    assert header(file_path) == [str(NUM_VERTICES).encode(), str(len(EDGES)).encode()]
+
+    graph = load_graph(file_path, cache=False)
+    assert graph.num_vertices == NUM_VERTICES
+    assert graph.num_edges == len(EDGES)
+    assert sorted(graph.iter_edges()) == sorted(EDGES)
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+def test_coordinates_round_trip(tmp_path, suffix):
+    file_path = str(tmp_path / f"g{suffix}")
+    coordinates = [(v * 0.5, -v * 1.5) for v in range(NUM_VERTICES)]
+    write_edges(file_path, NUM_VERTICES, EDGES, coordinates)
+    graph = load_graph(file_path, cache=False)
+    assert [graph.vertex_attributes[v]['coordinates'] for v in range(NUM_VERTICES)] == coordinates
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+def test_save_graph_round_trip(tmp_path, suffix):
+    graph = Graph()
+    for u, v, weight in EDGES:
+        graph.add_edge(u, v, weight)
+    file_path = str(tmp_path / f"g{suffix}")
+    assert save_graph_to_file(graph, file_path) == len(EDGES)
+    loaded = load_graph(file_path, cache=False)
+    assert sorted(loaded.iter_edges()) == sorted(graph.freeze().iter_edges())
+
+def test_compression_picked_by_suffix(tmp_path):
+    write_edges(str(tmp_path / 'g.gr.gz'), NUM_VERTICES, EDGES)
+    assert (tmp_path / 'g.gr.gz').read_bytes()[:2] == b'\x1f\x8b'
+    write_edges(str(tmp_path / 'g.gr'), NUM_VERTICES, EDGES)
+    assert (tmp_path / 'g.gr').read_bytes().startswith(f"{NUM_VERTICES} ".encode())
+    with pytest.raises(ValueError):
+        write_edges(str(tmp_path / 'g.gr'), NUM_VERTICES, EDGES, compression='lz4')
+
+def test_save_graph_to_file_still_importable_from_generator():
+    assert large_graph_generator.save_graph_to_file is save_graph_to_file
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from heaps import HEAPS, make_heap
+
+@pytest.mark.parametrize('kind', sorted(HEAPS))
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_reference(kind, seed):
+    # Dijkstra-like workload: keys never drop below the last popped key
+    rng = random.Random(seed)
+    capacity = 200
+    heap = make_heap(kind, capacity)
+    reference = {}
+    last = 0
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.3 and reference:
+            item, key = heap.pop()
+            assert key == min(reference.values())
+            assert reference.pop(item) == key
+            assert item not in heap
+            last = key
+        else:
+            item = rng.randrange(capacity)
+            key = last + rng.randint(0, 50)
+            if item in reference and action < 0.6:
+                key = min(key, reference[item])
+                heap.decrease_key(item, key)
+            else:
+                heap.update(item, key)
+            reference[item] = min(key, reference.get(item, key))
+            assert item in heap
+        assert len(heap) == len(reference)
+
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert [key for _, key in popped] == sorted(reference.values())
+    assert dict(popped) == reference
+
+@pytest.mark.parametrize('kind', sorted(HEAPS))
+def test_decrease_key_ignores_larger_keys(kind):
+    heap = make_heap(kind, 3)
+    heap.push(0, 5)
+    heap.push(1, 7)
+    heap.decrease_key(1, 9)
+    heap.update(0, 6)
+    heap.update(2, 1)
+    assert [heap.pop() for _ in range(3)] == [(2, 1), (0, 5), (1, 7)]
+
+def test_unknown_heap():
+    with pytest.raises(ValueError):
+        make_heap('fibonacci', 4)
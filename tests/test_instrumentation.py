@@ -0,0 +1,98 @@
+import pytest
+
+from csr_graph import CSRGraph
+from graph import Graph
+from instrumentation import AlgorithmStats
+
+# A path 0-1-2-3-4 with two heavier chords, and a separate edge 5-6:
+# Kruskal rejects both chords, lazy Prim and Dijkstra leave stale entries
+EDGES = [(0, 1, 1), (1, 2, 2), (2, 3, 3), (0, 2, 4), (1, 3, 5), (3, 4, 6), (5, 6, 1)]
+NUM_VERTICES = 7
+
+def csr_graph():
+    return CSRGraph.from_edges(NUM_VERTICES, EDGES)
+
+def dict_graph():
+    graph = Graph()
+    for vertex in range(NUM_VERTICES):
+        graph.add_vertex(vertex)
+    for u, v, weight in EDGES:
+        graph.add_edge(u, v, weight)
+    return graph
+
+def counts(stats, *names):
+    return {name: getattr(stats, name) for name in names}
+
+LAZY = ('heap_pushes', 'heap_pops', 'stale_skips', 'relaxations', 'vertices_settled', 'edges_scanned')
+INDEXED = ('heap_pushes', 'heap_pops', 'decrease_keys', 'stale_skips', 'relaxations', 'vertices_settled', 'edges_scanned')
+
+@pytest.mark.parametrize('make_graph, heap', [(csr_graph, 'heapq'), (csr_graph, 'dial'), (dict_graph, 'heapq')])
+def test_prim_lazy_counts(make_graph, heap):
+    graph = make_graph()
+    stats = AlgorithmStats()
+    result = graph.prim_mst(heap, stats=stats)
+    assert result.total_weight == 13
+    # Two roots; every relaxation pushes; (4, 2) and (5, 3) come out stale
+    assert counts(stats, *LAZY) == {
+        'heap_pushes': 9, 'heap_pops': 9, 'stale_skips': 2,
+        'relaxations': 7, 'vertices_settled': 7, 'edges_scanned': 14,
+    }
+    assert (stats.algorithm, stats.heap) == ('prim', heap)
+
+@pytest.mark.parametrize('heap', ['binary', 'dary', 'pairing'])
+def test_prim_indexed_counts(heap):
+    stats = AlgorithmStats()
+    assert csr_graph().prim_mst(heap, stats=stats).total_weight == 13
+    # Vertices 2 and 3 have their keys lowered once each instead of a second push
+    assert counts(stats, *INDEXED) == {
+        'heap_pushes': 7, 'heap_pops': 7, 'decrease_keys': 2, 'stale_skips': 0,
+        'relaxations': 7, 'vertices_settled': 7, 'edges_scanned': 14,
+    }
+
+@pytest.mark.parametrize('make_graph, heap', [(csr_graph, 'heapq'), (csr_graph, 'dial'), (dict_graph, 'heapq')])
+def test_dijkstra_lazy_counts(make_graph, heap):
+    graph = make_graph()
+    stats = AlgorithmStats()
+    result = graph.dijkstra_shortest_path(0, heap, stats=stats)
+    assert result.distance(4) == 12
+    # 5 and 6 are never reached, so their arcs are not scanned
+    assert counts(stats, *LAZY) == {
+        'heap_pushes': 6, 'heap_pops': 6, 'stale_skips': 1,
+        'relaxations': 5, 'vertices_settled': 5, 'edges_scanned': 12,
+    }
+
+@pytest.mark.parametrize('heap', ['binary', 'dary', 'pairing', 'radix'])
+def test_dijkstra_indexed_counts(heap):
+    stats = AlgorithmStats()
+    assert csr_graph().dijkstra_shortest_path(0, heap, stats=stats).distance(4) == 12
+    assert counts(stats, *INDEXED) == {
+        'heap_pushes': 5, 'heap_pops': 5, 'decrease_keys': 1, 'stale_skips': 0,
+        'relaxations': 5, 'vertices_settled': 5, 'edges_scanned': 12,
+    }
+
+@pytest.mark.parametrize('make_graph, kwargs', [(csr_graph, {}), (dict_graph, {}), (dict_graph, {'arrays': True})])
+def test_kruskal_union_counts(make_graph, kwargs):
+    stats = AlgorithmStats()
+    result = make_graph().kruskal_mst(stats=stats, **kwargs)
+    assert result.total_weight == 13
+    # A forest never reaches V - 1 edges, so all seven are tried and the
+    # chords (0, 2) and (1, 3) rejected
+    assert counts(stats, 'union_calls', 'unions') == {'union_calls': 7, 'unions': 5}
+    assert stats.algorithm == 'kruskal'
+
+@pytest.mark.parametrize('heap', ['heapq', 'dial', 'binary'])
+def test_counting_leaves_results_unchanged(heap, random_graph):
+    graph = random_graph(3).freeze()
+    counted = graph.prim_mst(heap, stats=AlgorithmStats())
+    assert counted.edges == graph.prim_mst(heap).edges
+    counted = graph.dijkstra_shortest_path(0, heap, stats=AlgorithmStats())
+    plain = graph.dijkstra_shortest_path(0, heap)
+    assert (counted.dist, counted.parent) == (plain.dist, plain.parent)
+
+def test_counts_accumulate_across_calls():
+    graph = csr_graph()
+    stats = AlgorithmStats()
+    graph.prim_mst('heapq', stats=stats)
+    graph.prim_mst('dial', stats=stats)
+    assert (stats.heap_pushes, stats.relaxations) == (18, 14)
+    assert stats.pops_per_vertex == 9 / 7
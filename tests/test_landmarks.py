@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+from graph import Graph
+from landmarks import LandmarkIndex, compare_landmark_counts
+
+def two_components(random_graph):
+    graph = random_graph(2, num_vertices=15, float_weights=True)
+    for v in range(15):
+        graph.add_edge(100 + v, 100 + (v * 7) % 15, 1 + v % 4)
+    return graph
+
+@pytest.mark.parametrize('strategy', ['farthest', 'random'])
+@pytest.mark.parametrize('num_landmarks', [0, 1, 4])
+def test_queries_match_dijkstra(random_graph, strategy, num_landmarks):
+    graph = two_components(random_graph)
+    index = LandmarkIndex.build(graph, num_landmarks, strategy=strategy, seed=1)
+    csr = index.graph
+    assert index.num_landmarks == num_landmarks
+    for source in (0, 7, 103):
+        expected = graph.dijkstra_shortest_path(source).dist
+        for target in graph.vertices:
+            path, distance, _ = index.query(source, target)
+            assert distance == pytest.approx(expected[target])
+            if distance < math.inf:
+                assert path[0] == source and path[-1] == target
+            assert index.lower_bound(csr.index_of(source), csr.index_of(target)) <= distance * (1 + 1e-12)
+
+def test_farthest_covers_every_component(random_graph):
+    index = LandmarkIndex.build(two_components(random_graph), 2)
+    assert {v >= 15 for v in index.landmarks} == {False, True}
+
+def test_missing_vertex_and_unknown_strategy(random_graph):
+    graph = random_graph(0)
+    assert LandmarkIndex.build(graph, 2).query(0, 'missing')[:2] == ([], math.inf)
+    with pytest.raises(ValueError):
+        LandmarkIndex.build(graph, 2, strategy='central')
+
+def test_save_and_load(random_graph, tmp_path):
+    graph = random_graph(3, float_weights=True)
+    index = LandmarkIndex.build(graph, 3, seed=0)
+    index.save(tmp_path / 'index.alt')
+    loaded = LandmarkIndex.load(tmp_path / 'index.alt', graph)
+    assert loaded.landmarks == index.landmarks
+    assert loaded.table == index.table
+    assert loaded.query(1, 20)[:2] == index.query(1, 20)[:2]
+
+    other = Graph()
+    other.add_edge(0, 1, 1)
+    with pytest.raises(ValueError):
+        LandmarkIndex.load(tmp_path / 'index.alt', other)
+    (tmp_path / 'bad.alt').write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        LandmarkIndex.load(tmp_path / 'bad.alt', graph)
+
+def test_report(random_graph):
+    reports = compare_landmark_counts(random_graph(4), counts=(1, 2), num_queries=10)
+    assert [report['num_landmarks'] for report in reports] == [1, 2]
+    for report in reports:
+        assert report['num_queries'] == 10
+        assert report['alt_settled'] <= report['dijkstra_settled']
+        assert report['memory_bytes'] > 0
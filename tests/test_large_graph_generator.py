@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from graph_loader import load_graph
+from large_graph_generator import (generate_csr_graph, generate_large_graph, gnm_edges, gnp_edges,
+                                   write_random_graph)
+
+def check_simple(edges, num_vertices, min_weight=1, max_weight=100):
+    pairs = [(u, v) for u, v, _ in edges]
+    assert len(set(pairs)) == len(pairs)
+    assert all(0 <= u < v < num_vertices for u, v in pairs)
+    assert pairs == sorted(pairs, key=lambda pair: (pair[1], pair[0]))
+    assert all(min_weight <= w <= max_weight for _, _, w in edges)
+
+@pytest.mark.parametrize('num_vertices, p', [(400, 0.05), (2000, 0.002), (60, 0.5)])
+def test_gnp_edge_count(num_vertices, p):
+    edges = list(gnp_edges(num_vertices, p, seed=1))
+    check_simple(edges, num_vertices)
+    pairs = num_vertices * (num_vertices - 1) / 2
+    mean = pairs * p
+    assert abs(len(edges) - mean) < 5 * math.sqrt(mean * (1 - p))
+
+def test_gnp_extremes():
+    assert list(gnp_edges(30, 0, seed=0)) == []
+    complete = list(gnp_edges(30, 1, seed=0, min_weight=3, max_weight=4))
+    assert len(complete) == 30 * 29 // 2
+    check_simple(complete, 30, 3, 4)
+    with pytest.raises(ValueError):
+        list(gnp_edges(30, 1.5))
+
+@pytest.mark.parametrize('num_vertices, num_edges', [(100, 0), (100, 250), (30, 435), (5000, 20000)])
+def test_gnm_edge_count(num_vertices, num_edges):
+    edges = list(gnm_edges(num_vertices, num_edges, seed=2, min_weight=5, max_weight=9))
+    assert len(edges) == num_edges
+    check_simple(edges, num_vertices, 5, 9)
+
+def test_gnm_too_many_edges():
+    with pytest.raises(ValueError):
+        list(gnm_edges(30, 436))
+
+@pytest.mark.parametrize('generate', [lambda seed: gnp_edges(300, 0.03, seed), lambda seed: gnm_edges(300, 900, seed)],
+                         ids=['gnp', 'gnm'])
+def test_seed_reproducibility(generate):
+    assert list(generate(7)) == list(generate(7))
+    assert list(generate(7)) != list(generate(8))
+
+def test_graph_builders():
+    graph = generate_large_graph(200, 0.05, seed=3)
+    assert len(graph.vertices) == 200
+    assert graph.num_edges == len(list(gnp_edges(200, 0.05, seed=3)))
+    csr = generate_csr_graph(200, num_edges=500, seed=3)
+    assert (csr.num_vertices, csr.num_edges) == (200, 500)
+
+@pytest.mark.parametrize('density, num_edges', [(0.02, None), (None, 777)])
+def test_write_random_graph(tmp_path, density, num_edges):
+    file_path = str(tmp_path / 'random.gr')
+    count = write_random_graph(file_path, 500, density, num_edges, seed=4)
+    if num_edges is not None:
+        assert count == num_edges
+    graph = load_graph(file_path, cache=False)
+    assert (graph.num_vertices, graph.num_edges) == (500, count)
+    expected = generate_csr_graph(500, density, num_edges, seed=4)
+    assert sorted(graph.iter_edges()) == sorted(expected.iter_edges())
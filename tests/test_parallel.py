@@ -0,0 +1,38 @@
+from array import array
+
+from csr_graph import CSRGraph
+from parallel import SharedBuffers, attach_graph, share_graph
+
+def test_share_and_attach_graph_round_trip(random_graph):
+    graph = random_graph(1, float_weights=True).freeze()
+    with share_graph(graph) as shared:
+        attached, copy = attach_graph(shared.spec, graph.num_edges)
+        try:
+            assert isinstance(copy, CSRGraph)
+            assert copy.num_vertices == graph.num_vertices
+            assert copy.num_edges == graph.num_edges
+            for original, view in ((graph.offsets, copy.offsets), (graph.targets, copy.targets),
+                                   (graph.weights, copy.weights)):
+                assert view.format == original.typecode
+                assert view.tolist() == original.tolist()
+            assert copy.kruskal_mst().total_weight == graph.kruskal_mst().total_weight
+        finally:
+            attached.close(unlink=False)
+
+def test_buffers_share_pages():
+    with SharedBuffers.create([('q', 3), ('d', 5), ('i', 1)]) as shared:
+        attached = SharedBuffers.attach(shared.spec)
+        try:
+            shared.views[1][4] = 2.5
+            shared.views[2][0] = -7
+            assert attached.views[1][4] == 2.5
+            assert attached.views[2][0] == -7
+            assert [len(view) for view in attached.views] == [3, 5, 1]
+        finally:
+            attached.close(unlink=False)
+
+def test_share_integer_weights():
+    graph = CSRGraph.from_edges(3, [(0, 1, 4), (1, 2, 6)])
+    assert graph.weights.typecode == 'q'
+    with share_graph(graph) as shared:
+        assert shared.views[2].tolist() == array('q', [4, 4, 6, 6]).tolist()
@@ -0,0 +1,94 @@
+import math
+import os
+
+import pytest
+
+from graph import Graph
+from graph_loader import load_cities_graph
+from path_search import bidirectional_dijkstra_path, dijkstra_path
+
+CITIES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_cities.gr')
+
+def path_length(graph, path):
+    return sum(graph.get_weight(u, v) for u, v in zip(path, path[1:]))
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('bidirectional', [False, True])
+def test_matches_dijkstra(random_graph, seed, bidirectional):
+    graph = random_graph(seed, num_vertices=20, float_weights=seed % 2 == 1)
+    csr = graph.freeze()
+    for source in range(0, 20, 3):
+        expected = graph.dijkstra_shortest_path(source).dist
+        for target in graph.vertices:
+            for g in (graph, csr):
+                result = g.shortest_path(source, target, bidirectional=bidirectional)
+                assert result.distance == pytest.approx(expected[target])
+                assert result.path[0] == source and result.path[-1] == target
+                assert path_length(graph, result.path) == pytest.approx(result.distance)
+
+@pytest.mark.parametrize('search', [dijkstra_path, bidirectional_dijkstra_path])
+def test_unreachable_and_trivial(search):
+    graph = Graph()
+    graph.add_edge('a', 'b', 1)
+    graph.add_edge('c', 'd', 1)
+    for g in (graph, graph.freeze()):
+        assert search(g, 'a', 'd')[:2] == ([], math.inf)
+        assert search(g, 'a', 'a')[:2] == (['a'], 0)
+        assert search(g, 'b', 'a')[:2] == (['b', 'a'], 1)
+
+def test_missing_vertex(random_graph):
+    graph = random_graph(0)
+    for g in (graph, graph.freeze()):
+        for result in (g.shortest_path(0, 'missing'), g.shortest_path('missing', 0, bidirectional=True)):
+            assert (result.path, result.distance) == ([], math.inf)
+            assert not result.found
+
+def test_early_exit():
+    # On a path 0-1-...-99 the search for 0 -> 2 settles only the first few vertices
+    graph = Graph()
+    for v in range(99):
+        graph.add_edge(v, v + 1, 1)
+    path, distance, num_settled = dijkstra_path(graph, 0, 2)
+    assert (path, distance) == ([0, 1, 2], 2)
+    assert num_settled == 3
+    path, distance, num_settled = bidirectional_dijkstra_path(graph, 0, 2)
+    assert (path, distance) == ([0, 1, 2], 2)
+    assert num_settled <= 4
+
+def test_astar_matches_dijkstra_on_cities():
+    graph = load_cities_graph(CITIES)
+    for g in (graph, graph.freeze()):
+        for source in graph.vertices:
+            expected = graph.dijkstra_shortest_path(source, 'heapq').dist
+            for target in graph.vertices:
+                result = g.astar(source, target)
+                assert result.distance == expected[target]
+                assert path_length(graph, result.path) == result.distance
+
+def partially_annotated():
+    # The best path s-u-x-t runs through x, which has no coordinates. The
+    # edges between annotated vertices give scale 0.95, so u is estimated
+    # at 0.95 * 9 = 8.55 from t although x takes it there in 2, and A*
+    # would settle t over the direct edge (9.5) before u (1 + 8.55)
+    graph = Graph()
+    for u, v, weight in [('s', 'u', 1), ('u', 'x', 1), ('x', 't', 1), ('s', 't', 9.5)]:
+        graph.add_edge(u, v, weight)
+    for v, xy in [('s', (0, 0)), ('u', (1, 0)), ('t', (10, 0))]:
+        graph.set_vertex_attribute(v, 'coordinates', xy)
+    return graph
+
+def test_astar_partially_annotated():
+    graph = partially_annotated()
+    for g in (graph, graph.freeze()):
+        assert g.shortest_path('s', 't').distance == 3
+        with pytest.raises(ValueError):
+            g.astar('s', 't', heuristic='euclidean')
+        result = g.astar('s', 't', heuristic=lambda vertex, target: 0)
+        assert (result.path, result.distance) == (['s', 'u', 'x', 't'], 3)
+
+def test_astar_without_coordinates_is_dijkstra(random_graph):
+    graph = random_graph(2)
+    expected = graph.dijkstra_shortest_path(0).dist
+    for g in (graph, graph.freeze()):
+        for target in graph.vertices:
+            assert g.astar(0, target, heuristic='euclidean').distance == expected[target]
@@ -0,0 +1,124 @@
+import pytest
+
+from dynamic_sssp import ShortestPathTree
+from graph import Graph
+from instrumentation import AlgorithmStats
+from query_cache import QueryCache
+
+def small_graph():
+    graph = Graph()
+    for u, v, weight in [(0, 1, 2), (1, 2, 3), (0, 2, 6), (2, 3, 1)]:
+        graph.add_edge(u, v, weight)
+    return graph
+
+def test_disabled_by_default():
+    graph = small_graph()
+    assert graph.query_cache is None
+    assert graph.prim_mst() is not graph.prim_mst()
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_hits_and_misses(frozen):
+    graph = small_graph().freeze() if frozen else small_graph()
+    cache = graph.enable_query_cache()
+    first = graph.dijkstra_shortest_path(0)
+    assert graph.dijkstra_shortest_path(0) is first
+    assert graph.dijkstra_shortest_path(1) is not first
+    assert graph.shortest_path(0, 3) is graph.shortest_path(0, 3)
+    assert graph.kruskal_mst() is graph.kruskal_mst()
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (3, 4, 4)
+    assert stats['hit_rate'] == pytest.approx(3 / 7)
+
+    graph.disable_query_cache()
+    assert graph.kruskal_mst() is not graph.kruskal_mst()
+
+@pytest.mark.parametrize('mutate', [lambda g: g.add_edge(3, 4, 1), lambda g: g.remove_edge(2, 3),
+                                    lambda g: g.add_vertex(9), lambda g: g.set_vertex_attribute(0, 'name', 'a')],
+                         ids=['add_edge', 'remove_edge', 'add_vertex', 'set_vertex_attribute'])
+def test_mutations_invalidate(mutate):
+    graph = small_graph()
+    cache = graph.enable_query_cache()
+    before = graph.dijkstra_shortest_path(0)
+    graph.prim_mst()
+    mutate(graph)
+    after = graph.dijkstra_shortest_path(0)
+    assert after is not before
+    assert after.dist == graph.freeze().dijkstra_shortest_path(0).dist
+    assert cache.invalidations == 1
+    assert len(cache) == 1
+
+def test_lru_eviction_by_entries():
+    graph = small_graph()
+    cache = graph.enable_query_cache(max_entries=2)
+    first = graph.dijkstra_shortest_path(0)
+    graph.dijkstra_shortest_path(1)
+    assert graph.dijkstra_shortest_path(0) is first  # 0 is now the most recent
+    graph.dijkstra_shortest_path(2)  # evicts 1
+    assert len(cache) == 2 and cache.evictions == 1
+    assert graph.dijkstra_shortest_path(0) is first
+    misses = cache.misses
+    graph.dijkstra_shortest_path(1)
+    assert cache.misses == misses + 1
+
+def test_lru_eviction_by_items():
+    cache = QueryCache(max_entries=10, max_items=10)
+    cache.get_or_compute(0, 'a', lambda: [1, 2, 3])  # size 4
+    cache.get_or_compute(0, 'b', lambda: ({1: 1}, {1: None}))  # size 3
+    assert cache.stats()['items'] == 7
+    cache.get_or_compute(0, 'c', lambda: [0] * 4)  # size 5 pushes out 'a'
+    assert list(cache.entries) == ['b', 'c']
+    assert cache.size == 8 and cache.evictions == 1
+    # Results larger than the whole cache are returned but not stored
+    big = cache.get_or_compute(0, 'd', lambda: list(range(20)))
+    assert len(big) == 20 and 'd' not in cache.entries
+    assert cache.get_or_compute(1, 'b', lambda: 'recomputed') == 'recomputed'
+    assert cache.invalidations == 1 and list(cache.entries) == ['b']
+
+def test_shortest_path_tree_does_not_corrupt_cached_results():
+    graph = small_graph()
+    graph.enable_query_cache()
+    result = graph.dijkstra_shortest_path(0)
+    dist, parent = result.dist, result.parent
+    expected_dist, expected_parent = dict(dist), dict(parent)
+
+    tree = ShortestPathTree(graph, 0)
+    tree.add_edge(0, 3, 1)
+    tree.remove_edge(0, 1)
+    assert tree.distance(3) == 1 and tree.distance(1) == 5
+
+    assert dist == expected_dist
+    assert parent == expected_parent
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_stats_bypass_the_cache(frozen):
+    graph = small_graph().freeze() if frozen else small_graph()
+    cache = graph.enable_query_cache()
+    cached = graph.dijkstra_shortest_path(0)
+    for call in (lambda stats: graph.dijkstra_shortest_path(0, stats=stats),
+                 lambda stats: graph.dijkstra_shortest_path(0, 'heapq', stats)):
+        stats = AlgorithmStats()
+        result = call(stats)
+        assert result is not cached
+        assert result.dist == cached.dist
+        assert stats.algorithm is not None
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+
+def test_equivalent_calls_share_an_entry():
+    graph = small_graph()
+    cache = graph.enable_query_cache()
+    result = graph.prim_mst()
+    assert graph.prim_mst('auto') is result
+    assert graph.prim_mst(heap='auto') is result
+    assert graph.shortest_path(0, 3) is graph.shortest_path(source=0, target=3)
+    assert len(cache) == 2
+
+def test_csr_attribute_change_invalidates_astar():
+    graph = small_graph().freeze()
+    for v in range(4):
+        graph.set_vertex_attribute(v, 'coordinates', (v, 0))
+    cache = graph.enable_query_cache()
+    before = graph.astar(0, 3, heuristic='euclidean')
+    assert graph.astar(0, 3, heuristic='euclidean') is before
+    graph.set_vertex_attribute(3, 'coordinates', (4, 0))
+    assert graph.astar(0, 3, heuristic='euclidean') is not before
+    assert cache.invalidations == 1
@@ -0,0 +1,42 @@
+import pytest
+
+from graph import Graph
+from results import INF, MSTResult, PathResult
+
+def small_graph():
+    graph = Graph()
+    for u, v, weight in [('a', 'b', 2), ('b', 'c', 3), ('a', 'c', 6), ('c', 'd', 1)]:
+        graph.add_edge(u, v, weight)
+    graph.add_vertex('e')
+    return graph
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_mst_result(frozen):
+    graph = small_graph().freeze() if frozen else small_graph()
+    for result in (graph.prim_mst(), graph.kruskal_mst()):
+        assert isinstance(result, MSTResult)
+        assert len(result) == 3
+        assert result.total_weight == 6
+        assert sorted(tuple(sorted((u, v))) + (w,) for u, v, w in result.edges) == [
+            ('a', 'b', 2), ('b', 'c', 3), ('c', 'd', 1)]
+        assert result.to_dict()['total_weight'] == 6
+        # The old (edges, total, seconds) unpacking must not silently succeed
+        with pytest.raises(TypeError):
+            edges, total, seconds = result
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_shortest_path_result(frozen):
+    graph = small_graph().freeze() if frozen else small_graph()
+    result = graph.dijkstra_shortest_path('a')
+    assert result.dist == {'a': 0, 'b': 2, 'c': 5, 'd': 6, 'e': INF}
+    assert result.parent['d'] == 'c' and result.parent['a'] is None
+    assert result.distance('d') == 6 and result.distance('e') == INF
+    assert result.path('d') == ['a', 'b', 'c', 'd']
+    assert result.path('e') == []
+    assert len(result) == 5
+
+def test_path_result():
+    found = PathResult(['a', 'b'], 2)
+    assert found.found and len(found) == 2
+    assert found.to_dict() == {'path': ['a', 'b'], 'distance': 2}
+    assert not PathResult([], INF).found
@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+import shortest_paths
+from shortest_paths import all_pairs_shortest_paths, dijkstra_many, floyd_warshall
+
+def expected_rows(graph, sources):
+    return {s: graph.dijkstra_shortest_path(s).dist for s in sources}
+
+def assert_matches(matrix, expected):
+    assert len(matrix) == len(expected)
+    for source, dist in expected.items():
+        for target, d in dist.items():
+            assert matrix.get(source, target) == pytest.approx(d)
+    rows = matrix.to_dict()
+    for source, dist in expected.items():
+        assert rows[source] == pytest.approx(dist)
+
+@pytest.mark.parametrize('workers', [None, 1, 2])
+def test_dijkstra_many(random_graph, workers):
+    graph = random_graph(4, float_weights=True)
+    sources = [3, 0, 17]
+    matrix = dijkstra_many(graph, sources, workers=workers)
+    assert matrix.sources == sources
+    assert_matches(matrix, expected_rows(graph, sources))
+
+def test_dijkstra_many_unreachable():
+    graph = shortest_paths.CSRGraph.from_edges(3, [(0, 1, 2)])
+    matrix = dijkstra_many(graph, [0, 2])
+    assert list(matrix.row(0)) == [0, 2, math.inf]
+    assert list(matrix.row(2)) == [math.inf, math.inf, 0]
+
+def test_dijkstra_many_unknown_source(random_graph):
+    with pytest.raises(ValueError):
+        dijkstra_many(random_graph(0), [0, 'missing'])
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_floyd_warshall(random_graph, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(shortest_paths, 'np', None)
+    graph = random_graph(5, num_vertices=15, float_weights=True)
+    assert_matches(floyd_warshall(graph), expected_rows(graph, graph.vertices))
+
+@pytest.mark.parametrize('method', ['auto', 'dijkstra', 'floyd_warshall'])
+def test_all_pairs(random_graph, method):
+    graph = random_graph(6, num_vertices=12)
+    assert_matches(all_pairs_shortest_paths(graph, method=method), expected_rows(graph, graph.vertices))
+
+def test_all_pairs_unknown_method(random_graph):
+    with pytest.raises(ValueError):
+        all_pairs_shortest_paths(random_graph(0), method='bellman_ford')
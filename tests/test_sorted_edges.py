@@ -0,0 +1,73 @@
+import pytest
+
+import csr_graph
+from csr_graph import COUNTING_SORT_MAX_WEIGHT, CSRGraph
+from graph import Graph
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(csr_graph, 'np', None)
+    return request.param
+
+def stable_order(graph):
+    # Edges in CSR scan order, then a stable sort by weight
+    edges = []
+    for u in range(graph.num_vertices):
+        for i in range(graph.offsets[u], graph.offsets[u + 1]):
+            if u < graph.targets[i]:
+                edges.append((u, graph.targets[i], graph.weights[i]))
+    return sorted(edges, key=lambda edge: edge[2])
+
+WEIGHTS = {
+    'counting': lambda i: i % 4,
+    'large_int': lambda i: (i % 3) * COUNTING_SORT_MAX_WEIGHT * 7,
+    'negative': lambda i: i % 5 - 2,
+    'float': lambda i: (i % 4) / 2,
+}
+
+@pytest.mark.parametrize('weights', sorted(WEIGHTS))
+def test_stable_order(numpy_mode, weights):
+    weight = WEIGHTS[weights]
+    edges = [(i % 9, (i * 5 + 1) % 9, weight(i)) for i in range(40)] + [(3, 3, 0)]
+    graph = CSRGraph.from_edges(9, edges)
+    sources, targets, weights = graph.sorted_edges()
+    assert list(zip(sources.tolist(), targets.tolist(), weights.tolist())) == stable_order(graph)
+    assert graph.sorted_edges()[0] is sources
+
+def test_same_order_with_and_without_numpy(monkeypatch, random_graph):
+    pytest.importorskip('numpy')
+    with_numpy = [a.tolist() for a in random_graph(7).freeze().sorted_edges()]
+    monkeypatch.setattr(csr_graph, 'np', None)
+    assert [a.tolist() for a in random_graph(7).freeze().sorted_edges()] == with_numpy
+
+def test_kruskal_arrays(numpy_mode, random_graph):
+    graph = random_graph(5).freeze()
+    result = graph.kruskal_mst()
+    sources, targets, weights = result.arrays()
+    assert list(zip(sources.tolist(), targets.tolist(), weights.tolist())) == result.edges
+
+def test_freeze_is_cached_until_mutation():
+    graph = Graph()
+    graph.add_edge(0, 1, 3)
+    graph.add_edge(1, 2, 1)
+    snapshot = graph.freeze()
+    assert graph.freeze() is snapshot
+    snapshot.sorted_edges()
+
+    mutations = [lambda: graph.add_edge(2, 0, 2), lambda: graph.add_edge(2, 0, 5),
+                 lambda: graph.add_vertex(7), lambda: graph.set_vertex_attribute(0, 'name', 'a')]
+    for mutate in mutations:
+        version = graph.version
+        mutate()
+        assert graph.version > version
+        fresh = graph.freeze()
+        assert fresh is not snapshot
+        assert graph.freeze() is fresh
+        snapshot = fresh
+
+    assert snapshot.get_weight(0, 2) == 5
+    assert snapshot.sorted_edges()[2].tolist() == [1, 3, 5]
+    assert snapshot.num_vertices == 4
@@ -0,0 +1,69 @@
+import pytest
+
+from graph import Graph
+from heaps import HEAPS
+from spanning_forest import SpanningForest
+
+PRIM_HEAPS = ['auto', 'heapq', 'dial'] + [kind for kind in HEAPS if kind != 'radix']
+
+def several_components():
+    # Components of 6, 4 and 2 vertices plus two isolated vertices
+    graph = Graph()
+    for u, v, weight in [('a', 'b', 4), ('b', 'c', 1), ('c', 'a', 2), ('c', 'd', 7), ('d', 'e', 3),
+                         ('e', 'f', 3), ('f', 'd', 5), ('a', 'f', 9), ('g', 'h', 2), ('h', 'i', 2),
+                         ('i', 'j', 1), ('j', 'g', 6), ('k', 'l', 8)]:
+        graph.add_edge(u, v, weight)
+    graph.add_vertex('m')
+    graph.add_vertex('n')
+    return graph
+
+EXPECTED = {frozenset('abcdef'): 16, frozenset('ghij'): 5, frozenset('kl'): 8, frozenset('m'): 0, frozenset('n'): 0}
+
+def totals_by_component(forest):
+    assert sorted(forest.component_ids.values()) == sorted(
+        i for i, vertices in enumerate(forest.components()) for _ in vertices)
+    result = {}
+    for component, vertices in enumerate(forest.components()):
+        assert all(forest.component_of(v) == component for v in vertices)
+        edges = forest.component_edges(component)
+        assert len(edges) == len(vertices) - 1
+        assert sum(w for _, _, w in edges) == forest.totals[component]
+        result[frozenset(vertices)] = forest.totals[component]
+    return result
+
+def forests(graph):
+    csr = graph.freeze()
+    yield graph.minimum_spanning_forest('prim')
+    for algorithm in ('kruskal', 'boruvka'):
+        yield graph.minimum_spanning_forest(algorithm)
+        yield csr.minimum_spanning_forest(algorithm)
+    for heap in PRIM_HEAPS:
+        yield SpanningForest.from_edges(csr.get_vertices(), csr.prim_mst(heap).edges)
+
+def test_every_algorithm_agrees():
+    for forest in forests(several_components()):
+        assert forest.num_components == 5
+        assert forest.total_weight == 29
+        assert totals_by_component(forest) == EXPECTED
+
+def test_component_ids_follow_vertex_order():
+    graph = several_components()
+    forest = graph.freeze().minimum_spanning_forest('kruskal')
+    assert forest.total_weight == 29
+    assert forest.component_ids['a'] == 0 and forest.component_ids['n'] == 4
+    assert forest.components() == [list('abcdef'), list('ghij'), list('kl'), ['m'], ['n']]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_forests(random_graph, seed):
+    # Join two random graphs side by side and sprinkle in isolated vertices
+    graph = random_graph(seed, num_vertices=15, num_edges=20)
+    for (u, v), weight in random_graph(seed + 100, num_vertices=10, num_edges=15).weights.items():
+        graph.add_edge(u + 20, v + 20, weight)
+    for v in range(40, 44):
+        graph.add_vertex(v)
+    expected = None
+    for forest in forests(graph):
+        assert forest.num_components == 6
+        totals = totals_by_component(forest)
+        expected = expected or totals
+        assert totals == expected
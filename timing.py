@@ -0,0 +1,36 @@
+import time
+
+class Timer:
+    """
+    Context manager measuring the wall-clock time of its block with
+    time.perf_counter, for callers that want the execution time the
+    algorithms no longer return:
+
+        with Timer() as timer:
+            result = graph.prim_mst()
+        print(timer.elapsed)
+
+    elapsed is in seconds and stays None until the block exits.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.elapsed = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+
+def timed(func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs) once
+
+    Returns:
+    - (result, seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
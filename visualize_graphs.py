@@ -1,9 +1,7 @@
 import networkx as nx
 import matplotlib.pyplot as plt
 from graph_loader import (
-    load_cities_graph,
-    load_cyclic_graph,
-    load_random_graph,
+    load_graph,
     load_standard_graph
 )
 
@@ -18,8 +16,7 @@ def convert_to_networkx(graph):
         G.add_node(vertex)
     
     # Add edges
-    for u, v, weight in graph.get_edges():
-        G.add_edge(u, v, weight=weight)
+    G.add_weighted_edges_from(graph.iter_edges())
     
     return G
 
@@ -58,16 +55,16 @@ def visualize_graph(graph, title, mst_edges=None):
 
 def main():
     # Load graphs
-    cities_graph = load_cities_graph('test_cities.gr')
-    cyclic_graph = load_cyclic_graph('test_cyclic.gr')
-    random_graph = load_random_graph('test_random.gr')
+    cities_graph = load_graph('test_cities.gr')
+    cyclic_graph = load_graph('test_cyclic.gr')
+    random_graph = load_graph('test_random.gr')
     standard_graph = load_standard_graph()
     
     # Get MSTs
-    cities_mst = cities_graph.prim_mst()[0]
-    cyclic_mst = cyclic_graph.prim_mst()[0]
-    random_mst = random_graph.prim_mst()[0]
-    standard_mst = standard_graph.prim_mst()[0]
+    cities_mst = cities_graph.prim_mst().edges
+    cyclic_mst = cyclic_graph.prim_mst().edges
+    random_mst = random_graph.prim_mst().edges
+    standard_mst = standard_graph.prim_mst().edges
     
     # Visualize graphs with MSTs
     visualize_graph(cities_graph, "Cities Graph", cities_mst)